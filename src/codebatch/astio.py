@@ -0,0 +1,61 @@
+"""Loading of serialized ASTs stored in the CAS.
+
+Parse outputs are UTF-8 JSON. The tasks that read them back (analyze, lint,
+symbols) share one loader, which uses orjson when it is installed and the
+stdlib json module otherwise.
+"""
+
+import json
+import sys
+
+# orjson (optional) parses ASTs straight from bytes, faster than stdlib json
+_ORJSON_AVAILABLE = False
+
+try:
+    import orjson
+
+    _ORJSON_AVAILABLE = True
+except ImportError:
+    pass
+
+
+def _intern_node_type(node: dict) -> dict:
+    """json object_hook: intern each node's "type" string.
+
+    json.loads gives every "type" value its own str object; interning
+    shares one object per node type, so the walkers' type comparisons
+    and table lookups hit the identity fast path.
+    """
+    node_type = node.get("type")
+    if node_type.__class__ is str:
+        node["type"] = sys.intern(node_type)
+    return node
+
+
+def loads_ast(data: bytes, intern_types: bool = False) -> dict:
+    """Deserialize an AST object.
+
+    Uses orjson when installed. orjson may coerce integers beyond 64 bits to
+    float, which is harmless for the AST consumers since none of them read
+    literal values; inputs orjson rejects outright (e.g. NaN/Infinity
+    constants) fall back to the stdlib parser.
+
+    intern_types only applies to the stdlib path. orjson has no object hook,
+    and a separate interning walk over its result costs about as much as the
+    orjson.loads call itself, while no consumer runs measurably faster on
+    interned types.
+
+    Args:
+        data: Serialized AST (UTF-8 JSON).
+        intern_types: Intern each node's "type" string.
+
+    Returns:
+        AST dict.
+    """
+    if _ORJSON_AVAILABLE:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            pass
+    object_hook = _intern_node_type if intern_types else None
+    return json.loads(data.decode("utf-8"), object_hook=object_hook)
@@ -8,8 +8,12 @@ Object references use canonical format: sha256:<hex>
 
 import hashlib
 import os
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain, islice
 from pathlib import Path
-from typing import Optional
+from typing import Iterable, Optional, Union
 
 from .common import parse_object_ref, make_object_ref
 
@@ -62,13 +66,13 @@ class ObjectStore:
         _, hex_hash = parse_object_ref(object_ref)
         return self._hex_to_path(hex_hash)
 
-    def put_bytes(self, data: bytes) -> str:
+    def put_bytes(self, data: Union[bytes, memoryview]) -> str:
         """Store bytes and return the canonical object reference.
 
         Thread-safe: handles concurrent writes correctly.
 
         Args:
-            data: Raw bytes to store.
+            data: Raw bytes (or a bytes-like view) to store.
 
         Returns:
             Canonical object reference in format sha256:<hex>.
@@ -83,8 +87,10 @@ class ObjectStore:
         # Atomic write: write to temp file, then replace
         object_path.parent.mkdir(parents=True, exist_ok=True)
 
-        # Use PID in temp filename to avoid collisions
-        temp_path = object_path.with_suffix(f".tmp.{os.getpid()}")
+        # Use PID and thread in temp filename to avoid collisions
+        temp_path = object_path.with_suffix(
+            f".tmp.{os.getpid()}.{threading.get_ident()}"
+        )
         try:
             temp_path.write_bytes(data)
             try:
@@ -111,6 +117,37 @@ class ObjectStore:
 
         return make_object_ref(hex_hash)
 
+    def put_bytes_many(
+        self, chunks: Iterable[Union[bytes, memoryview]], max_workers: int = 8
+    ) -> list[str]:
+        """Store several objects, overlapping hashing and writes on a thread pool.
+
+        The input is consumed lazily: at most max_workers objects are held
+        waiting to be written, so chunks can be produced while earlier ones
+        are stored.
+
+        Args:
+            chunks: Raw bytes of each object.
+            max_workers: Maximum number of concurrent writes.
+
+        Returns:
+            Object references, in the same order as the input.
+        """
+        chunks = iter(chunks)
+        head = list(islice(chunks, 2))
+        if len(head) <= 1 or max_workers <= 1:
+            return [self.put_bytes(data) for data in chain(head, chunks)]
+
+        refs = []
+        pending: deque = deque()
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            for data in chain(head, chunks):
+                if len(pending) >= max_workers:
+                    refs.append(pending.popleft().result())
+                pending.append(pool.submit(self.put_bytes, data))
+            refs.extend(future.result() for future in pending)
+        return refs
+
     def has(self, object_ref: str) -> bool:
         """Check if an object exists in the store.
 
@@ -142,6 +179,37 @@ class ObjectStore:
             raise ObjectNotFoundError(object_ref)
         return object_path.read_bytes()
 
+    def get_bytes_many(
+        self, object_refs: Iterable[str], max_workers: int = 8
+    ) -> dict[str, bytes]:
+        """Retrieve several objects, overlapping the reads on a thread pool.
+
+        Objects that are missing or unreadable are omitted from the result;
+        callers can fall back to get_bytes() to surface the precise error.
+
+        Args:
+            object_refs: Object references (duplicates are read once).
+            max_workers: Maximum number of concurrent reads.
+
+        Returns:
+            Dict mapping object reference to raw bytes.
+        """
+        refs = list(dict.fromkeys(object_refs))
+
+        def read(object_ref: str) -> Optional[bytes]:
+            try:
+                return self.get_bytes(object_ref)
+            except (ObjectNotFoundError, OSError, ValueError):
+                return None
+
+        if len(refs) <= 1 or max_workers <= 1:
+            results = [read(ref) for ref in refs]
+        else:
+            with ThreadPoolExecutor(max_workers=min(max_workers, len(refs))) as pool:
+                results = list(pool.map(read, refs))
+
+        return {ref: data for ref, data in zip(refs, results) if data is not None}
+
     def get_path(self, object_ref: str) -> Optional[Path]:
         """Get the filesystem path for an object if it exists.
 
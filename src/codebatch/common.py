@@ -20,6 +20,9 @@ PRODUCER = {
     "version": VERSION,
 }
 
+# Leading bytes searched for a NUL when sniffing binary content
+BINARY_SNIFF_BYTES = 8192
+
 
 def utc_now_z() -> str:
     """Return current UTC time in RFC3339 format with Z suffix.
@@ -93,6 +96,18 @@ def object_shard_prefix(object_ref: str) -> str:
     return hex_hash[:2]
 
 
+def looks_binary(data: bytes) -> bool:
+    """Check whether content is binary, by a NUL in its leading bytes.
+
+    Args:
+        data: Raw file content.
+
+    Returns:
+        True if the first BINARY_SNIFF_BYTES bytes contain a NUL.
+    """
+    return b"\x00" in data[:BINARY_SNIFF_BYTES]
+
+
 class SnapshotExistsError(Exception):
     """Raised when attempting to create a snapshot that already exists."""
 
@@ -0,0 +1,109 @@
+"""Derived-data cache keyed by CAS object references.
+
+Tasks that compute deterministic data from a CAS object (e.g. metrics from
+an AST) can persist the result here and skip the recomputation on re-runs.
+The input is content-addressed, so an entry only goes stale when the
+derivation itself changes. Entries are therefore kept per namespace version
+(bumped by the task when its output changes) and per CodeBatch version, so
+an upgrade never serves results computed by older code.
+
+The cache is derived, rebuildable, never truth. Deleting it only costs
+recomputation.
+
+Layout:
+    <store>/indexes/derived/<namespace>/v<version>-<codebatch version>/
+        <aa>/<hex>[.<variant>].json
+"""
+
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any, Optional
+
+from .common import VERSION, parse_object_ref
+
+
+class DerivedCache:
+    """Per-object cache of JSON-serializable derived data."""
+
+    def __init__(self, store_root: Path, namespace: str, version: int = 1):
+        """Initialize the cache.
+
+        Args:
+            store_root: Root directory of the CodeBatch store.
+            namespace: Name of the derived data (e.g. "complexity").
+            version: Version of the derivation; bump to invalidate old entries.
+                Entries are also kept apart per CodeBatch version.
+        """
+        self.store_root = Path(store_root)
+        self.cache_dir = (
+            self.store_root
+            / "indexes"
+            / "derived"
+            / namespace
+            / f"v{version}-{VERSION}"
+        )
+
+    def _entry_path(self, object_ref: str, variant: str = "") -> Path:
+        """Get the path of a cache entry.
+
+        Args:
+            object_ref: Object reference of the source object.
+            variant: Optional qualifier (e.g. a config hash).
+
+        Returns:
+            Path to the entry file.
+
+        Raises:
+            ValueError: If object reference is invalid.
+        """
+        _, hex_hash = parse_object_ref(object_ref)
+        name = f"{hex_hash}.{variant}.json" if variant else f"{hex_hash}.json"
+        return self.cache_dir / hex_hash[:2] / name
+
+    def get(self, object_ref: str, variant: str = "") -> Optional[Any]:
+        """Load a cached value.
+
+        Args:
+            object_ref: Object reference of the source object.
+            variant: Optional qualifier (e.g. a config hash).
+
+        Returns:
+            Cached value, or None on a miss (or unreadable entry).
+        """
+        try:
+            entry_path = self._entry_path(object_ref, variant)
+            with open(entry_path, "rb") as f:
+                return json.loads(f.read())
+        except (OSError, ValueError):
+            return None
+
+    def put(self, object_ref: str, value: Any, variant: str = "") -> None:
+        """Store a value. Failures are ignored (the cache is optional).
+
+        Args:
+            object_ref: Object reference of the source object.
+            value: JSON-serializable value; anything else is not stored.
+            variant: Optional qualifier (e.g. a config hash).
+        """
+        try:
+            data = json.dumps(value, separators=(",", ":")).encode("utf-8")
+            entry_path = self._entry_path(object_ref, variant)
+        except (TypeError, ValueError):
+            return
+
+        # Atomic write via temp file; PID and thread keep concurrent writers
+        # of the same entry (shards run on threads) from sharing a temp file
+        temp_path = entry_path.with_suffix(
+            f".tmp.{os.getpid()}.{threading.get_ident()}"
+        )
+        try:
+            entry_path.parent.mkdir(parents=True, exist_ok=True)
+            temp_path.write_bytes(data)
+            temp_path.replace(entry_path)
+        except OSError:
+            try:
+                temp_path.unlink()
+            except OSError:
+                pass
@@ -7,17 +7,33 @@ State transitions are atomic and never corrupt prior results.
 """
 
 import json
+import multiprocessing
 import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime, timezone
+from itertools import islice
 from pathlib import Path
 from typing import Callable, Iterable, Iterator, Optional
 
 from .batch import BatchManager
-from .cas import ObjectStore
+from .cas import ObjectNotFoundError, ObjectStore
 from .common import SCHEMA_VERSION, PRODUCER, utc_now_z, object_shard_prefix
 from .snapshot import SnapshotBuilder
 
 
+# Number of file objects read ahead per batch by iter_file_bytes()
+FETCH_BATCH_SIZE = 64
+
+# Worker processes are never forked: the runner's process has threads (shard
+# threads, read-ahead threads), and forking a multi-threaded process can
+# deadlock the child
+_POOL_START_METHOD = (
+    "forkserver"
+    if "forkserver" in multiprocessing.get_all_start_methods()
+    else "spawn"
+)
+
+
 class _CountingIterator:
     """Iterator wrapper that counts items as they're yielded."""
 
@@ -37,13 +53,17 @@ class _CountingIterator:
 class ShardRunner:
     """Runs individual shards with state management and atomic output commits."""
 
-    def __init__(self, store_root: Path):
+    def __init__(self, store_root: Path, concurrent_shards: int = 1):
         """Initialize the shard runner.
 
         Args:
             store_root: Root directory of the CodeBatch store.
+            concurrent_shards: Number of shards run at the same time in this
+                process (by this and sibling runners); "auto" worker counts
+                share the CPUs between them.
         """
         self.store_root = Path(store_root)
+        self.concurrent_shards = max(1, concurrent_shards)
         self.batch_manager = BatchManager(store_root)
         self.snapshot_builder = SnapshotBuilder(store_root)
         self.object_store = ObjectStore(store_root)
@@ -370,6 +390,96 @@ class ShardRunner:
 
         return new_state
 
+    def resolve_workers(self, workers) -> int:
+        """Resolve a task's "workers" setting to a process count.
+
+        Args:
+            workers: Number of worker processes, or "auto" for this shard's
+                share of the CPUs (at least one).
+
+        Returns:
+            Number of worker processes (1 means run in this process).
+        """
+        if workers == "auto":
+            return max(1, (os.cpu_count() or 1) // self.concurrent_shards)
+        return workers
+
+    def process_pool(self, workers: int) -> ProcessPoolExecutor:
+        """Create a process pool for a task's worker processes.
+
+        Args:
+            workers: Number of worker processes.
+
+        Returns:
+            ProcessPoolExecutor whose workers are not forked from this
+            (multi-threaded) process.
+        """
+        return ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context(_POOL_START_METHOD),
+        )
+
+    def iter_file_bytes(
+        self, files: Iterable[dict], batch_size: int = FETCH_BATCH_SIZE
+    ) -> Iterator[tuple[dict, Optional[bytes]]]:
+        """Stream file records paired with their content from CAS.
+
+        Reads are issued in batches via ObjectStore.get_bytes_many() so I/O
+        for a batch overlaps, and the next batch is read in the background
+        while the caller processes the current one. At most two batches are
+        held in memory; records are yielded in input order.
+
+        Args:
+            files: Iterable of records with an "object" ref (file records,
+                or output records pointing at CAS objects such as ASTs).
+            batch_size: Number of records to read ahead per batch.
+
+        Yields:
+            (file_record, content) tuples in input order. Content is None if
+            the object couldn't be read; callers should fall back to
+            read_or_error() to surface the error.
+        """
+        iterator = iter(files)
+
+        def fetch(batch: list[dict]) -> dict[str, bytes]:
+            return self.object_store.get_bytes_many(
+                record["object"] for record in batch
+            )
+
+        with ThreadPoolExecutor(max_workers=1) as prefetcher:
+            batch = list(islice(iterator, batch_size))
+            pending = prefetcher.submit(fetch, batch) if batch else None
+
+            while pending is not None:
+                contents = pending.result()
+
+                # Start reading the next batch before handing this one out
+                next_batch = list(islice(iterator, batch_size))
+                pending = prefetcher.submit(fetch, next_batch) if next_batch else None
+
+                for record in batch:
+                    yield record, contents.get(record["object"])
+                batch = next_batch
+
+    def read_or_error(
+        self, object_ref: str
+    ) -> tuple[Optional[bytes], Optional[Exception]]:
+        """Read an object, returning the read error instead of raising it.
+
+        iter_file_bytes() yields None for objects it couldn't read without
+        saying why; this re-reads one such object to recover the error.
+
+        Args:
+            object_ref: Object reference.
+
+        Returns:
+            (content, None) if the object is readable, else (None, error).
+        """
+        try:
+            return self.object_store.get_bytes(object_ref), None
+        except (ObjectNotFoundError, OSError, ValueError) as e:
+            return None, e
+
     def get_shard_outputs(
         self, batch_id: str, task_id: str, shard_id: str
     ) -> list[dict]:
@@ -10,6 +10,7 @@ A CodeBatch store is a directory with a specific layout:
 """
 
 import json
+import os
 from pathlib import Path
 
 from .common import SCHEMA_VERSION, PRODUCER, utc_now_z
@@ -55,10 +56,14 @@ def init_store(store_root: Path, *, allow_reinit: bool = False) -> dict:
         raise StoreExistsError(store_root)
 
     # If directory exists but is not a valid store, check if it's empty
-    if store_root.exists():
-        contents = list(store_root.iterdir())
-        if contents and not allow_reinit:
-            raise StoreExistsError(store_root)
+    # (stop at the first entry instead of listing the whole directory)
+    if not allow_reinit:
+        try:
+            with os.scandir(store_root) as entries:
+                if next(entries, None) is not None:
+                    raise StoreExistsError(store_root)
+        except FileNotFoundError:
+            pass
 
     # Create directory structure
     store_root.mkdir(parents=True, exist_ok=True)
@@ -1,12 +1,12 @@
 """Task executors registry."""
 
-from typing import Callable
+from typing import Callable, Iterable
 
 from ..runner import ShardRunner
 
 
-# Task executor type: (config, files, runner) -> list[output_records]
-TaskExecutor = Callable[[dict, list[dict], ShardRunner], list[dict]]
+# Task executor type: (config, files, runner) -> output records (list or iterator)
+TaskExecutor = Callable[[dict, Iterable[dict], ShardRunner], Iterable[dict]]
 
 
 def get_executor(task_id: str) -> TaskExecutor:
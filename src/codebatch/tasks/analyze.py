@@ -12,18 +12,93 @@ Metrics are stable and cheap - no deep analysis.
 Phase 8: Added cyclomatic complexity from AST.
 """
 
-import json
+import sys
 from typing import Iterable, Optional
 
+from ..astio import loads_ast
+from ..derived import DerivedCache
 from ..runner import ShardRunner
 
 
+# ASCII characters that str.strip() treats as whitespace
+_ASCII_WHITESPACE = b" \t\n\r\x0b\x0c\x1c\x1d\x1e\x1f"
+
+
 def count_lines(content: str) -> int:
     """Count lines of code (non-empty lines)."""
     lines = content.split("\n")
     return sum(1 for line in lines if line.strip())
 
 
+def count_lines_bytes(data: bytes) -> Optional[int]:
+    """Count lines of code directly on raw bytes.
+
+    ASCII content is counted without decoding. Non-ASCII content is
+    validated as UTF-8 and counted via count_lines().
+
+    Args:
+        data: Raw file bytes.
+
+    Returns:
+        Non-empty line count, or None if the data is not valid UTF-8.
+    """
+    if data.isascii():
+        return sum(1 for line in data.split(b"\n") if line.strip(_ASCII_WHITESPACE))
+    try:
+        return count_lines(data.decode("utf-8"))
+    except UnicodeDecodeError:
+        return None
+
+
+# Child keys visited by calculate_complexity_from_node: (list-valued keys,
+# single-child keys). Unknown node types get the full sweep.
+_DEFAULT_CHILD_KEYS: tuple[tuple[str, ...], tuple[str, ...]] = (
+    ("body", "orelse", "handlers", "finalbody", "values", "elts", "args"),
+    ("value", "test", "func", "left", "right", "target", "iter", "slice"),
+)
+
+# Per-type subsets, matching the keys the parse task emits for each node type.
+# FunctionDef "args" is omitted: the arguments dict never contributes.
+_COMPLEXITY_CHILD_KEYS: dict[str, tuple[tuple[str, ...], tuple[str, ...]]] = {
+    "Module": (("body",), ()),
+    "FunctionDef": (("body",), ()),
+    "AsyncFunctionDef": (("body",), ()),
+    "ClassDef": (("body",), ()),
+    "If": (("body", "orelse"), ("test",)),
+    "While": (("body", "orelse"), ("test",)),
+    "For": (("body", "orelse"), ("target", "iter")),
+    "AsyncFor": (("body", "orelse"), ("target", "iter")),
+    "With": (("body",), ()),
+    "AsyncWith": (("body",), ()),
+    "Try": (("body", "orelse", "handlers"), ()),
+    "TryStar": (("body", "orelse", "handlers"), ()),
+    "ExceptHandler": (("body",), ()),
+    "IfExp": ((), ("test",)),
+    "BoolOp": (("values",), ()),
+    "Dict": (("values",), ()),
+    "List": (("elts",), ()),
+    "Tuple": (("elts",), ()),
+    "Set": (("elts",), ()),
+    "Call": (("args",), ("func",)),
+    "Expr": ((), ("value",)),
+    "Attribute": ((), ("value",)),
+    "Return": ((), ("value",)),
+    "Yield": ((), ("value",)),
+    "YieldFrom": ((), ("value",)),
+    "Subscript": ((), ("value", "slice")),
+    "BinOp": ((), ("left", "right")),
+    "Compare": ((), ("left",)),
+    "AnnAssign": ((), ("target",)),
+    "AugAssign": ((), ("target",)),
+    "Assign": ((), ()),
+    "Name": ((), ()),
+    "Constant": ((), ()),
+    "Import": ((), ()),
+    "ImportFrom": ((), ()),
+    "Pass": ((), ()),
+}
+
+
 def calculate_complexity_from_node(node: dict) -> int:
     """Calculate cyclomatic complexity contribution from a single AST node.
 
@@ -61,8 +136,11 @@ def calculate_complexity_from_node(node: dict) -> int:
         values = node.get("values", [])
         complexity += max(0, len(values) - 1)
 
-    # Recurse into children
-    for key in ("body", "orelse", "handlers", "finalbody", "values", "elts", "args"):
+    # Recurse into children (only the keys this node type can carry)
+    list_keys, single_keys = _COMPLEXITY_CHILD_KEYS.get(
+        node_type, _DEFAULT_CHILD_KEYS
+    )
+    for key in list_keys:
         children = node.get(key, [])
         if isinstance(children, list):
             for child in children:
@@ -72,7 +150,7 @@ def calculate_complexity_from_node(node: dict) -> int:
             complexity += calculate_complexity_from_node(children)
 
     # Also check common single-child keys
-    for key in ("value", "test", "func", "left", "right", "target", "iter", "slice"):
+    for key in single_keys:
         child = node.get(key)
         if isinstance(child, dict):
             complexity += calculate_complexity_from_node(child)
@@ -100,25 +178,28 @@ def calculate_function_complexity(func_node: dict) -> int:
     return complexity
 
 
-def extract_complexity_metrics(ast_data: dict, path: str) -> list[dict]:
-    """Extract complexity metrics from Python AST.
+# Complexity metric names, in emission order
+COMPLEXITY_METRICS = (
+    "complexity",
+    "max_complexity",
+    "function_count",
+    "class_count",
+    "import_count",
+)
 
-    Produces:
-    - complexity: Total cyclomatic complexity
-    - max_complexity: Maximum function complexity
-    - function_count: Number of functions
-    - class_count: Number of classes
-    - import_count: Number of imports
+# Bump when the complexity computation changes (invalidates cached values)
+COMPLEXITY_VERSION = 1
+
+
+def compute_complexity_values(ast_data: dict) -> dict[str, int]:
+    """Compute complexity metric values from Python AST.
 
     Args:
         ast_data: Parsed Python AST dict.
-        path: Source file path.
 
     Returns:
-        List of metric records.
+        Dict mapping each name in COMPLEXITY_METRICS to its value.
     """
-    metrics = []
-
     total_complexity = 0
     max_complexity = 0
     function_count = 0
@@ -167,53 +248,105 @@ def extract_complexity_metrics(ast_data: dict, path: str) -> list[dict]:
     for node in ast_data.get("body", []):
         process_node(node)
 
-    # Emit metrics
-    metrics.append(
-        {
-            "kind": "metric",
-            "path": path,
-            "metric": "complexity",
-            "value": total_complexity,
-        }
-    )
+    return {
+        "complexity": total_complexity,
+        "max_complexity": max_complexity,
+        "function_count": function_count,
+        "class_count": class_count,
+        "import_count": import_count,
+    }
 
-    metrics.append(
-        {
-            "kind": "metric",
-            "path": path,
-            "metric": "max_complexity",
-            "value": max_complexity,
-        }
-    )
 
-    metrics.append(
-        {
-            "kind": "metric",
-            "path": path,
-            "metric": "function_count",
-            "value": function_count,
-        }
-    )
+def complexity_metric_records(values: dict[str, int], path: str) -> list[dict]:
+    """Build metric records from complexity values.
 
-    metrics.append(
-        {
-            "kind": "metric",
-            "path": path,
-            "metric": "class_count",
-            "value": class_count,
-        }
-    )
+    Args:
+        values: Values as returned by compute_complexity_values().
+        path: Source file path.
 
-    metrics.append(
+    Returns:
+        List of metric records.
+    """
+    return [
         {
             "kind": "metric",
             "path": path,
-            "metric": "import_count",
-            "value": import_count,
+            "metric": metric,
+            "value": values[metric],
         }
-    )
+        for metric in COMPLEXITY_METRICS
+    ]
 
-    return metrics
+
+def extract_complexity_metrics(ast_data: dict, path: str) -> list[dict]:
+    """Extract complexity metrics from Python AST.
+
+    Produces:
+    - complexity: Total cyclomatic complexity
+    - max_complexity: Maximum function complexity
+    - function_count: Number of functions
+    - class_count: Number of classes
+    - import_count: Number of imports
+
+    Args:
+        ast_data: Parsed Python AST dict.
+        path: Source file path.
+
+    Returns:
+        List of metric records.
+    """
+    return complexity_metric_records(compute_complexity_values(ast_data), path)
+
+
+def _cached_complexity_values(
+    runner: ShardRunner, cache: DerivedCache, ast_ref: str
+) -> Optional[dict[str, int]]:
+    """Get complexity values for an AST, from the derived cache if possible.
+
+    Args:
+        runner: ShardRunner for CAS access.
+        cache: Derived cache for complexity values.
+        ast_ref: Object reference of the AST.
+
+    Returns:
+        Complexity values, or None if the AST isn't a loadable Python AST.
+    """
+    values = cache.get(ast_ref)
+    if isinstance(values, dict) and all(m in values for m in COMPLEXITY_METRICS):
+        return values
+
+    ast_data = _load_python_ast(runner, ast_ref)
+    if ast_data is None:
+        return None
+
+    values = compute_complexity_values(ast_data)
+    cache.put(ast_ref, values)
+    return values
+
+
+def _load_python_ast(runner: ShardRunner, object_ref: str) -> Optional[dict]:
+    """Load a full-fidelity Python AST from CAS.
+
+    Args:
+        runner: ShardRunner for CAS access.
+        object_ref: Object reference of the AST.
+
+    Returns:
+        AST dict, or None if it can't be loaded or isn't a full Python AST.
+    """
+    try:
+        ast_bytes = runner.object_store.get_bytes(object_ref)
+        ast_data = loads_ast(ast_bytes)
+    except Exception:
+        # Skip complexity if AST can't be loaded
+        return None
+
+    # Check if this is a Python AST
+    ast_type = ast_data.get("type", "")
+    ast_mode = ast_data.get("ast_mode", "")
+    if ast_type == "Module" and ast_mode == "full":
+        return ast_data
+    return None
 
 
 def analyze_executor(
@@ -243,13 +376,9 @@ def analyze_executor(
     batch_id = config.get("_batch_id")
     shard_id = config.get("_shard_id")
 
-    # Materialize files for potential multi-pass
-    file_list = list(files)
-
-    # Track which files we've computed complexity for
-    complexity_paths: set[str] = set()
-
-    # First pass: Extract complexity metrics from AST (if available)
+    # Index AST objects by path up front so basic and complexity metrics can
+    # be emitted together in a single pass over the shard's files.
+    ast_index: dict[str, str] = {}
     if batch_id and shard_id:
         for ast_output in runner.iter_prior_outputs(
             batch_id, "01_parse", shard_id, kind="ast"
@@ -257,51 +386,40 @@ def analyze_executor(
             path = ast_output.get("path")
             object_ref = ast_output.get("object")
 
-            if not path or not object_ref or path in complexity_paths:
+            if not path or not object_ref:
                 continue
 
             # Skip chunked ASTs
             if ast_output.get("format") == "json+chunks":
                 continue
 
-            try:
-                # Load AST
-                ast_bytes = runner.object_store.get_bytes(object_ref)
-                ast_data = json.loads(ast_bytes.decode("utf-8"))
+            ast_index.setdefault(path, object_ref)
 
-                # Check if this is a Python AST
-                ast_type = ast_data.get("type", "")
-                ast_mode = ast_data.get("ast_mode", "")
+    # Complexity values derived from an AST are cached by its object ref
+    complexity_cache = DerivedCache(runner.store_root, "complexity", COMPLEXITY_VERSION)
 
-                if ast_type == "Module" and ast_mode == "full":
-                    # Extract complexity metrics
-                    complexity_metrics = extract_complexity_metrics(ast_data, path)
-                    outputs.extend(complexity_metrics)
-                    complexity_paths.add(path)
-
-            except Exception:
-                # Skip complexity if AST can't be loaded
-                pass
-
-    # Second pass: Basic metrics for all files
-    for file_record in file_list:
+    for file_record, data in runner.iter_file_bytes(files):
         path = file_record["path"]
         object_ref = file_record["object"]
-        lang_hint = file_record.get("lang_hint", "unknown")
-
-        try:
-            # Get file content from CAS
-            data = runner.object_store.get_bytes(object_ref)
-            file_bytes = len(data)
-
-            # Try to decode as text for LOC
-            loc: Optional[int] = None
-            try:
-                content = data.decode("utf-8")
-                loc = count_lines(content)
-            except UnicodeDecodeError:
-                # Binary file - no LOC
-                pass
+        # Interned: the same few language names repeat across every record
+        lang_hint = sys.intern(file_record.get("lang_hint", "unknown"))
+
+        if data is None:
+            data, error = runner.read_or_error(object_ref)
+            if error is not None:
+                # Emit error metric
+                outputs.append(
+                    {
+                        "kind": "metric",
+                        "path": path,
+                        "metric": "error",
+                        "value": str(error),
+                    }
+                )
+
+        if data is not None:
+            # LOC for text files (None for binary)
+            loc = count_lines_bytes(data)
 
             # Emit bytes metric
             outputs.append(
@@ -309,7 +427,7 @@ def analyze_executor(
                     "kind": "metric",
                     "path": path,
                     "metric": "bytes",
-                    "value": file_bytes,
+                    "value": len(data),
                 }
             )
 
@@ -334,15 +452,11 @@ def analyze_executor(
                 }
             )
 
-        except Exception as e:
-            # Emit error metric
-            outputs.append(
-                {
-                    "kind": "metric",
-                    "path": path,
-                    "metric": "error",
-                    "value": str(e),
-                }
-            )
+        # Complexity metrics from the parse AST (if available)
+        ast_ref = ast_index.pop(path, None)
+        if ast_ref is not None:
+            values = _cached_complexity_values(runner, complexity_cache, ast_ref)
+            if values is not None:
+                outputs.extend(complexity_metric_records(values, path))
 
     return outputs
@@ -20,219 +20,411 @@ Rules (Phase 8 - AST-aware):
 - L103: Variable shadowing
 """
 
+import hashlib
 import json
-from typing import Iterable
+from dataclasses import asdict, dataclass
+from typing import Iterable, Iterator, Optional, Union
 
+from ..astio import loads_ast
+from ..common import looks_binary
+from ..derived import DerivedCache
 from ..runner import ShardRunner
 
 
 # Rule configuration
 DEFAULT_MAX_LINE_LENGTH = 120
-TODO_PATTERNS = ["TODO", "FIXME", "XXX", "HACK"]
+TODO_PATTERNS = ("TODO", "FIXME", "XXX", "HACK")
+
+
+# Bump when any lint rule changes (invalidates cached diagnostics)
+LINT_CACHE_VERSION = 2
 
 # Built-in names that should not be flagged as undefined
-PYTHON_BUILTINS = {
-    "abs",
-    "all",
-    "any",
-    "ascii",
-    "bin",
-    "bool",
-    "breakpoint",
-    "bytearray",
-    "bytes",
-    "callable",
-    "chr",
-    "classmethod",
-    "compile",
-    "complex",
-    "delattr",
-    "dict",
-    "dir",
-    "divmod",
-    "enumerate",
-    "eval",
-    "exec",
-    "filter",
-    "float",
-    "format",
-    "frozenset",
-    "getattr",
-    "globals",
-    "hasattr",
-    "hash",
-    "help",
-    "hex",
-    "id",
-    "input",
-    "int",
-    "isinstance",
-    "issubclass",
-    "iter",
-    "len",
-    "list",
-    "locals",
-    "map",
-    "max",
-    "memoryview",
-    "min",
-    "next",
-    "object",
-    "oct",
-    "open",
-    "ord",
-    "pow",
-    "print",
-    "property",
-    "range",
-    "repr",
-    "reversed",
-    "round",
-    "set",
-    "setattr",
-    "slice",
-    "sorted",
-    "staticmethod",
-    "str",
-    "sum",
-    "super",
-    "tuple",
-    "type",
-    "vars",
-    "zip",
-    "__import__",
-    "__name__",
-    "__doc__",
-    "__package__",
-    "__loader__",
-    "__spec__",
-    "__annotations__",
-    "__builtins__",
-    "__file__",
-    "__cached__",
-    "None",
-    "True",
-    "False",
-    "Ellipsis",
-    "NotImplemented",
-    "Exception",
-    "BaseException",
-    "TypeError",
-    "ValueError",
-    "KeyError",
-    "IndexError",
-    "AttributeError",
-    "ImportError",
-    "RuntimeError",
-    "StopIteration",
-    "GeneratorExit",
-    "AssertionError",
-    "NameError",
-    "ZeroDivisionError",
-    "OSError",
-    "IOError",
-    "FileNotFoundError",
-    "PermissionError",
-    "TimeoutError",
-    "ConnectionError",
-    "BrokenPipeError",
-    "OverflowError",
-    "RecursionError",
-    "MemoryError",
-    "SystemError",
-    "SyntaxError",
-    "IndentationError",
-    "TabError",
-    "UnicodeError",
-    "UnicodeDecodeError",
-    "UnicodeEncodeError",
-    "Warning",
-    "UserWarning",
-    "DeprecationWarning",
-    "PendingDeprecationWarning",
-    "RuntimeWarning",
-    "SyntaxWarning",
-    "ResourceWarning",
-    "FutureWarning",
-    "ImportWarning",
-    "UnicodeWarning",
-    "BytesWarning",
-    "EncodingWarning",
-}
+PYTHON_BUILTINS = frozenset(
+    {
+        "abs",
+        "all",
+        "any",
+        "ascii",
+        "bin",
+        "bool",
+        "breakpoint",
+        "bytearray",
+        "bytes",
+        "callable",
+        "chr",
+        "classmethod",
+        "compile",
+        "complex",
+        "delattr",
+        "dict",
+        "dir",
+        "divmod",
+        "enumerate",
+        "eval",
+        "exec",
+        "filter",
+        "float",
+        "format",
+        "frozenset",
+        "getattr",
+        "globals",
+        "hasattr",
+        "hash",
+        "help",
+        "hex",
+        "id",
+        "input",
+        "int",
+        "isinstance",
+        "issubclass",
+        "iter",
+        "len",
+        "list",
+        "locals",
+        "map",
+        "max",
+        "memoryview",
+        "min",
+        "next",
+        "object",
+        "oct",
+        "open",
+        "ord",
+        "pow",
+        "print",
+        "property",
+        "range",
+        "repr",
+        "reversed",
+        "round",
+        "set",
+        "setattr",
+        "slice",
+        "sorted",
+        "staticmethod",
+        "str",
+        "sum",
+        "super",
+        "tuple",
+        "type",
+        "vars",
+        "zip",
+        "__import__",
+        "__name__",
+        "__doc__",
+        "__package__",
+        "__loader__",
+        "__spec__",
+        "__annotations__",
+        "__builtins__",
+        "__file__",
+        "__cached__",
+        "None",
+        "True",
+        "False",
+        "Ellipsis",
+        "NotImplemented",
+        "Exception",
+        "BaseException",
+        "TypeError",
+        "ValueError",
+        "KeyError",
+        "IndexError",
+        "AttributeError",
+        "ImportError",
+        "RuntimeError",
+        "StopIteration",
+        "GeneratorExit",
+        "AssertionError",
+        "NameError",
+        "ZeroDivisionError",
+        "OSError",
+        "IOError",
+        "FileNotFoundError",
+        "PermissionError",
+        "TimeoutError",
+        "ConnectionError",
+        "BrokenPipeError",
+        "OverflowError",
+        "RecursionError",
+        "MemoryError",
+        "SystemError",
+        "SyntaxError",
+        "IndentationError",
+        "TabError",
+        "UnicodeError",
+        "UnicodeDecodeError",
+        "UnicodeEncodeError",
+        "Warning",
+        "UserWarning",
+        "DeprecationWarning",
+        "PendingDeprecationWarning",
+        "RuntimeWarning",
+        "SyntaxWarning",
+        "ResourceWarning",
+        "FutureWarning",
+        "ImportWarning",
+        "UnicodeWarning",
+        "BytesWarning",
+        "EncodingWarning",
+    }
+)
+
+
+@dataclass(frozen=True)
+class LintConfig:
+    """Lint options resolved from a task configuration dict.
+
+    Built once per shard so per-file rule code reads plain attributes
+    instead of repeating config.get() lookups.
+
+    Attributes:
+        max_line_length: Maximum line length for L002.
+        check_trailing_whitespace: Enable L001.
+        check_line_length: Enable L002.
+        check_todo: Enable L003.
+        check_tab_indentation: Enable L004.
+        check_final_newline: Enable L005.
+        check_unused_imports: Enable L101.
+        check_unused_variables: Enable L102.
+        check_variable_shadowing: Enable L103.
+    """
+
+    max_line_length: int = DEFAULT_MAX_LINE_LENGTH
+    check_trailing_whitespace: bool = True
+    check_line_length: bool = True
+    check_todo: bool = True
+    check_tab_indentation: bool = True
+    check_final_newline: bool = True
+    check_unused_imports: bool = True
+    check_unused_variables: bool = True
+    check_variable_shadowing: bool = True
+
+    def fingerprint(self) -> str:
+        """Short stable hash of the options (keys cached diagnostics)."""
+        data = json.dumps(asdict(self), sort_keys=True).encode("utf-8")
+        return hashlib.sha256(data).hexdigest()[:16]
+
+    @classmethod
+    def from_dict(cls, config: Union[dict, "LintConfig"]) -> "LintConfig":
+        """Create from a task configuration dict (LintConfig passes through)."""
+        if isinstance(config, LintConfig):
+            return config
+        return cls(
+            max_line_length=config.get("max_line_length", DEFAULT_MAX_LINE_LENGTH),
+            check_trailing_whitespace=config.get("check_trailing_whitespace", True),
+            check_line_length=config.get("check_line_length", True),
+            check_todo=config.get("check_todo", True),
+            check_tab_indentation=config.get("check_tab_indentation", True),
+            check_final_newline=config.get("check_final_newline", True),
+            check_unused_imports=config.get("check_unused_imports", True),
+            check_unused_variables=config.get("check_unused_variables", True),
+            check_variable_shadowing=config.get("check_variable_shadowing", True),
+        )
 
 
-def lint_trailing_whitespace(lines: list[str], path: str) -> list[dict]:
-    """L001: Detect trailing whitespace."""
-    diagnostics = []
+# Lines are split this many characters at a time when streaming content
+LINE_CHUNK_SIZE = 1 << 16
+
+
+def _iter_lines(content: str, chunk_size: int = LINE_CHUNK_SIZE) -> Iterator[str]:
+    """Yield the same lines as content.split("\\n") without building them all.
+
+    Content is split in chunks cut at newline boundaries, so only one
+    chunk's worth of line strings is alive at a time.
+    """
+    start = 0
+    while True:
+        end = content.find("\n", start + chunk_size)
+        if end == -1:
+            yield from content[start:].split("\n")
+            return
+        yield from content[start:end].split("\n")
+        start = end + 1
+
+
+def _iter_trailing_whitespace(lines: Iterable[str], path: str) -> Iterator[dict]:
+    """Yield L001 diagnostics (see lint_trailing_whitespace)."""
     for i, line in enumerate(lines, 1):
         # Don't strip newline, just check for trailing spaces/tabs before it
         stripped = line.rstrip("\n\r")
         if stripped != stripped.rstrip():
-            diagnostics.append(
-                {
-                    "kind": "diagnostic",
-                    "path": path,
-                    "severity": "warning",
-                    "code": "L001",
-                    "message": "Trailing whitespace",
-                    "line": i,
-                    "col": len(stripped.rstrip()) + 1,
-                }
-            )
-    return diagnostics
+            yield {
+                "kind": "diagnostic",
+                "path": path,
+                "severity": "warning",
+                "code": "L001",
+                "message": "Trailing whitespace",
+                "line": i,
+                "col": len(stripped.rstrip()) + 1,
+            }
 
 
-def lint_line_too_long(
-    lines: list[str], path: str, max_length: int = DEFAULT_MAX_LINE_LENGTH
-) -> list[dict]:
-    """L002: Detect lines exceeding max length."""
-    diagnostics = []
+def _iter_line_too_long(
+    lines: Iterable[str], path: str, max_length: int
+) -> Iterator[dict]:
+    """Yield L002 diagnostics (see lint_line_too_long)."""
     for i, line in enumerate(lines, 1):
         stripped = line.rstrip("\n\r")
         if len(stripped) > max_length:
-            diagnostics.append(
-                {
-                    "kind": "diagnostic",
-                    "path": path,
-                    "severity": "warning",
-                    "code": "L002",
-                    "message": f"Line too long ({len(stripped)} > {max_length})",
-                    "line": i,
-                    "col": max_length + 1,
-                }
-            )
-    return diagnostics
+            yield {
+                "kind": "diagnostic",
+                "path": path,
+                "severity": "warning",
+                "code": "L002",
+                "message": f"Line too long ({len(stripped)} > {max_length})",
+                "line": i,
+                "col": max_length + 1,
+            }
 
 
-def lint_todo_fixme(lines: list[str], path: str) -> list[dict]:
-    """L003: Detect TODO/FIXME/XXX/HACK comments."""
-    diagnostics = []
+def _iter_todo_fixme(content: str, path: str) -> Iterator[dict]:
+    """Yield L003 diagnostics (see lint_todo_fixme).
+
+    Uppercases the whole content once and finds each pattern with str.find,
+    so files are searched in C rather than per line, then maps the hits back
+    to line/column. A line with several markers reports the first of
+    TODO_PATTERNS found, at its leftmost occurrence.
+    """
+    upper = content.upper()
+    hits = []
+    for priority, marker in enumerate(TODO_PATTERNS):
+        start = upper.find(marker)
+        while start != -1:
+            hits.append((start, priority, marker))
+            start = upper.find(marker, start + 1)
+    hits.sort()
+
+    line_no = 1
+    line_start = 0
+    # (priority, marker, line, col) of the best marker on the current line
+    best = None
+
+    for start, priority, marker in hits:
+        newlines = upper.count("\n", line_start, start)
+        if newlines:
+            line_no += newlines
+            line_start = upper.rfind("\n", line_start, start) + 1
+
+        if best is not None and best[2] != line_no:
+            yield _todo_diagnostic(path, *best[1:])
+            best = None
+
+        if best is None or priority < best[0]:
+            best = (priority, marker, line_no, start - line_start + 1)
+
+    if best is not None:
+        yield _todo_diagnostic(path, *best[1:])
+
+
+def _todo_diagnostic(path: str, marker: str, line: int, col: int) -> dict:
+    """Build an L003 diagnostic for a TODO-style marker."""
+    return {
+        "kind": "diagnostic",
+        "path": path,
+        "severity": "info",
+        "code": "L003",
+        "message": f"Found {marker} comment",
+        "line": line,
+        "col": col,
+    }
+
+
+def _iter_tab_indentation(lines: Iterable[str], path: str) -> Iterator[dict]:
+    """Yield L004 diagnostics (see lint_tab_indentation)."""
     for i, line in enumerate(lines, 1):
-        upper_line = line.upper()
-        for pattern in TODO_PATTERNS:
-            if pattern in upper_line:
-                col = line.upper().find(pattern) + 1
-                diagnostics.append(
+        if line.startswith("\t"):
+            yield {
+                "kind": "diagnostic",
+                "path": path,
+                "severity": "warning",
+                "code": "L004",
+                "message": "Tab indentation (prefer spaces)",
+                "line": i,
+                "col": 1,
+            }
+
+
+def _iter_missing_final_newline(
+    content: str, path: str, lines: Optional[list[str]]
+) -> Iterator[dict]:
+    """Yield the L005 diagnostic, if any (see lint_missing_final_newline)."""
+    if content and not content.endswith("\n"):
+        if lines is not None:
+            line_no = len(lines)
+            col = len(lines[-1]) + 1 if lines else 1
+        else:
+            # Locate the last line without splitting the content
+            line_no = content.count("\n") + 1
+            col = len(content) - content.rfind("\n")
+        yield {
+            "kind": "diagnostic",
+            "path": path,
+            "severity": "warning",
+            "code": "L005",
+            "message": "Missing newline at end of file",
+            "line": line_no,
+            "col": col,
+        }
+
+
+def _lint_lines(
+    lines: Iterable[str],
+    path: str,
+    max_length: int,
+    check_trailing: bool,
+    check_line_length: bool,
+    check_tabs: bool,
+) -> tuple[list[dict], list[dict], list[dict]]:
+    """Run the per-line rules (L001, L002, L004) in a single pass.
+
+    Each line is visited once and checked against every enabled rule.
+    Diagnostics are kept per rule so callers can emit them in rule order.
+
+    Returns:
+        Tuple of (L001, L002, L004) diagnostic lists.
+    """
+    trailing: list[dict] = []
+    too_long: list[dict] = []
+    tabs: list[dict] = []
+
+    for i, line in enumerate(lines, 1):
+        if check_trailing:
+            stripped = line.rstrip("\n\r")
+            content_end = len(stripped.rstrip())
+            if content_end != len(stripped):
+                trailing.append(
                     {
                         "kind": "diagnostic",
                         "path": path,
-                        "severity": "info",
-                        "code": "L003",
-                        "message": f"Found {pattern} comment",
+                        "severity": "warning",
+                        "code": "L001",
+                        "message": "Trailing whitespace",
                         "line": i,
-                        "col": col,
+                        "col": content_end + 1,
                     }
                 )
-                break  # Only report once per line
-    return diagnostics
 
+        # The raw length bounds the stripped one, so short lines (nearly all
+        # of them) are ruled out without stripping
+        if check_line_length and len(line) > max_length:
+            length = len(line.rstrip("\n\r"))
+            if length > max_length:
+                too_long.append(
+                    {
+                        "kind": "diagnostic",
+                        "path": path,
+                        "severity": "warning",
+                        "code": "L002",
+                        "message": f"Line too long ({length} > {max_length})",
+                        "line": i,
+                        "col": max_length + 1,
+                    }
+                )
 
-def lint_tab_indentation(lines: list[str], path: str) -> list[dict]:
-    """L004: Detect tab indentation (prefer spaces)."""
-    diagnostics = []
-    for i, line in enumerate(lines, 1):
-        if line.startswith("\t"):
-            diagnostics.append(
+        if check_tabs and line[:1] == "\t":
+            tabs.append(
                 {
                     "kind": "diagnostic",
                     "path": path,
@@ -243,64 +435,92 @@ def lint_tab_indentation(lines: list[str], path: str) -> list[dict]:
                     "col": 1,
                 }
             )
-    return diagnostics
 
+    return trailing, too_long, tabs
 
-def lint_missing_final_newline(content: str, path: str) -> list[dict]:
-    """L005: Detect missing newline at end of file."""
-    diagnostics = []
-    if content and not content.endswith("\n"):
-        lines = content.split("\n")
-        diagnostics.append(
-            {
-                "kind": "diagnostic",
-                "path": path,
-                "severity": "warning",
-                "code": "L005",
-                "message": "Missing newline at end of file",
-                "line": len(lines),
-                "col": len(lines[-1]) + 1 if lines else 1,
-            }
-        )
-    return diagnostics
+
+def lint_trailing_whitespace(lines: list[str], path: str) -> list[dict]:
+    """L001: Detect trailing whitespace."""
+    return list(_iter_trailing_whitespace(lines, path))
+
+
+def lint_line_too_long(
+    lines: list[str], path: str, max_length: int = DEFAULT_MAX_LINE_LENGTH
+) -> list[dict]:
+    """L002: Detect lines exceeding max length."""
+    return list(_iter_line_too_long(lines, path, max_length))
+
+
+def lint_todo_fixme(lines: list[str], path: str) -> list[dict]:
+    """L003: Detect TODO/FIXME/XXX/HACK comments."""
+    content = "\n".join(line.removesuffix("\n") for line in lines)
+    return list(_iter_todo_fixme(content, path))
+
+
+def lint_tab_indentation(lines: list[str], path: str) -> list[dict]:
+    """L004: Detect tab indentation (prefer spaces)."""
+    return list(_iter_tab_indentation(lines, path))
+
+
+def lint_missing_final_newline(
+    content: str, path: str, lines: Optional[list[str]] = None
+) -> list[dict]:
+    """L005: Detect missing newline at end of file.
+
+    Args:
+        content: File content as string.
+        path: File path.
+        lines: Content already split on newlines (avoids re-splitting).
+    """
+    return list(_iter_missing_final_newline(content, path, lines))
 
 
-def lint_content(content: str, path: str, config: dict) -> list[dict]:
+def lint_content(
+    content: str, path: str, config: Union[dict, LintConfig]
+) -> list[dict]:
     """Run all lint rules on content.
 
     Args:
         content: File content as string.
         path: File path.
-        config: Lint configuration.
+        config: Lint configuration (dict or pre-resolved LintConfig).
 
     Returns:
         List of diagnostic records.
     """
-    diagnostics = []
-    lines = content.split("\n")
-
     # Get config options
-    max_line_length = config.get("max_line_length", DEFAULT_MAX_LINE_LENGTH)
-    check_trailing = config.get("check_trailing_whitespace", True)
-    check_line_length = config.get("check_line_length", True)
-    check_todo = config.get("check_todo", True)
-    check_tabs = config.get("check_tab_indentation", True)
-    check_final_newline = config.get("check_final_newline", True)
+    options = LintConfig.from_dict(config)
+    max_line_length = options.max_line_length
+    check_trailing = options.check_trailing_whitespace
+    check_line_length = options.check_line_length
+    check_todo = options.check_todo
+    check_tabs = options.check_tab_indentation
+    check_final_newline = options.check_final_newline
 
-    if check_trailing:
-        diagnostics.extend(lint_trailing_whitespace(lines, path))
+    diagnostics: list[dict] = []
 
-    if check_line_length:
-        diagnostics.extend(lint_line_too_long(lines, path, max_line_length))
+    # L001, L002 and L004 share one pass over the lines
+    tabs: list[dict] = []
+    if check_trailing or check_line_length or check_tabs:
+        trailing, too_long, tabs = _lint_lines(
+            _iter_lines(content),
+            path,
+            max_line_length,
+            check_trailing,
+            check_line_length,
+            check_tabs,
+        )
+        diagnostics.extend(trailing)
+        diagnostics.extend(too_long)
 
+    # L003 scans the whole file at once
     if check_todo:
-        diagnostics.extend(lint_todo_fixme(lines, path))
+        diagnostics.extend(_iter_todo_fixme(content, path))
 
-    if check_tabs:
-        diagnostics.extend(lint_tab_indentation(lines, path))
+    diagnostics.extend(tabs)
 
     if check_final_newline:
-        diagnostics.extend(lint_missing_final_newline(content, path))
+        diagnostics.extend(_iter_missing_final_newline(content, path, None))
 
     return diagnostics
 
@@ -310,10 +530,68 @@ def lint_content(content: str, path: str, config: dict) -> list[dict]:
 # =============================================================================
 
 
+# Child containers visited by _collect_names_from_node (targets excluded);
+# these inherit the parent's in_target flag
+_NAME_CONTAINER_KEYS = (
+    "body",
+    "orelse",
+    "handlers",
+    "finalbody",
+    "args",
+    "keywords",
+    "elts",
+    "keys",
+    "values",
+)
+
+# Expression keys whose names are always uses
+_NAME_USE_KEYS = ("left", "right", "comparators", "test", "value", "operand")
+
+# Per-type (container keys, use keys) so every child edge is followed once.
+# Assignment and loop targets are definitions and are left out.
+_NAME_CHILD_KEYS: dict[str, tuple[tuple[str, ...], tuple[str, ...]]] = {
+    "Assign": ((), ("value",)),
+    "AnnAssign": ((), ("annotation", "value")),
+    # x += 1 - the target is both read and written
+    "AugAssign": ((), ("target", "value")),
+    "FunctionDef": ((), ("returns", "decorators", "body")),
+    "AsyncFunctionDef": ((), ("returns", "decorators", "body")),
+    "For": ((), ("iter", "body", "orelse")),
+    "AsyncFor": ((), ("iter", "body", "orelse")),
+    "Call": (
+        tuple(k for k in _NAME_CONTAINER_KEYS if k not in ("args", "keywords")),
+        _NAME_USE_KEYS + ("func", "args", "keywords"),
+    ),
+    "Subscript": (_NAME_CONTAINER_KEYS, _NAME_USE_KEYS + ("slice",)),
+}
+
+_DEFAULT_NAME_CHILD_KEYS = (_NAME_CONTAINER_KEYS, _NAME_USE_KEYS)
+
+
+def _name_child_roles(
+    container_keys: tuple[str, ...], use_keys: tuple[str, ...]
+) -> dict[str, bool]:
+    """Map each followed child key to whether it inherits in_target."""
+    roles = {key: False for key in use_keys}
+    roles.update((key, True) for key in container_keys if key not in roles)
+    return roles
+
+
+# Walk-time form of _NAME_CHILD_KEYS: nodes carry only a handful of keys, so
+# iterating a node's items against this map is cheaper than probing every key
+_NAME_CHILD_ROLES = {
+    node_type: _name_child_roles(*keys) for node_type, keys in _NAME_CHILD_KEYS.items()
+}
+_DEFAULT_NAME_CHILD_ROLES = _name_child_roles(*_DEFAULT_NAME_CHILD_KEYS)
+
+
 def _collect_names_from_node(
     node: dict, names: set[str], scope: str = "module", in_target: bool = False
 ) -> None:
-    """Recursively collect all Name references from AST node.
+    """Collect all Name references from AST node.
+
+    Walks the tree iteratively with an explicit stack of (node, in_target),
+    following the child keys listed for each node type in _NAME_CHILD_KEYS.
 
     Args:
         node: AST node dict.
@@ -321,394 +599,339 @@ def _collect_names_from_node(
         scope: Current scope (for context).
         in_target: Whether we're inside an assignment target (don't collect these as uses).
     """
-    node_type = node.get("type", "")
-
-    # Name node - this is a reference to a name
-    # But NOT if we're in an assignment target (those are definitions, not uses)
-    if node_type == "Name" and not in_target:
-        name_id = node.get("id")
-        if name_id:
-            names.add(name_id)
-
-    # Attribute access - the base could be a name
-    if node_type == "Attribute":
-        # Recurse into value (the object being accessed)
-        value = node.get("value")
-        if value:
-            _collect_names_from_node(value, names, scope, in_target)
-
-    # Assignment - targets are definitions, values are uses
-    if node_type == "Assign":
-        # Collect names from value (right side) - these are uses
-        value = node.get("value")
-        if value:
-            _collect_names_from_node(value, names, scope, in_target=False)
-        # Don't recurse into targets - those are definitions
-        return
-
-    # Annotated assignment
-    if node_type == "AnnAssign":
-        # Annotation contains type references (uses)
-        annotation = node.get("annotation")
-        if annotation:
-            _collect_names_from_node(annotation, names, scope, in_target=False)
-        # Value is a use
-        value = node.get("value")
-        if value:
-            _collect_names_from_node(value, names, scope, in_target=False)
-        # Target is a definition - don't recurse
-        return
+    stack = [(node, in_target)]
+    pop = stack.pop
+    push = stack.append
+    add_name = names.add
+    child_roles = _NAME_CHILD_ROLES.get
+    default_roles = _DEFAULT_NAME_CHILD_ROLES
+
+    while stack:
+        node, in_target = pop()
+        node_type = node.get("type", "")
 
-    # Augmented assignment (x += 1) - the target is both read and written
-    if node_type == "AugAssign":
-        target = node.get("target")
-        if target:
-            _collect_names_from_node(target, names, scope, in_target=False)  # Read
-        value = node.get("value")
-        if value:
-            _collect_names_from_node(value, names, scope, in_target=False)
-        return
+        # Name node - this is a reference to a name
+        # But NOT if we're in an assignment target (those are definitions, not uses)
+        if node_type == "Name":
+            if not in_target:
+                name_id = node.get("id")
+                if name_id:
+                    add_name(name_id)
+            continue
 
-    # Function definitions - collect names from annotations
-    if node_type in ("FunctionDef", "AsyncFunctionDef"):
-        # Return annotation
-        returns = node.get("returns")
-        if returns:
-            _collect_names_from_node(returns, names, scope, in_target=False)
-        # Argument annotations
-        args_info = node.get("args", {})
-        for arg_info in args_info.get("args", []):
-            annotation = arg_info.get("annotation")
-            if annotation:
-                _collect_names_from_node(annotation, names, scope, in_target=False)
-        # Decorators
-        for decorator in node.get("decorators", []):
-            _collect_names_from_node(decorator, names, scope, in_target=False)
-        # Recurse into body
-        for child in node.get("body", []):
-            if isinstance(child, dict):
-                _collect_names_from_node(child, names, scope, in_target=False)
-        return  # Don't recurse further - we handled it
-
-    # For loop - target is a definition, iter is a use
-    if node_type in ("For", "AsyncFor"):
-        # iter is a use
-        iter_node = node.get("iter")
-        if iter_node:
-            _collect_names_from_node(iter_node, names, scope, in_target=False)
-        # body and orelse
-        for child in node.get("body", []):
-            if isinstance(child, dict):
-                _collect_names_from_node(child, names, scope, in_target=False)
-        for child in node.get("orelse", []):
+        roles = child_roles(node_type, default_roles)
+        for key, child in node.items():
+            inherit = roles.get(key)
+            if inherit is None:
+                continue
+            child_target = in_target and inherit
             if isinstance(child, dict):
-                _collect_names_from_node(child, names, scope, in_target=False)
-        return
+                push((child, child_target))
+            elif isinstance(child, list):
+                for item in child:
+                    if isinstance(item, dict):
+                        push((item, child_target))
 
-    # Recurse into common child containers (but not targets)
-    for key in (
-        "body",
-        "orelse",
-        "handlers",
-        "finalbody",
-        "args",
-        "keywords",
-        "elts",
-        "keys",
-        "values",
-    ):
-        children = node.get(key, [])
-        if isinstance(children, list):
-            for child in children:
-                if isinstance(child, dict):
-                    _collect_names_from_node(child, names, scope, in_target)
-        elif isinstance(children, dict):
-            _collect_names_from_node(children, names, scope, in_target)
-
-    # Function call arguments
-    if node_type == "Call":
-        func = node.get("func")
-        if func:
-            _collect_names_from_node(func, names, scope, in_target=False)
-        for arg in node.get("args", []):
-            if isinstance(arg, dict):
-                _collect_names_from_node(arg, names, scope, in_target=False)
-        for kw in node.get("keywords", []):
-            if isinstance(kw, dict) and "value" in kw:
-                _collect_names_from_node(kw["value"], names, scope, in_target=False)
-
-    # Subscript
-    if node_type == "Subscript":
-        value = node.get("value")
-        if value:
-            _collect_names_from_node(value, names, scope, in_target)
-        slice_node = node.get("slice")
-        if slice_node:
-            _collect_names_from_node(slice_node, names, scope, in_target=False)
-
-    # Binary/Compare operations
-    for key in ("left", "right", "comparators", "test", "value", "operand"):
-        child = node.get(key)
-        if isinstance(child, dict):
-            _collect_names_from_node(child, names, scope, in_target=False)
-        elif isinstance(child, list):
-            for item in child:
-                if isinstance(item, dict):
-                    _collect_names_from_node(item, names, scope, in_target=False)
-
-
-def _collect_defined_names(
-    node: dict, defined: dict[str, dict], scope: str = "module"
-) -> None:
-    """Collect all defined names (variables, functions, classes, imports).
+        # Function definitions - argument annotations are uses
+        if node_type in ("FunctionDef", "AsyncFunctionDef"):
+            args_info = node.get("args", {})
+            for arg_info in args_info.get("args", ()):
+                annotation = arg_info.get("annotation")
+                if annotation:
+                    push((annotation, False))
 
-    Args:
-        node: AST node dict.
-        defined: Dict mapping name to definition info.
-        scope: Current scope name.
-    """
-    node_type = node.get("type", "")
-    lineno = node.get("lineno", 1)
 
-    # Function definition
-    if node_type in ("FunctionDef", "AsyncFunctionDef"):
-        name = node.get("name")
-        if name:
-            defined[name] = {"type": "function", "line": lineno, "scope": scope}
-            # Parameters are defined within the function
-            args = node.get("args", {})
-            for arg_info in args.get("args", []):
-                arg_name = arg_info.get("arg")
-                if arg_name:
-                    defined[arg_name] = {
-                        "type": "parameter",
-                        "line": lineno,
-                        "scope": name,
-                    }
-            # Recurse into function body with new scope
-            for child in node.get("body", []):
-                _collect_defined_names(child, defined, name)
-        return
-
-    # Class definition
-    if node_type == "ClassDef":
-        name = node.get("name")
-        if name:
-            defined[name] = {"type": "class", "line": lineno, "scope": scope}
-            for child in node.get("body", []):
-                _collect_defined_names(child, defined, name)
-        return
+def _add_import_bindings(node: dict, node_type: str, imports: dict[str, dict]) -> None:
+    """Record the names bound by an Import/ImportFrom node (for L101)."""
+    lineno = node.get("lineno", 1)
 
-    # Import
     if node_type == "Import":
-        for name_info in node.get("names", []):
+        for name_info in node.get("names", ()):
             import_name = name_info.get("asname") or name_info.get("name")
             if import_name:
-                # Handle dotted imports - use first part
-                if "." in import_name:
-                    import_name = import_name.split(".")[0]
-                defined[import_name] = {
-                    "type": "import",
+                # Handle dotted imports - use first part as the accessible name
+                accessible_name = (
+                    import_name.split(".")[0] if "." in import_name else import_name
+                )
+                imports[accessible_name] = {
                     "line": lineno,
-                    "scope": scope,
+                    "full_name": name_info.get("name"),
                 }
 
-    # ImportFrom
-    if node_type == "ImportFrom":
-        for name_info in node.get("names", []):
+    elif node_type == "ImportFrom":
+        module = node.get("module", "")
+        for name_info in node.get("names", ()):
             import_name = name_info.get("asname") or name_info.get("name")
             if import_name and import_name != "*":
-                defined[import_name] = {
-                    "type": "import",
+                imports[import_name] = {
                     "line": lineno,
-                    "scope": scope,
+                    "full_name": f"{module}.{name_info.get('name')}",
                 }
 
-    # Assignment
-    if node_type == "Assign":
-        for target in node.get("targets", []):
-            if target.get("type") == "Name":
-                var_name = target.get("id")
-                if var_name:
-                    defined[var_name] = {
-                        "type": "variable",
-                        "line": lineno,
-                        "scope": scope,
-                    }
 
-    # Annotated assignment
-    if node_type == "AnnAssign":
-        target = node.get("target")
-        if target and target.get("type") == "Name":
-            var_name = target.get("id")
-            if var_name:
-                defined[var_name] = {"type": "variable", "line": lineno, "scope": scope}
-
-    # For loop target
-    if node_type == "For":
-        target = node.get("target")
-        if target and target.get("type") == "Name":
-            var_name = target.get("id")
-            if var_name:
-                defined[var_name] = {"type": "variable", "line": lineno, "scope": scope}
-
-    # Exception handler
-    if node_type == "ExceptHandler":
-        exc_name = node.get("name")
-        if exc_name:
-            defined[exc_name] = {"type": "variable", "line": lineno, "scope": scope}
-
-    # With statement
-    if node_type == "With":
-        for item in node.get("items", []):
-            optional_vars = item.get("optional_vars")
-            if optional_vars and optional_vars.get("type") == "Name":
-                var_name = optional_vars.get("id")
-                if var_name:
-                    defined[var_name] = {
-                        "type": "variable",
-                        "line": lineno,
-                        "scope": scope,
-                    }
+# Statement types (besides functions and classes) that bind names
+_BINDING_TYPES = frozenset(
+    ("Import", "ImportFrom", "Assign", "AnnAssign", "For", "ExceptHandler", "With")
+)
 
-    # Recurse into body
-    for key in ("body", "orelse", "handlers", "finalbody"):
-        for child in node.get(key, []):
-            if isinstance(child, dict):
-                _collect_defined_names(child, defined, scope)
 
+def _collect_definitions(
+    body: list, imports: dict[str, dict], defined: dict[str, dict]
+) -> None:
+    """Collect imports and defined names in a single statement-level walk.
 
-def lint_unused_imports(ast_data: dict, path: str) -> list[dict]:
-    """L101: Detect unused imports.
+    Walks iteratively in pre-order, so later bindings of a name overwrite
+    earlier ones exactly as in source order. Imports are only collected
+    along "body" links; definitions follow every statement container.
 
     Args:
-        ast_data: Parsed Python AST dict.
-        path: Source file path.
-
-    Returns:
-        List of diagnostic records for unused imports.
+        body: Module body (list of statement node dicts).
+        imports: Dict mapping accessible import name to {line, full_name}.
+        defined: Dict mapping name to definition info {type, line, scope}.
     """
-    diagnostics = []
+    # Stack of (node, scope, collect_defined, collect_imports)
+    stack = [(node, "module", True, True) for node in reversed(body)]
+    pop = stack.pop
+    push = stack.append
 
-    # Collect all imports
-    imports: dict[str, dict] = {}
-
-    def collect_imports(node: dict) -> None:
+    while stack:
+        node, scope, want_defined, want_imports = pop()
         node_type = node.get("type", "")
         lineno = node.get("lineno", 1)
 
-        if node_type == "Import":
-            for name_info in node.get("names", []):
-                import_name = name_info.get("asname") or name_info.get("name")
-                if import_name:
-                    # Handle dotted imports - use first part as the accessible name
-                    accessible_name = (
-                        import_name.split(".")[0] if "." in import_name else import_name
-                    )
-                    imports[accessible_name] = {
-                        "line": lineno,
-                        "full_name": name_info.get("name"),
-                    }
+        if want_imports and node_type in ("Import", "ImportFrom"):
+            _add_import_bindings(node, node_type, imports)
+
+        if not want_defined:
+            # Import collection only - follow body links
+            for child in reversed(node.get("body", ())):
+                if isinstance(child, dict):
+                    push((child, scope, False, True))
+            continue
+
+        # Function definition
+        if node_type in ("FunctionDef", "AsyncFunctionDef"):
+            name = node.get("name")
+            if name:
+                defined[name] = {"type": "function", "line": lineno, "scope": scope}
+                # Parameters are defined within the function
+                args = node.get("args", {})
+                for arg_info in args.get("args", ()):
+                    arg_name = arg_info.get("arg")
+                    if arg_name:
+                        defined[arg_name] = {
+                            "type": "parameter",
+                            "line": lineno,
+                            "scope": name,
+                        }
+            # Visit function body with new scope
+            for child in reversed(node.get("body", ())):
+                if isinstance(child, dict):
+                    push((child, name or scope, bool(name), want_imports))
+            continue
+
+        # Class definition
+        if node_type == "ClassDef":
+            name = node.get("name")
+            if name:
+                defined[name] = {"type": "class", "line": lineno, "scope": scope}
+            for child in reversed(node.get("body", ())):
+                if isinstance(child, dict):
+                    push((child, name or scope, bool(name), want_imports))
+            continue
 
-        elif node_type == "ImportFrom":
-            module = node.get("module", "")
-            for name_info in node.get("names", []):
-                import_name = name_info.get("asname") or name_info.get("name")
-                if import_name and import_name != "*":
-                    imports[import_name] = {
+        # Binding statements; most nodes are none of these and skip the chain
+        if node_type in _BINDING_TYPES:
+            # Import
+            if node_type == "Import":
+                for name_info in node.get("names", ()):
+                    import_name = name_info.get("asname") or name_info.get("name")
+                    if import_name:
+                        # Handle dotted imports - use first part
+                        if "." in import_name:
+                            import_name = import_name.split(".")[0]
+                        defined[import_name] = {
+                            "type": "import",
+                            "line": lineno,
+                            "scope": scope,
+                        }
+
+            # ImportFrom
+            elif node_type == "ImportFrom":
+                for name_info in node.get("names", ()):
+                    import_name = name_info.get("asname") or name_info.get("name")
+                    if import_name and import_name != "*":
+                        defined[import_name] = {
+                            "type": "import",
+                            "line": lineno,
+                            "scope": scope,
+                        }
+
+            # Assignment
+            elif node_type == "Assign":
+                for target in node.get("targets", ()):
+                    if target.get("type") == "Name":
+                        var_name = target.get("id")
+                        if var_name:
+                            defined[var_name] = {
+                                "type": "variable",
+                                "line": lineno,
+                                "scope": scope,
+                            }
+
+            # Annotated assignment
+            elif node_type == "AnnAssign":
+                target = node.get("target")
+                if target and target.get("type") == "Name":
+                    var_name = target.get("id")
+                    if var_name:
+                        defined[var_name] = {
+                            "type": "variable",
+                            "line": lineno,
+                            "scope": scope,
+                        }
+
+            # For loop target
+            elif node_type == "For":
+                target = node.get("target")
+                if target and target.get("type") == "Name":
+                    var_name = target.get("id")
+                    if var_name:
+                        defined[var_name] = {
+                            "type": "variable",
+                            "line": lineno,
+                            "scope": scope,
+                        }
+
+            # Exception handler
+            elif node_type == "ExceptHandler":
+                exc_name = node.get("name")
+                if exc_name:
+                    defined[exc_name] = {
+                        "type": "variable",
                         "line": lineno,
-                        "full_name": f"{module}.{name_info.get('name')}",
+                        "scope": scope,
                     }
 
-        # Recurse
-        for child in node.get("body", []):
-            if isinstance(child, dict):
-                collect_imports(child)
-
-    # Collect imports from module body
-    for node in ast_data.get("body", []):
-        collect_imports(node)
-
-    # Collect all name references
-    used_names: set[str] = set()
-    for node in ast_data.get("body", []):
-        # Skip import statements themselves
-        if node.get("type") not in ("Import", "ImportFrom"):
-            _collect_names_from_node(node, used_names)
-
-    # Find unused imports
-    for import_name, info in imports.items():
-        if import_name not in used_names:
-            diagnostics.append(
-                {
-                    "kind": "diagnostic",
-                    "path": path,
-                    "severity": "warning",
-                    "code": "L101",
-                    "message": f"Unused import '{import_name}'",
-                    "line": info["line"],
-                    "col": 1,
-                }
-            )
-
-    return diagnostics
+            # With statement
+            elif node_type == "With":
+                for item in node.get("items", ()):
+                    optional_vars = item.get("optional_vars")
+                    if optional_vars and optional_vars.get("type") == "Name":
+                        var_name = optional_vars.get("id")
+                        if var_name:
+                            defined[var_name] = {
+                                "type": "variable",
+                                "line": lineno,
+                                "scope": scope,
+                            }
+
+        # Visit statement containers (pushed in reverse so children pop in
+        # source order); imports are only followed through "body"
+        children = [
+            (child, key == "body")
+            for key in ("body", "orelse", "handlers", "finalbody")
+            for child in node.get(key, ())
+            if isinstance(child, dict)
+        ]
+        for child, via_body in reversed(children):
+            push((child, scope, True, want_imports and via_body))
+
+
+@dataclass
+class ModuleNames:
+    """Names collected once per Python module and shared by L101/L102."""
+
+    imports: dict[str, dict]
+    defined: dict[str, dict]
+    used: set[str]
+
+    @classmethod
+    def from_ast(cls, ast_data: dict) -> "ModuleNames":
+        """Collect imports, definitions and used names from a module AST."""
+        body = ast_data.get("body", [])
+
+        imports: dict[str, dict] = {}
+        defined: dict[str, dict] = {}
+        _collect_definitions(body, imports, defined)
+
+        # Import statements contribute no uses, so one set serves both rules
+        used: set[str] = set()
+        for node in body:
+            _collect_names_from_node(node, used)
+
+        return cls(imports=imports, defined=defined, used=used)
+
+
+def lint_unused_imports(
+    ast_data: dict, path: str, names: Optional[ModuleNames] = None
+) -> list[dict]:
+    """L101: Detect unused imports.
 
+    Args:
+        ast_data: Parsed Python AST dict.
+        path: Source file path.
+        names: Names already collected for this module (computed if omitted).
 
-def lint_unused_variables(ast_data: dict, path: str) -> list[dict]:
+    Returns:
+        List of diagnostic records for unused imports.
+    """
+    if names is None:
+        names = ModuleNames.from_ast(ast_data)
+    used_names = names.used
+
+    # Find unused imports (filtered in import order; a set difference would
+    # make the diagnostic order depend on string hashing)
+    return [
+        {
+            "kind": "diagnostic",
+            "path": path,
+            "severity": "warning",
+            "code": "L101",
+            "message": f"Unused import '{import_name}'",
+            "line": info["line"],
+            "col": 1,
+        }
+        for import_name, info in names.imports.items()
+        if import_name not in used_names
+    ]
+
+
+def lint_unused_variables(
+    ast_data: dict, path: str, names: Optional[ModuleNames] = None
+) -> list[dict]:
     """L102: Detect unused variables.
 
     Args:
         ast_data: Parsed Python AST dict.
         path: Source file path.
+        names: Names already collected for this module (computed if omitted).
 
     Returns:
         List of diagnostic records for unused variables.
     """
-    diagnostics = []
-
-    # Collect all defined names
-    defined: dict[str, dict] = {}
-    for node in ast_data.get("body", []):
-        _collect_defined_names(node, defined)
-
-    # Collect all used names
-    used_names: set[str] = set()
-    for node in ast_data.get("body", []):
-        _collect_names_from_node(node, used_names)
-
-    # Find unused variables (not imports, functions, classes, or parameters)
-    for var_name, info in defined.items():
-        # Skip underscore variables (intentionally unused)
-        if var_name.startswith("_"):
-            continue
-
-        # Skip imports (handled by L101)
-        if info["type"] == "import":
-            continue
-
-        # Skip functions and classes (they may be exported)
-        if info["type"] in ("function", "class"):
-            continue
-
-        # Skip parameters (they may be part of interface)
-        if info["type"] == "parameter":
-            continue
-
-        # Check if used
-        if var_name not in used_names:
-            diagnostics.append(
-                {
-                    "kind": "diagnostic",
-                    "path": path,
-                    "severity": "warning",
-                    "code": "L102",
-                    "message": f"Unused variable '{var_name}'",
-                    "line": info["line"],
-                    "col": 1,
-                }
-            )
-
-    return diagnostics
+    if names is None:
+        names = ModuleNames.from_ast(ast_data)
+    used_names = names.used
+
+    # Only plain variables are candidates: imports are handled by L101,
+    # functions and classes may be exported, and parameters may be part of an
+    # interface. Underscore variables are intentionally unused.
+    return [
+        {
+            "kind": "diagnostic",
+            "path": path,
+            "severity": "warning",
+            "code": "L102",
+            "message": f"Unused variable '{var_name}'",
+            "line": info["line"],
+            "col": 1,
+        }
+        for var_name, info in names.defined.items()
+        if info["type"] == "variable"
+        and var_name not in used_names
+        and not var_name.startswith("_")
+    ]
 
 
 def lint_variable_shadowing(ast_data: dict, path: str) -> list[dict]:
@@ -726,7 +949,14 @@ def lint_variable_shadowing(ast_data: dict, path: str) -> list[dict]:
     # Track definitions by scope
     scopes: dict[str, dict[str, int]] = {"module": {}}
 
-    def check_shadowing(node: dict, scope: str, parent_scopes: list[str]) -> None:
+    # Iterative pre-order walk over (node, scope, parent_scopes). The parent
+    # chain is a tuple built once per new scope and shared by its children.
+    stack: list[tuple[dict, str, tuple[str, ...]]] = [
+        (node, "module", ()) for node in reversed(ast_data.get("body", ()))
+    ]
+
+    while stack:
+        node, scope, parent_scopes = stack.pop()
         node_type = node.get("type", "")
         lineno = node.get("lineno", 1)
 
@@ -739,7 +969,7 @@ def lint_variable_shadowing(ast_data: dict, path: str) -> list[dict]:
 
                 # Check parameters for shadowing
                 args = node.get("args", {})
-                for arg_info in args.get("args", []):
+                for arg_info in args.get("args", ()):
                     arg_name = arg_info.get("arg")
                     if arg_name and arg_name != "self" and arg_name != "cls":
                         # Check if this shadows something in parent scopes
@@ -759,10 +989,11 @@ def lint_variable_shadowing(ast_data: dict, path: str) -> list[dict]:
                                 break
                         scopes[new_scope][arg_name] = lineno
 
-                # Recurse with new scope
-                for child in node.get("body", []):
-                    check_shadowing(child, new_scope, parent_scopes + [scope])
-                return
+                # Visit body with new scope
+                child_parents = parent_scopes + (scope,)
+                for child in reversed(node.get("body", ())):
+                    stack.append((child, new_scope, child_parents))
+                continue
 
         # Class - creates new scope
         if node_type == "ClassDef":
@@ -770,13 +1001,14 @@ def lint_variable_shadowing(ast_data: dict, path: str) -> list[dict]:
             if name:
                 new_scope = f"{scope}.{name}"
                 scopes[new_scope] = {}
-                for child in node.get("body", []):
-                    check_shadowing(child, new_scope, parent_scopes + [scope])
-                return
+                child_parents = parent_scopes + (scope,)
+                for child in reversed(node.get("body", ())):
+                    stack.append((child, new_scope, child_parents))
+                continue
 
         # Variable assignment - check for shadowing
         if node_type == "Assign":
-            for target in node.get("targets", []):
+            for target in node.get("targets", ()):
                 if target.get("type") == "Name":
                     var_name = target.get("id")
                     if var_name and not var_name.startswith("_"):
@@ -799,15 +1031,16 @@ def lint_variable_shadowing(ast_data: dict, path: str) -> list[dict]:
                             scopes[scope] = {}
                         scopes[scope][var_name] = lineno
 
-        # Recurse into body
-        for key in ("body", "orelse", "handlers", "finalbody"):
-            for child in node.get(key, []):
-                if isinstance(child, dict):
-                    check_shadowing(child, scope, parent_scopes)
-
-    # Start from module level
-    for node in ast_data.get("body", []):
-        check_shadowing(node, "module", [])
+        # Visit statement containers (pushed in reverse so children pop in
+        # source order)
+        children = [
+            child
+            for key in ("body", "orelse", "handlers", "finalbody")
+            for child in node.get(key, ())
+            if isinstance(child, dict)
+        ]
+        for child in reversed(children):
+            stack.append((child, scope, parent_scopes))
 
     return diagnostics
 
@@ -831,11 +1064,11 @@ def _js_collect_import_names(node: dict) -> dict[str, int]:
 
         if ntype == "import_statement":
             # Collect identifiers from import clauses
-            for child in n.get("children", []):
+            for child in n.get("children", ()):
                 _js_collect_import_identifiers(child, imports, lineno)
             return  # Don't recurse further into import
 
-        for child in n.get("children", []):
+        for child in n.get("children", ()):
             walk(child)
 
     walk(node)
@@ -852,7 +1085,7 @@ def _js_collect_import_identifiers(
         imports[node["name"]] = lineno
     elif ntype == "import_specifier":
         # { foo as bar } — the local name is the last identifier
-        children = node.get("children", [])
+        children = node.get("children", ())
         # Find the local binding name (last identifier child, or the aliased name)
         ids = [c for c in children if c.get("type") == "identifier" and c.get("name")]
         if ids:
@@ -861,12 +1094,12 @@ def _js_collect_import_identifiers(
         return
     elif ntype == "namespace_import":
         # import * as name
-        for child in node.get("children", []):
+        for child in node.get("children", ()):
             if child.get("type") == "identifier" and child.get("name"):
                 imports[child["name"]] = lineno
         return
 
-    for child in node.get("children", []):
+    for child in node.get("children", ()):
         _js_collect_import_identifiers(child, imports, lineno)
 
 
@@ -891,7 +1124,7 @@ def _js_collect_used_names(node: dict, skip_declarations: bool = False) -> set[s
 
         # Variable declarator: name child is a declaration, value child is usage
         if ntype == "variable_declarator":
-            children = n.get("children", [])
+            children = n.get("children", ())
             for i, child in enumerate(children):
                 if child.get("type") == "identifier" and i == 0:
                     continue  # Skip the declared name (first identifier)
@@ -900,7 +1133,7 @@ def _js_collect_used_names(node: dict, skip_declarations: bool = False) -> set[s
 
         # Function/class declaration: name is a declaration, body is usage
         if ntype in ("function_declaration", "class_declaration"):
-            children = n.get("children", [])
+            children = n.get("children", ())
             for child in children:
                 if child.get("type") == "identifier":
                     continue  # Skip function/class name
@@ -910,7 +1143,7 @@ def _js_collect_used_names(node: dict, skip_declarations: bool = False) -> set[s
         # Parameters: names are declarations
         if ntype in ("formal_parameters", "required_parameter", "optional_parameter"):
             # Don't collect parameter names as uses
-            for child in n.get("children", []):
+            for child in n.get("children", ()):
                 if child.get("type") not in ("identifier", "type_identifier"):
                     walk(child, True)
             return
@@ -921,7 +1154,7 @@ def _js_collect_used_names(node: dict, skip_declarations: bool = False) -> set[s
             if name:
                 used.add(name)
 
-        for child in n.get("children", []):
+        for child in n.get("children", ()):
             walk(child, in_decl)
 
     walk(node)
@@ -945,7 +1178,7 @@ def _js_collect_declared_variables(node: dict) -> dict[str, dict]:
             name = n.get("name")
             if name:
                 declared[name] = {"line": lineno, "scope": scope, "type": "function"}
-            for child in n.get("children", []):
+            for child in n.get("children", ()):
                 walk(child, name or scope)
             return
 
@@ -954,7 +1187,7 @@ def _js_collect_declared_variables(node: dict) -> dict[str, dict]:
             name = n.get("name")
             if name:
                 declared[name] = {"line": lineno, "scope": scope, "type": "class"}
-            for child in n.get("children", []):
+            for child in n.get("children", ()):
                 walk(child, name or scope)
             return
 
@@ -968,17 +1201,17 @@ def _js_collect_declared_variables(node: dict) -> dict[str, dict]:
         # Method definition — creates new scope
         if ntype == "method_definition":
             name = n.get("name")
-            for child in n.get("children", []):
+            for child in n.get("children", ()):
                 walk(child, name or scope)
             return
 
         # Arrow function — creates new scope
         if ntype == "arrow_function":
-            for child in n.get("children", []):
+            for child in n.get("children", ()):
                 walk(child, scope)
             return
 
-        for child in n.get("children", []):
+        for child in n.get("children", ()):
             walk(child, scope)
 
     walk(node)
@@ -1010,7 +1243,7 @@ def _js_collect_scoped_declarations(
                 scopes[scope][name] = lineno
                 new_scope = f"{scope}.{name}"
                 scopes[new_scope] = {}
-                for child in n.get("children", []):
+                for child in n.get("children", ()):
                     walk(child, new_scope, parent_scopes + [scope])
                 return
 
@@ -1023,7 +1256,7 @@ def _js_collect_scoped_declarations(
                 scopes[scope][name] = lineno
                 new_scope = f"{scope}.{name}"
                 scopes[new_scope] = {}
-                for child in n.get("children", []):
+                for child in n.get("children", ()):
                     walk(child, new_scope, parent_scopes + [scope])
                 return
 
@@ -1033,7 +1266,7 @@ def _js_collect_scoped_declarations(
             if name:
                 new_scope = f"{scope}.{name}"
                 scopes[new_scope] = {}
-                for child in n.get("children", []):
+                for child in n.get("children", ()):
                     walk(child, new_scope, parent_scopes + [scope])
                 return
 
@@ -1041,7 +1274,7 @@ def _js_collect_scoped_declarations(
         if ntype == "arrow_function":
             new_scope = f"{scope}.<arrow:{lineno}>"
             scopes[new_scope] = {}
-            for child in n.get("children", []):
+            for child in n.get("children", ()):
                 walk(child, new_scope, parent_scopes + [scope])
             return
 
@@ -1056,7 +1289,7 @@ def _js_collect_scoped_declarations(
 
         # Formal parameters — register in current scope
         if ntype in ("required_parameter", "optional_parameter"):
-            for child in n.get("children", []):
+            for child in n.get("children", ()):
                 if child.get("type") == "identifier" and child.get("name"):
                     if scope not in scopes:
                         scopes[scope] = {}
@@ -1067,7 +1300,7 @@ def _js_collect_scoped_declarations(
             # Only collect if parent is formal_parameters
             pass  # Handled by required_parameter/optional_parameter above
 
-        for child in n.get("children", []):
+        for child in n.get("children", ()):
             walk(child, scope, parent_scopes)
 
     walk(node)
@@ -1163,7 +1396,7 @@ def lint_js_variable_shadowing(ast_data: dict, path: str) -> list[dict]:
             inner_names: dict[str, int] = {}
 
             # Collect parameters
-            for child in node.get("children", []):
+            for child in node.get("children", ()):
                 if child.get("type") == "formal_parameters":
                     _collect_param_names(child, inner_names, lineno)
 
@@ -1181,7 +1414,7 @@ def lint_js_variable_shadowing(ast_data: dict, path: str) -> list[dict]:
                     })
 
             merged = {**parent_names, **inner_names}
-            for child in node.get("children", []):
+            for child in node.get("children", ()):
                 walk(child, name or scope, merged)
             return
 
@@ -1200,24 +1433,24 @@ def lint_js_variable_shadowing(ast_data: dict, path: str) -> list[dict]:
                 })
             return
 
-        for child in node.get("children", []):
+        for child in node.get("children", ()):
             walk(child, scope, parent_names)
 
     # Build top-level names first
     top_names: dict[str, int] = {}
-    for child in ast_data.get("children", []):
+    for child in ast_data.get("children", ()):
         _collect_toplevel_names(child, top_names)
 
     # Walk for shadowing — pass empty parent_names at module level
     # (top-level declarations don't shadow each other; only inner scopes shadow outer)
-    for child in ast_data.get("children", []):
+    for child in ast_data.get("children", ()):
         ntype = child.get("type", "")
         # For scope-creating nodes, pass top_names as parent so inner decls get checked
         if ntype in ("function_declaration", "method_definition", "arrow_function"):
             walk(child, "module", top_names)
         elif ntype == "export_statement":
             # Walk into exported declarations
-            for sub in child.get("children", []):
+            for sub in child.get("children", ()):
                 if sub.get("type") in ("function_declaration", "class_declaration"):
                     walk(sub, "module", top_names)
                 else:
@@ -1231,13 +1464,13 @@ def lint_js_variable_shadowing(ast_data: dict, path: str) -> list[dict]:
 
 def _collect_param_names(node: dict, names: dict[str, int], default_line: int) -> None:
     """Collect parameter names from formal_parameters node."""
-    for child in node.get("children", []):
+    for child in node.get("children", ()):
         ctype = child.get("type", "")
         if ctype == "identifier" and child.get("name"):
             lineno = child.get("start_point", {}).get("row", default_line - 1) + 1
             names[child["name"]] = lineno
         elif ctype in ("required_parameter", "optional_parameter"):
-            for sub in child.get("children", []):
+            for sub in child.get("children", ()):
                 if sub.get("type") == "identifier" and sub.get("name"):
                     lineno = sub.get("start_point", {}).get("row", default_line - 1) + 1
                     names[sub["name"]] = lineno
@@ -1254,19 +1487,19 @@ def _collect_toplevel_names(node: dict, names: dict[str, int]) -> None:
         if name:
             names[name] = lineno
     elif ntype == "lexical_declaration":
-        for child in node.get("children", []):
+        for child in node.get("children", ()):
             if child.get("type") == "variable_declarator" and child.get("name"):
                 names[child["name"]] = lineno
     elif ntype == "variable_declaration":
-        for child in node.get("children", []):
+        for child in node.get("children", ()):
             if child.get("type") == "variable_declarator" and child.get("name"):
                 names[child["name"]] = lineno
     elif ntype == "export_statement":
-        for child in node.get("children", []):
+        for child in node.get("children", ()):
             _collect_toplevel_names(child, names)
     elif ntype == "import_statement":
         # Imports are top-level names
-        for child in node.get("children", []):
+        for child in node.get("children", ()):
             _collect_import_toplevel(child, names, lineno)
 
 
@@ -1276,35 +1509,38 @@ def _collect_import_toplevel(node: dict, names: dict[str, int], lineno: int) ->
     if ntype == "identifier" and node.get("name"):
         names[node["name"]] = lineno
     elif ntype == "import_specifier":
-        ids = [c for c in node.get("children", []) if c.get("type") == "identifier" and c.get("name")]
+        ids = [c for c in node.get("children", ()) if c.get("type") == "identifier" and c.get("name")]
         if ids:
             names[ids[-1]["name"]] = lineno
         return
     elif ntype == "namespace_import":
-        for child in node.get("children", []):
+        for child in node.get("children", ()):
             if child.get("type") == "identifier" and child.get("name"):
                 names[child["name"]] = lineno
         return
-    for child in node.get("children", []):
+    for child in node.get("children", ()):
         _collect_import_toplevel(child, names, lineno)
 
 
-def lint_js_ast(ast_data: dict, path: str, config: dict) -> list[dict]:
+def lint_js_ast(
+    ast_data: dict, path: str, config: Union[dict, LintConfig]
+) -> list[dict]:
     """Run AST-aware lint rules on JavaScript/TypeScript code.
 
     Args:
         ast_data: Tree-sitter AST dict.
         path: Source file path.
-        config: Lint configuration.
+        config: Lint configuration (dict or pre-resolved LintConfig).
 
     Returns:
         List of diagnostic records.
     """
     diagnostics = []
 
-    check_unused_imports = config.get("check_unused_imports", True)
-    check_unused_variables = config.get("check_unused_variables", True)
-    check_shadowing = config.get("check_variable_shadowing", True)
+    options = LintConfig.from_dict(config)
+    check_unused_imports = options.check_unused_imports
+    check_unused_variables = options.check_unused_variables
+    check_shadowing = options.check_variable_shadowing
 
     if check_unused_imports:
         diagnostics.extend(lint_js_unused_imports(ast_data, path))
@@ -1318,13 +1554,15 @@ def lint_js_ast(ast_data: dict, path: str, config: dict) -> list[dict]:
     return diagnostics
 
 
-def lint_python_ast(ast_data: dict, path: str, config: dict) -> list[dict]:
+def lint_python_ast(
+    ast_data: dict, path: str, config: Union[dict, LintConfig]
+) -> list[dict]:
     """Run AST-aware lint rules on Python code.
 
     Args:
         ast_data: Parsed Python AST dict.
         path: Source file path.
-        config: Lint configuration.
+        config: Lint configuration (dict or pre-resolved LintConfig).
 
     Returns:
         List of diagnostic records.
@@ -1332,15 +1570,21 @@ def lint_python_ast(ast_data: dict, path: str, config: dict) -> list[dict]:
     diagnostics = []
 
     # Get config options
-    check_unused_imports = config.get("check_unused_imports", True)
-    check_unused_variables = config.get("check_unused_variables", True)
-    check_shadowing = config.get("check_variable_shadowing", True)
+    options = LintConfig.from_dict(config)
+    check_unused_imports = options.check_unused_imports
+    check_unused_variables = options.check_unused_variables
+    check_shadowing = options.check_variable_shadowing
+
+    # Collect imports, definitions and uses once for both L101 and L102
+    names = None
+    if check_unused_imports or check_unused_variables:
+        names = ModuleNames.from_ast(ast_data)
 
     if check_unused_imports:
-        diagnostics.extend(lint_unused_imports(ast_data, path))
+        diagnostics.extend(lint_unused_imports(ast_data, path, names))
 
     if check_unused_variables:
-        diagnostics.extend(lint_unused_variables(ast_data, path))
+        diagnostics.extend(lint_unused_variables(ast_data, path, names))
 
     if check_shadowing:
         diagnostics.extend(lint_variable_shadowing(ast_data, path))
@@ -1348,6 +1592,51 @@ def lint_python_ast(ast_data: dict, path: str, config: dict) -> list[dict]:
     return diagnostics
 
 
+def _load_cached_diagnostics(
+    cache: DerivedCache, object_ref: str, variant: str, path: str
+) -> Optional[list[dict]]:
+    """Load cached diagnostics for an object and attach the file path.
+
+    Entries are stored without the path, since the same content can appear
+    under several paths.
+
+    Args:
+        cache: Derived cache for lint diagnostics.
+        object_ref: Object reference the diagnostics were computed from.
+        variant: Cache variant (pass name and config fingerprint).
+        path: Path to report the diagnostics under.
+
+    Returns:
+        Diagnostic records, or None on a cache miss.
+    """
+    cached = cache.get(object_ref, variant)
+    if not isinstance(cached, list):
+        return None
+    return [
+        {"kind": entry["kind"], "path": path, **entry}
+        for entry in cached
+        if isinstance(entry, dict) and "kind" in entry
+    ]
+
+
+def _store_cached_diagnostics(
+    cache: DerivedCache, object_ref: str, variant: str, diagnostics: list[dict]
+) -> None:
+    """Store diagnostics for an object, minus the file path.
+
+    Args:
+        cache: Derived cache for lint diagnostics.
+        object_ref: Object reference the diagnostics were computed from.
+        variant: Cache variant (pass name and config fingerprint).
+        diagnostics: Diagnostic records to store.
+    """
+    entries = [
+        {key: value for key, value in diagnostic.items() if key != "path"}
+        for diagnostic in diagnostics
+    ]
+    cache.put(object_ref, entries, variant)
+
+
 def lint_executor(
     config: dict, files: Iterable[dict], runner: ShardRunner
 ) -> list[dict]:
@@ -1370,28 +1659,71 @@ def lint_executor(
     batch_id = config.get("_batch_id")
     shard_id = config.get("_shard_id")
 
+    # Resolve rule options once for the whole shard
+    options = LintConfig.from_dict(config)
+
+    # AST diagnostics are a pure function of (AST object, options), so they
+    # are cached per object ref in the store's derived area. The text rules
+    # are not cached: they run faster than a cache entry can be written.
+    cache = DerivedCache(runner.store_root, "lint", LINT_CACHE_VERSION)
+    ast_variant = f"ast-{options.fingerprint()}"
+
     # Track which files we've linted with AST rules
     ast_linted_paths: set[str] = set()
 
     # First pass: AST-aware linting for files that have AST (from parse task)
     if batch_id and shard_id:
-        for ast_output in runner.iter_prior_outputs(
-            batch_id, "01_parse", shard_id, kind="ast"
-        ):
-            path = ast_output.get("path")
-            object_ref = ast_output.get("object")
+        # Skip records without a loadable AST (and chunked ASTs) up front so
+        # only real AST objects are prefetched
+        ast_outputs = (
+            ast_output
+            for ast_output in runner.iter_prior_outputs(
+                batch_id, "01_parse", shard_id, kind="ast"
+            )
+            if ast_output.get("path")
+            and ast_output.get("object")
+            and ast_output.get("format") != "json+chunks"
+        )
 
-            if not path or not object_ref or path in ast_linted_paths:
+        # Cache hits are resolved before prefetching, so a warm cache reads
+        # no AST objects at all
+        entries = [
+            (
+                ast_output,
+                _load_cached_diagnostics(
+                    cache, ast_output["object"], ast_variant, ast_output["path"]
+                ),
+            )
+            for ast_output in ast_outputs
+        ]
+
+        # AST objects of cache misses are read in batches, like file content
+        # below; they come back in the order the misses are visited
+        prefetched = runner.iter_file_bytes(
+            ast_output for ast_output, cached in entries if cached is None
+        )
+
+        for ast_output, cached in entries:
+            path = ast_output["path"]
+            object_ref = ast_output["object"]
+
+            ast_bytes = None
+            if cached is None:
+                _, ast_bytes = next(prefetched)
+
+            if path in ast_linted_paths:
                 continue
 
-            # Skip chunked ASTs
-            if ast_output.get("format") == "json+chunks":
+            if cached is not None:
+                outputs.extend(cached)
+                ast_linted_paths.add(path)
                 continue
 
             try:
-                # Load AST
-                ast_bytes = runner.object_store.get_bytes(object_ref)
-                ast_data = json.loads(ast_bytes.decode("utf-8"))
+                # Load AST (re-read on prefetch miss to surface the error)
+                if ast_bytes is None:
+                    ast_bytes = runner.object_store.get_bytes(object_ref)
+                ast_data = loads_ast(ast_bytes, intern_types=True)
 
                 # Check if this is a Python AST
                 ast_type = ast_data.get("type", "")
@@ -1399,12 +1731,18 @@ def lint_executor(
 
                 if ast_type == "Module" and ast_mode == "full":
                     # Run AST-aware Python lint rules
-                    ast_diagnostics = lint_python_ast(ast_data, path, config)
+                    ast_diagnostics = lint_python_ast(ast_data, path, options)
+                    _store_cached_diagnostics(
+                        cache, object_ref, ast_variant, ast_diagnostics
+                    )
                     outputs.extend(ast_diagnostics)
                     ast_linted_paths.add(path)
                 elif ast_type == "program" and ast_data.get("parser") == "tree-sitter":
                     # Run AST-aware JS/TS lint rules
-                    ast_diagnostics = lint_js_ast(ast_data, path, config)
+                    ast_diagnostics = lint_js_ast(ast_data, path, options)
+                    _store_cached_diagnostics(
+                        cache, object_ref, ast_variant, ast_diagnostics
+                    )
                     outputs.extend(ast_diagnostics)
                     ast_linted_paths.add(path)
 
@@ -1421,38 +1759,42 @@ def lint_executor(
                     }
                 )
 
+        # Release the prefetch thread
+        prefetched.close()
+
     # Second pass: text-based lint rules for all files
-    file_list = list(files)
-    for file_record in file_list:
+    for file_record, data in runner.iter_file_bytes(files):
         path = file_record["path"]
         object_ref = file_record["object"]
 
-        try:
-            # Get file content from CAS
-            data = runner.object_store.get_bytes(object_ref)
-
-            # Try to decode as text
-            try:
-                content = data.decode("utf-8")
-            except UnicodeDecodeError:
-                # Binary file - skip
+        if data is None:
+            data, error = runner.read_or_error(object_ref)
+            if error is not None:
+                outputs.append(
+                    {
+                        "kind": "diagnostic",
+                        "path": path,
+                        "severity": "error",
+                        "code": "L999",
+                        "message": f"Lint error: {error}",
+                        "line": 1,
+                        "col": 1,
+                    }
+                )
                 continue
 
-            # Run text-based lint rules
-            diagnostics = lint_content(content, path, config)
-            outputs.extend(diagnostics)
+        # Binary sniff: a NUL in the leading bytes means not source text
+        if looks_binary(data):
+            continue
+
+        # Try to decode as text (catches binaries without an early NUL)
+        try:
+            content = data.decode("utf-8")
+        except UnicodeDecodeError:
+            # Binary file - skip
+            continue
 
-        except Exception as e:
-            outputs.append(
-                {
-                    "kind": "diagnostic",
-                    "path": path,
-                    "severity": "error",
-                    "code": "L999",
-                    "message": f"Lint error: {e}",
-                    "line": 1,
-                    "col": 1,
-                }
-            )
+        # Run text-based lint rules
+        outputs.extend(lint_content(content, path, options))
 
     return outputs
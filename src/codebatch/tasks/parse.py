@@ -18,14 +18,28 @@ Phase 8: Full Python AST with function/class/variable names preserved.
 import ast
 import json
 import re
-from typing import Any, Iterable, Optional
-
-from ..common import SCHEMA_VERSION, PRODUCER
+import sys
+import threading
+from importlib.metadata import PackageNotFoundError, version
+from itertools import chain, islice
+from typing import Any, Iterable, Iterator, Optional
+
+from ..common import SCHEMA_VERSION, PRODUCER, looks_binary
+from ..derived import DerivedCache
 from ..runner import ShardRunner
 
 
+def _package_version(name: str) -> str:
+    """Get an installed distribution's version, or "unknown"."""
+    try:
+        return version(name)
+    except PackageNotFoundError:
+        return "unknown"
+
+
 # Tree-sitter imports (optional)
 _TREE_SITTER_AVAILABLE = False
+_TREE_SITTER_ENV = "none"
 _ts_js_language = None
 _ts_ts_language = None
 _ts_tsx_language = None
@@ -36,6 +50,11 @@ try:
     from tree_sitter import Language
 
     _TREE_SITTER_AVAILABLE = True
+    _TREE_SITTER_ENV = "ts{}+js{}+typescript{}".format(
+        _package_version("tree-sitter"),
+        _package_version("tree-sitter-javascript"),
+        _package_version("tree-sitter-typescript"),
+    )
     _ts_js_language = Language(ts_js.language())
     _ts_ts_language = Language(ts_ts.language_typescript())
     _ts_tsx_language = Language(ts_ts.language_tsx())
@@ -48,236 +67,318 @@ def is_treesitter_available() -> bool:
     return _TREE_SITTER_AVAILABLE
 
 
-# Default chunk size: 16MB
-DEFAULT_CHUNK_SIZE = 16 * 1024 * 1024
+# Tree-sitter parsers are reused across files, one set per thread since a
+# Parser is not safe to share between threads
+_ts_parser_cache = threading.local()
 
 
-def _ast_node_to_dict(node: ast.AST, depth: int = 0, max_depth: int = 50) -> dict:
-    """Convert an AST node to a dictionary with full fidelity.
-
-    Preserves all important attributes including names, args, etc.
-    Uses depth limiting to handle recursive structures.
+def _get_ts_parser(grammar: str):
+    """Get this thread's tree-sitter parser for a grammar.
 
     Args:
-        node: AST node to convert.
-        depth: Current recursion depth.
-        max_depth: Maximum recursion depth.
+        grammar: One of "javascript", "typescript" or "tsx".
 
     Returns:
-        Dictionary representation of the node.
+        Tree-sitter Parser for the grammar.
     """
-    if depth > max_depth:
-        return {"type": node.__class__.__name__, "truncated": True}
+    parsers = getattr(_ts_parser_cache, "parsers", None)
+    if parsers is None:
+        parsers = _ts_parser_cache.parsers = {}
 
-    result: dict[str, Any] = {"type": node.__class__.__name__}
+    parser = parsers.get(grammar)
+    if parser is None:
+        from tree_sitter import Parser
 
-    # Add location info if present
-    if hasattr(node, "lineno"):
-        result["lineno"] = node.lineno
-    if hasattr(node, "col_offset"):
-        result["col_offset"] = node.col_offset
-    if hasattr(node, "end_lineno"):
-        result["end_lineno"] = node.end_lineno
-    if hasattr(node, "end_col_offset"):
-        result["end_col_offset"] = node.end_col_offset
+        language = {
+            "javascript": _ts_js_language,
+            "typescript": _ts_ts_language,
+            "tsx": _ts_tsx_language,
+        }[grammar]
+        parser = parsers[grammar] = Parser(language)
+    return parser
 
-    # Handle specific node types with their important attributes
-    node_type = node.__class__.__name__
+
+# Default chunk size: 16MB
+DEFAULT_CHUNK_SIZE = 16 * 1024 * 1024
+
+# Version of cached parse results; bump when any parser's output changes
+PARSE_CACHE_VERSION = 2
+
+# ast.parse output depends on the interpreter, so cached results are kept
+# per Python version (tree-sitter results also per runtime/grammar versions)
+_PYTHON_ENV = "py{}.{}".format(*sys.version_info[:2])
+
+# Files handed to each worker process at a time when parsing in parallel
+PARSE_WORKER_CHUNKSIZE = 16
+
+# Files looked up and dispatched together when parsing in parallel
+PARSE_WINDOW_SIZE = 1024
+
+# Values at this depth (for a Python AST, the fields of top-level statements)
+# are encoded to JSON in one call when streaming; shallower containers are
+# written piece by piece
+_JSON_STREAM_DEPTH = 3
+
+# Same output as json.dumps(..., separators=(",", ":")), without building an
+# encoder per call
+_JSON_ENCODER = json.JSONEncoder(separators=(",", ":"))
+
+# Token scanner for the regex JS/TS fallback. One alternation, tried left to
+# right: comments and strings are consumed whole, and keywords are matched
+# before the generic identifier rule, so each token is counted exactly once.
+_JS_TOKEN_TYPES = ("keyword", "string", "number", "comment", "identifier")
+_JS_TOKEN_RE = re.compile(
+    r"(?P<comment>//.*|/\*[\s\S]*?\*/)"
+    r"|(?P<string>([\"'])(?:(?!\3)[^\\]|\\.)*\3)"
+    r"|(?P<keyword>\b(?:function|const|let|var|if|else|for|while|return|class|import|export|async|await)\b)"
+    r"|(?P<number>\b\d+(?:\.\d+)?\b)"
+    r"|(?P<identifier>\b[a-zA-Z_$][a-zA-Z0-9_$]*\b)"
+)
+
+
+# Steps for converting an AST node to a dict, by how the field is emitted
+_LOC = 0  # location attribute, copied as-is
+_SCALAR = 1  # identifier, copied unless None
+_NODE = 2  # child node, converted if set
+_NODE_ALWAYS = 3  # child node, always converted
+_NODES = 4  # list of child nodes, converted if non-empty
+_NODES_ALWAYS = 5  # list of child nodes, always converted
+_ARGUMENTS = 6  # function arguments
+_ALIASES = 7  # import aliases
+_VALUE = 8  # plain value, always copied
+_CONSTANT = 9  # Constant.value, made JSON-safe
+_KEYWORDS = 10  # call keywords
+_OP_NAME = 11  # operator class name
+_DICT_KEYS = 12  # dict keys, None for ** unpacking
+_BODY = 13  # statement list, always emitted
+_BLOCK = 14  # statement list, emitted if non-empty
+
+_MISSING = object()
+
+# Top-level statements kept by parse_python(shallow=True)
+_SUMMARY_STATEMENTS = (
+    ast.FunctionDef,
+    ast.AsyncFunctionDef,
+    ast.ClassDef,
+    ast.Import,
+    ast.ImportFrom,
+)
+
+# AST class -> conversion plan, built on first use of each class
+_NODE_PLANS: dict[type, tuple[tuple[int, str, str], ...]] = {}
+
+
+def _build_node_plan(cls: type) -> tuple[tuple[int, str, str], ...]:
+    """Build the conversion plan for an AST node class.
+
+    The plan lists, in output key order, only the fields this class has
+    that _ast_node_to_dict emits, so converting a node needs no hasattr
+    probing or per-type string comparisons.
+
+    Args:
+        cls: AST node class.
+
+    Returns:
+        Tuple of (step, output key, attribute name) entries.
+    """
+    fields = set(cls._fields) | set(cls._attributes)
+    node_type = cls.__name__
+    steps = []
+
+    def add(step: int, key: str, attr: Optional[str] = None) -> None:
+        attr = attr or key
+        if attr in fields:
+            steps.append((step, key, attr))
+
+    # Location info
+    for attr in ("lineno", "col_offset", "end_lineno", "end_col_offset"):
+        add(_LOC, attr)
 
     # Names and identifiers
-    if hasattr(node, "name") and node.name is not None:
-        result["name"] = node.name
-    if hasattr(node, "id") and node.id is not None:
-        result["id"] = node.id
-    if hasattr(node, "attr") and node.attr is not None:
-        result["attr"] = node.attr
-    if hasattr(node, "asname") and node.asname is not None:
-        result["asname"] = node.asname
-    if hasattr(node, "module") and node.module is not None:
-        result["module"] = node.module
-    if hasattr(node, "arg") and node.arg is not None:
-        result["arg"] = node.arg
+    for attr in ("name", "id", "attr", "asname", "module", "arg"):
+        add(_SCALAR, attr)
 
     # Function arguments
-    if node_type == "FunctionDef" or node_type == "AsyncFunctionDef":
-        if hasattr(node, "args") and node.args:
-            result["args"] = _convert_arguments(node.args, depth + 1, max_depth)
-        if hasattr(node, "decorator_list") and node.decorator_list:
-            result["decorators"] = [
-                _ast_node_to_dict(d, depth + 1, max_depth) for d in node.decorator_list
-            ]
-        if hasattr(node, "returns") and node.returns:
-            result["returns"] = _ast_node_to_dict(node.returns, depth + 1, max_depth)
+    if node_type in ("FunctionDef", "AsyncFunctionDef"):
+        add(_ARGUMENTS, "args")
+        add(_NODES, "decorators", "decorator_list")
+        add(_NODE, "returns")
 
-    # Class bases and keywords
+    # Class bases and decorators
     if node_type == "ClassDef":
-        if hasattr(node, "bases") and node.bases:
-            result["bases"] = [
-                _ast_node_to_dict(b, depth + 1, max_depth) for b in node.bases
-            ]
-        if hasattr(node, "decorator_list") and node.decorator_list:
-            result["decorators"] = [
-                _ast_node_to_dict(d, depth + 1, max_depth) for d in node.decorator_list
-            ]
+        add(_NODES, "bases")
+        add(_NODES, "decorators", "decorator_list")
 
     # Import handling
     if node_type == "Import":
-        result["names"] = [
-            {"name": alias.name, "asname": alias.asname} for alias in node.names
-        ]
+        add(_ALIASES, "names")
     if node_type == "ImportFrom":
-        result["names"] = [
-            {"name": alias.name, "asname": alias.asname} for alias in node.names
-        ]
-        result["level"] = node.level
+        add(_ALIASES, "names")
+        add(_VALUE, "level")
 
     # Assignment targets
     if node_type in ("Assign", "AnnAssign", "AugAssign"):
-        if hasattr(node, "targets"):
-            result["targets"] = [
-                _ast_node_to_dict(t, depth + 1, max_depth) for t in node.targets
-            ]
-        if hasattr(node, "target"):
-            result["target"] = _ast_node_to_dict(node.target, depth + 1, max_depth)
-        if hasattr(node, "annotation") and node.annotation:
-            result["annotation"] = _ast_node_to_dict(
-                node.annotation, depth + 1, max_depth
-            )
+        add(_NODES_ALWAYS, "targets")
+        add(_NODE_ALWAYS, "target")
+        add(_NODE, "annotation")
 
     # Literals
     if node_type == "Constant":
-        # Represent the value safely
-        val = node.value
-        if isinstance(val, (str, int, float, bool, type(None))):
-            result["value"] = val
-        elif isinstance(val, bytes):
-            result["value"] = f"<bytes:{len(val)}>"
-        else:
-            result["value"] = f"<{type(val).__name__}>"
+        add(_CONSTANT, "value")
 
-    # Expression statements (Expr) - capture the value
-    if node_type == "Expr" and hasattr(node, "value") and node.value:
-        result["value"] = _ast_node_to_dict(node.value, depth + 1, max_depth)
+    # Expression statements
+    if node_type == "Expr":
+        add(_NODE, "value")
 
     # Call expressions
     if node_type == "Call":
-        if hasattr(node, "func") and node.func:
-            result["func"] = _ast_node_to_dict(node.func, depth + 1, max_depth)
-        if hasattr(node, "args") and node.args:
-            result["args"] = [
-                _ast_node_to_dict(a, depth + 1, max_depth) for a in node.args
-            ]
-        if hasattr(node, "keywords") and node.keywords:
-            result["keywords"] = [
-                {
-                    "arg": kw.arg,
-                    "value": _ast_node_to_dict(kw.value, depth + 1, max_depth),
-                }
-                for kw in node.keywords
-            ]
+        add(_NODE, "func")
+        add(_NODES, "args")
+        add(_KEYWORDS, "keywords")
 
     # Attribute access
-    if node_type == "Attribute" and hasattr(node, "value") and node.value:
-        result["value"] = _ast_node_to_dict(node.value, depth + 1, max_depth)
+    if node_type == "Attribute":
+        add(_NODE, "value")
 
     # Subscript
     if node_type == "Subscript":
-        if hasattr(node, "value") and node.value:
-            result["value"] = _ast_node_to_dict(node.value, depth + 1, max_depth)
-        if hasattr(node, "slice") and node.slice:
-            result["slice"] = _ast_node_to_dict(node.slice, depth + 1, max_depth)
+        add(_NODE, "value")
+        add(_NODE, "slice")
 
-    # Binary operations
+    # Binary, comparison and boolean operations
     if node_type in ("BinOp", "Compare", "BoolOp"):
-        if hasattr(node, "left") and node.left:
-            result["left"] = _ast_node_to_dict(node.left, depth + 1, max_depth)
-        if hasattr(node, "right") and node.right:
-            result["right"] = _ast_node_to_dict(node.right, depth + 1, max_depth)
-        if hasattr(node, "comparators") and node.comparators:
-            result["comparators"] = [
-                _ast_node_to_dict(c, depth + 1, max_depth) for c in node.comparators
-            ]
-        if hasattr(node, "values") and node.values:
-            result["values"] = [
-                _ast_node_to_dict(v, depth + 1, max_depth) for v in node.values
-            ]
-
-    # Unary operations
-    if node_type == "UnaryOp" and hasattr(node, "operand") and node.operand:
-        result["operand"] = _ast_node_to_dict(node.operand, depth + 1, max_depth)
-
-    # BoolOp (and/or expressions)
+        add(_NODE, "left")
+        add(_NODE, "right")
+        add(_NODES, "comparators")
+        add(_NODES, "values")
+    if node_type == "UnaryOp":
+        add(_NODE, "operand")
     if node_type == "BoolOp":
-        if hasattr(node, "values") and node.values:
-            result["values"] = [
-                _ast_node_to_dict(v, depth + 1, max_depth) for v in node.values
-            ]
-        # Also capture the operator type
-        if hasattr(node, "op"):
-            result["op"] = node.op.__class__.__name__
+        add(_OP_NAME, "op")
 
     # Return/Yield statements
     if node_type in ("Return", "Yield", "YieldFrom"):
-        if hasattr(node, "value") and node.value:
-            result["value"] = _ast_node_to_dict(node.value, depth + 1, max_depth)
+        add(_NODE, "value")
 
-    # List/Tuple/Set literals
+    # List/Tuple/Set and Dict literals
     if node_type in ("List", "Tuple", "Set"):
-        if hasattr(node, "elts") and node.elts:
-            result["elts"] = [
-                _ast_node_to_dict(e, depth + 1, max_depth) for e in node.elts
-            ]
-
-    # Dict literals
+        add(_NODES, "elts")
     if node_type == "Dict":
-        if hasattr(node, "keys") and node.keys:
-            result["keys"] = [
-                _ast_node_to_dict(k, depth + 1, max_depth) if k else None
-                for k in node.keys
-            ]
-        if hasattr(node, "values") and node.values:
-            result["values"] = [
-                _ast_node_to_dict(v, depth + 1, max_depth) for v in node.values
-            ]
+        add(_DICT_KEYS, "keys")
+        add(_NODES, "values")
 
-    # If/While/For test condition
+    # If/While/For conditions, iterables and targets
     if node_type in ("If", "While", "IfExp"):
-        if hasattr(node, "test") and node.test:
-            result["test"] = _ast_node_to_dict(node.test, depth + 1, max_depth)
-
-    # For loop iter and target
+        add(_NODE, "test")
     if node_type in ("For", "AsyncFor"):
-        if hasattr(node, "iter") and node.iter:
-            result["iter"] = _ast_node_to_dict(node.iter, depth + 1, max_depth)
-        if hasattr(node, "target") and node.target:
-            result["target"] = _ast_node_to_dict(node.target, depth + 1, max_depth)
-
-    # For body-containing nodes, include children
-    if hasattr(node, "body") and isinstance(node.body, list):
-        result["body"] = [
-            _ast_node_to_dict(child, depth + 1, max_depth)
-            for child in node.body
-            if isinstance(child, ast.AST)
-        ]
+        add(_NODE, "iter")
+        add(_NODE, "target")
 
-    # orelse for if/for/while/try
-    if hasattr(node, "orelse") and isinstance(node.orelse, list) and node.orelse:
-        result["orelse"] = [
-            _ast_node_to_dict(child, depth + 1, max_depth)
-            for child in node.orelse
-            if isinstance(child, ast.AST)
-        ]
+    # Nested statements and exception handlers
+    add(_BODY, "body")
+    add(_BLOCK, "orelse")
+    add(_NODES, "handlers")
+    if node_type == "ExceptHandler":
+        add(_NODE, "exc_type", "type")
 
-    # handlers for try/except
-    if hasattr(node, "handlers") and node.handlers:
-        result["handlers"] = [
-            _ast_node_to_dict(h, depth + 1, max_depth) for h in node.handlers
-        ]
+    plan = tuple(steps)
+    _NODE_PLANS[cls] = plan
+    return plan
 
-    # ExceptHandler specifics
-    if node_type == "ExceptHandler":
-        if hasattr(node, "type") and node.type:
-            result["exc_type"] = _ast_node_to_dict(node.type, depth + 1, max_depth)
+
+def _ast_node_to_dict(node: ast.AST, depth: int = 0, max_depth: int = 50) -> dict:
+    """Convert an AST node to a dictionary with full fidelity.
+
+    Preserves all important attributes including names, args, etc.
+    Uses depth limiting to handle recursive structures. Which fields are
+    emitted, and in what order, comes from the node class's plan (see
+    _build_node_plan).
+
+    Args:
+        node: AST node to convert.
+        depth: Current recursion depth.
+        max_depth: Maximum recursion depth.
+
+    Returns:
+        Dictionary representation of the node.
+    """
+    cls = node.__class__
+    if depth > max_depth:
+        return {"type": cls.__name__, "truncated": True}
+
+    plan = _NODE_PLANS.get(cls)
+    if plan is None:
+        plan = _build_node_plan(cls)
+
+    result: dict[str, Any] = {"type": cls.__name__}
+    child_depth = depth + 1
+
+    for step, key, attr in plan:
+        value = getattr(node, attr, _MISSING)
+        if value is _MISSING:
+            continue
+
+        if step == _LOC:
+            result[key] = value
+        elif step == _NODE:
+            if value:
+                result[key] = _ast_node_to_dict(value, child_depth, max_depth)
+        elif step == _SCALAR:
+            if value is not None:
+                result[key] = value
+        elif step == _BODY or step == _BLOCK:
+            if isinstance(value, list) and (value or step == _BODY):
+                result[key] = [
+                    _ast_node_to_dict(child, child_depth, max_depth)
+                    for child in value
+                    if isinstance(child, ast.AST)
+                ]
+        elif step == _NODES:
+            if value:
+                result[key] = [
+                    _ast_node_to_dict(child, child_depth, max_depth)
+                    for child in value
+                ]
+        elif step == _CONSTANT:
+            # Represent the value safely
+            if isinstance(value, (str, int, float, bool, type(None))):
+                result[key] = value
+            elif isinstance(value, bytes):
+                result[key] = f"<bytes:{len(value)}>"
+            else:
+                result[key] = f"<{type(value).__name__}>"
+        elif step == _KEYWORDS:
+            if value:
+                result[key] = [
+                    {
+                        "arg": kw.arg,
+                        "value": _ast_node_to_dict(kw.value, child_depth, max_depth),
+                    }
+                    for kw in value
+                ]
+        elif step == _NODE_ALWAYS:
+            result[key] = _ast_node_to_dict(value, child_depth, max_depth)
+        elif step == _NODES_ALWAYS:
+            result[key] = [
+                _ast_node_to_dict(child, child_depth, max_depth) for child in value
+            ]
+        elif step == _ARGUMENTS:
+            if value:
+                result[key] = _convert_arguments(value, child_depth, max_depth)
+        elif step == _ALIASES:
+            result[key] = [
+                {"name": alias.name, "asname": alias.asname} for alias in value
+            ]
+        elif step == _VALUE:
+            result[key] = value
+        elif step == _OP_NAME:
+            result[key] = value.__class__.__name__
+        elif step == _DICT_KEYS:
+            if value:
+                result[key] = [
+                    _ast_node_to_dict(k, child_depth, max_depth) if k else None
+                    for k in value
+                ]
 
     return result
 
@@ -337,7 +438,67 @@ def _convert_arguments(args: ast.arguments, depth: int, max_depth: int) -> dict:
     return result
 
 
-def parse_python(content: str, path: str) -> tuple[Optional[dict], list[dict]]:
+def _count_ast_nodes(tree: ast.AST) -> int:
+    """Count the nodes in an AST.
+
+    Visits the same nodes as ``ast.walk`` without going through its
+    per-node generators or materializing the node list.
+
+    Args:
+        tree: Root AST node.
+
+    Returns:
+        Number of nodes, including the root.
+    """
+    node_class = ast.AST
+    count = 0
+    stack = [tree]
+    push = stack.append
+    while stack:
+        node = stack.pop()
+        count += 1
+        for field in node._fields:
+            value = getattr(node, field, None)
+            if isinstance(value, node_class):
+                push(value)
+            elif isinstance(value, list):
+                # Push items directly rather than building a filtered list
+                for item in value:
+                    if isinstance(item, node_class):
+                        push(item)
+    return count
+
+
+def _summarize_statement(node: ast.stmt) -> dict:
+    """Describe a top-level definition or import without its body.
+
+    Args:
+        node: FunctionDef, AsyncFunctionDef, ClassDef, Import or ImportFrom.
+
+    Returns:
+        Dict with the node's type, location and names, keyed as in the full AST.
+    """
+    result: dict[str, Any] = {
+        "type": node.__class__.__name__,
+        "lineno": node.lineno,
+        "col_offset": node.col_offset,
+        "end_lineno": node.end_lineno,
+        "end_col_offset": node.end_col_offset,
+    }
+    if isinstance(node, (ast.Import, ast.ImportFrom)):
+        if isinstance(node, ast.ImportFrom) and node.module is not None:
+            result["module"] = node.module
+        result["names"] = [{"name": a.name, "asname": a.asname} for a in node.names]
+        if isinstance(node, ast.ImportFrom):
+            result["level"] = node.level
+    else:
+        result["name"] = node.name
+    return result
+
+
+def parse_python(
+    content: str, path: str, shallow: bool = False
+) -> tuple[Optional[dict], list[dict]]:
     """Parse Python source code with full AST fidelity.
 
     Produces a complete AST with all names preserved:
@@ -348,6 +509,8 @@ def parse_python(content: str, path: str) -> tuple[Optional[dict], list[dict]]:
     Args:
         content: Python source code.
         path: File path for error reporting.
+        shallow: Emit only top-level functions, classes and imports
+            (ast_mode "summary") instead of the full AST.
 
     Returns:
         Tuple of (AST dict or None, list of diagnostics).
@@ -357,13 +520,30 @@ def parse_python(content: str, path: str) -> tuple[Optional[dict], list[dict]]:
     try:
         tree = ast.parse(content, filename=path)
 
+        if shallow:
+            # Names only: no descent below the module's statements
+            body = [
+                _summarize_statement(node)
+                for node in tree.body
+                if isinstance(node, _SUMMARY_STATEMENTS)
+            ]
+            ast_dict = {
+                "type": "Module",
+                "ast_mode": "summary",
+                "body": body,
+                "stats": {
+                    "total_nodes": len(body) + 1,
+                },
+            }
+            return ast_dict, diagnostics
+
         # Convert full AST to dict with names preserved
         ast_dict = {
             "type": "Module",
             "ast_mode": "full",  # Phase 8: full fidelity mode
             "body": [_ast_node_to_dict(node) for node in tree.body],
             "stats": {
-                "total_nodes": len(list(ast.walk(tree))),
+                "total_nodes": _count_ast_nodes(tree),
             },
         }
         return ast_dict, diagnostics
@@ -473,7 +653,10 @@ def _ts_node_to_dict(
 
 
 def parse_javascript_treesitter(
-    content: str, path: str, is_typescript: bool = False
+    content: str,
+    path: str,
+    is_typescript: bool = False,
+    source_bytes: Optional[bytes] = None,
 ) -> tuple[Optional[dict], list[dict]]:
     """Parse JavaScript/TypeScript using tree-sitter.
 
@@ -481,47 +664,29 @@ def parse_javascript_treesitter(
         content: JS/TS source code.
         path: File path.
         is_typescript: Whether to use TypeScript grammar.
+        source_bytes: content encoded as UTF-8, if the caller already has it.
 
     Returns:
         Tuple of (AST dict or None, list of diagnostics).
     """
     diagnostics = []
-    source_bytes = content.encode("utf-8")
+    if source_bytes is None:
+        source_bytes = content.encode("utf-8")
 
     # Select language
     if is_typescript:
         if path.endswith(".tsx"):
-            language = _ts_tsx_language
+            grammar = "tsx"
         else:
-            language = _ts_ts_language
+            grammar = "typescript"
     else:
-        language = _ts_js_language
-
-    from tree_sitter import Parser
+        grammar = "javascript"
 
-    parser = Parser(language)
-    tree = parser.parse(source_bytes)
+    tree = _get_ts_parser(grammar).parse(source_bytes)
 
     # Check for parse errors
     if tree.root_node.has_error:
-        # Find error nodes
-        def find_errors(node):
-            errors = []
-            if node.type == "ERROR" or node.is_missing:
-                errors.append(
-                    {
-                        "severity": "error",
-                        "code": "E0002",
-                        "message": f"Parse error at {node.type}",
-                        "line": node.start_point[0] + 1,
-                        "column": node.start_point[1] + 1,
-                    }
-                )
-            for child in node.children:
-                errors.extend(find_errors(child))
-            return errors
-
-        diagnostics.extend(find_errors(tree.root_node))
+        diagnostics.extend(_find_ts_errors(tree.root_node))
 
     # Convert to dict
     ast_dict = _ts_node_to_dict(tree.root_node, source_bytes)
@@ -534,12 +699,56 @@ def parse_javascript_treesitter(
     return ast_dict, diagnostics
 
 
+def _find_ts_errors(root) -> list[dict]:
+    """Collect diagnostics for error and missing nodes in a tree-sitter tree.
+
+    Only subtrees flagged has_error are entered, so error-free parts of a
+    broken file are skipped rather than walked.
+
+    Args:
+        root: Tree-sitter Node to search.
+
+    Returns:
+        List of diagnostics, in source (preorder) order.
+    """
+    errors = []
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        if node.type == "ERROR" or node.is_missing:
+            errors.append(
+                {
+                    "severity": "error",
+                    "code": "E0002",
+                    "message": f"Parse error at {node.type}",
+                    "line": node.start_point[0] + 1,
+                    "column": node.start_point[1] + 1,
+                }
+            )
+        stack.extend(reversed([c for c in node.children if c.has_error]))
+    return errors
+
+
 def _count_ts_nodes(node) -> int:
     """Count total nodes in tree-sitter tree."""
+    # Bindings that expose it report the size kept by the tree itself
+    descendant_count = getattr(node, "descendant_count", None)
+    if descendant_count is not None:
+        return descendant_count
+
+    # Otherwise walk with a cursor: preorder, without Python recursion
+    cursor = node.walk()
     count = 1
-    for child in node.children:
-        count += _count_ts_nodes(child)
-    return count
+    while True:
+        if cursor.goto_first_child() or cursor.goto_next_sibling():
+            count += 1
+            continue
+        while True:
+            if not cursor.goto_parent():
+                return count
+            if cursor.goto_next_sibling():
+                count += 1
+                break
 
 
 def parse_javascript_fallback(
@@ -558,23 +767,9 @@ def parse_javascript_fallback(
     """
     diagnostics = []
 
-    # Simple token patterns
-    patterns = {
-        "keyword": r"\b(function|const|let|var|if|else|for|while|return|class|import|export|async|await)\b",
-        "string": r'(["\'])(?:(?!\1)[^\\]|\\.)*\1',
-        "number": r"\b\d+(?:\.\d+)?\b",
-        "comment": r"//.*|/\*[\s\S]*?\*/",
-        "identifier": r"\b[a-zA-Z_$][a-zA-Z0-9_$]*\b",
-    }
-
-    token_counts = {}
-    for token_type, pattern in patterns.items():
-        matches = re.findall(pattern, content)
-        # Handle tuple returns from capture groups
-        if matches and isinstance(matches[0], tuple):
-            token_counts[token_type] = len(matches)
-        else:
-            token_counts[token_type] = len(matches)
+    token_counts = dict.fromkeys(_JS_TOKEN_TYPES, 0)
+    for match in _JS_TOKEN_RE.finditer(content):
+        token_counts[match.lastgroup] += 1
 
     # Check for common issues
     # Unbalanced braces
@@ -605,7 +800,9 @@ def parse_javascript_fallback(
     return ast_dict, diagnostics
 
 
-def parse_javascript(content: str, path: str) -> tuple[Optional[dict], list[dict]]:
+def parse_javascript(
+    content: str, path: str, source_bytes: Optional[bytes] = None
+) -> tuple[Optional[dict], list[dict]]:
     """Parse JavaScript/TypeScript source code.
 
     Uses tree-sitter for full AST when available, falls back to
@@ -614,13 +811,17 @@ def parse_javascript(content: str, path: str) -> tuple[Optional[dict], list[dict
     Args:
         content: JS/TS source code.
         path: File path.
+        source_bytes: content encoded as UTF-8, if the caller already has it
+            (saves re-encoding it for tree-sitter).
 
     Returns:
         Tuple of (AST/token info dict or None, list of diagnostics).
     """
     if _TREE_SITTER_AVAILABLE:
         is_ts = path.endswith((".ts", ".tsx"))
-        return parse_javascript_treesitter(content, path, is_typescript=is_ts)
+        return parse_javascript_treesitter(
+            content, path, is_typescript=is_ts, source_bytes=source_bytes
+        )
     else:
         return parse_javascript_fallback(content, path)
 
@@ -645,15 +846,76 @@ def parse_text(content: str, path: str) -> tuple[Optional[dict], list[dict]]:
             "lines": len(lines),
             "words": len(words),
             "characters": len(content),
-            "non_empty_lines": sum(1 for line in lines if line.strip()),
+            # Drop empty and whitespace-only lines without stripping copies
+            "non_empty_lines": len(lines)
+            - lines.count("")
+            - sum(map(str.isspace, lines)),
         },
     }
 
     return ast_dict, []
 
 
+def _iter_json_fragments(value: Any, depth: int = 0) -> Iterator[str]:
+    """Encode a value as compact JSON, piece by piece.
+
+    The concatenated pieces equal json.dumps(value, separators=(",", ":")).
+    Containers below _JSON_STREAM_DEPTH are encoded whole by json.dumps, so
+    the number of pieces stays small.
+
+    Args:
+        value: JSON-serializable value (dict keys must be strings).
+        depth: Nesting depth of value.
+
+    Yields:
+        JSON text fragments.
+    """
+    if depth >= _JSON_STREAM_DEPTH or not value or not isinstance(value, (dict, list)):
+        yield _JSON_ENCODER.encode(value)
+        return
+
+    depth += 1
+    if isinstance(value, dict):
+        separator = "{"
+        for key, item in value.items():
+            yield separator + _JSON_ENCODER.encode(key) + ":"
+            yield from _iter_json_fragments(item, depth)
+            separator = ","
+        yield "}"
+    else:
+        separator = "["
+        for item in value:
+            yield separator
+            yield from _iter_json_fragments(item, depth)
+            separator = ","
+        yield "]"
+
+
+def _iter_json_chunks(value: Any, chunk_size: int) -> Iterator[bytes]:
+    """Encode a value as compact JSON in fixed-size chunks.
+
+    Only about one chunk of encoded output is held at a time. The chunks are
+    the chunk_size slices of json.dumps(value, separators=(",", ":")).
+
+    Args:
+        value: JSON-serializable value.
+        chunk_size: Size of every chunk but the last.
+
+    Yields:
+        UTF-8 encoded chunks; the last one may be shorter.
+    """
+    buffer = bytearray()
+    for fragment in _iter_json_fragments(value):
+        buffer += fragment.encode("utf-8")
+        while len(buffer) >= chunk_size:
+            yield bytes(buffer[:chunk_size])
+            del buffer[:chunk_size]
+    if buffer:
+        yield bytes(buffer)
+
+
 def create_chunk_manifest(
-    data: bytes,
+    chunks: Iterable[bytes],
     kind: str,
     fmt: str,
     runner: ShardRunner,
@@ -661,8 +923,11 @@ def create_chunk_manifest(
 ) -> tuple[str, dict]:
     """Create a chunk manifest for large data.
 
+    Chunks are stored concurrently as they arrive, so the data never has to
+    be held in memory all at once.
+
     Args:
-        data: Raw bytes to chunk.
+        chunks: Raw bytes, already split into chunks of chunk_size.
         kind: Output kind.
         fmt: Base format identifier (will be suffixed with +chunks).
         runner: ShardRunner for CAS access.
@@ -671,19 +936,19 @@ def create_chunk_manifest(
     Returns:
         Tuple of (manifest object ref, manifest dict).
     """
-    chunks = []
-    total_bytes = len(data)
+    sizes: list[int] = []
 
-    for i in range(0, total_bytes, chunk_size):
-        chunk_data = data[i : i + chunk_size]
-        chunk_ref = runner.object_store.put_bytes(chunk_data)
-        chunks.append(
-            {
-                "object": chunk_ref,
-                "size": len(chunk_data),
-                "index": len(chunks),
-            }
-        )
+    def sized(chunks: Iterable[bytes]) -> Iterator[bytes]:
+        for chunk_data in chunks:
+            sizes.append(len(chunk_data))
+            yield chunk_data
+
+    chunk_refs = runner.object_store.put_bytes_many(sized(chunks))
+    chunk_entries = [
+        {"object": chunk_ref, "size": size, "index": index}
+        for index, (chunk_ref, size) in enumerate(zip(chunk_refs, sizes))
+    ]
+    total_bytes = sum(sizes)
 
     manifest = {
         "schema_name": "codebatch.chunk_manifest",
@@ -691,7 +956,7 @@ def create_chunk_manifest(
         "producer": PRODUCER,
         "kind": kind,
         "format": fmt,
-        "chunks": chunks,
+        "chunks": chunk_entries,
         "total_bytes": total_bytes,
         "chunk_size": chunk_size,
     }
@@ -702,112 +967,366 @@ def create_chunk_manifest(
     return manifest_ref, manifest
 
 
+def _parser_name(lang_hint: Optional[str], path: str, shallow: bool = False) -> str:
+    """Name the parser parse_executor uses for a file.
+
+    Args:
+        lang_hint: Language hint from the file record.
+        path: File path (selects the TypeScript/TSX grammar).
+        shallow: Whether Python files get a shallow (summary) AST.
+
+    Returns:
+        Parser name, e.g. "python" or "tree-sitter-tsx".
+    """
+    if lang_hint == "python":
+        return "python-shallow" if shallow else "python"
+    if lang_hint in ("javascript", "typescript"):
+        if not _TREE_SITTER_AVAILABLE:
+            return "regex-js"
+        if path.endswith(".tsx"):
+            return "tree-sitter-tsx"
+        if path.endswith(".ts"):
+            return "tree-sitter-ts"
+        return "tree-sitter-js"
+    return "text"
+
+
+def _cache_variant(parser: str, chunk_threshold: int) -> str:
+    """Get the parse cache variant for a parser.
+
+    The CodeBatch version is part of the cache directory (see DerivedCache);
+    the variant adds what else the result depends on.
+
+    Args:
+        parser: Parser name (see _parser_name).
+        chunk_threshold: AST size above which a chunk manifest is written.
+
+    Returns:
+        Variant string: parser, chunk threshold and parser environment.
+    """
+    env = _PYTHON_ENV
+    if parser.startswith("tree-sitter"):
+        env = f"{env}-{_TREE_SITTER_ENV}"
+    return f"{parser}-{chunk_threshold}-{env}"
+
+
+def _load_cached_parse(
+    cache: DerivedCache, object_ref: str, variant: str, runner: ShardRunner
+) -> Optional[dict]:
+    """Load a cached parse result for an object.
+
+    Args:
+        cache: Derived cache for parse results.
+        object_ref: Object reference of the source file.
+        variant: Cache variant (see _cache_variant).
+        runner: ShardRunner for CAS access.
+
+    Returns:
+        Dict with "ast" ({"object", "format"} or None) and "diagnostics",
+        or None on a miss or if the cached AST object is gone.
+    """
+    cached = cache.get(object_ref, variant)
+    if not isinstance(cached, dict):
+        return None
+
+    ast_entry = cached.get("ast")
+    diagnostics = cached.get("diagnostics")
+    if not isinstance(diagnostics, list):
+        return None
+    if ast_entry is not None and not (
+        isinstance(ast_entry, dict)
+        and runner.object_store.has(ast_entry.get("object", ""))
+    ):
+        return None
+
+    return cached
+
+
+def _parse_object(
+    object_ref: str,
+    path: str,
+    lang_hint: Optional[str],
+    runner: ShardRunner,
+    chunk_threshold: int,
+    emit_ast: bool,
+    shallow: bool = False,
+) -> dict:
+    """Parse one source object and store its AST.
+
+    Args:
+        object_ref: Object reference of the source file.
+        path: File path.
+        lang_hint: Language hint from the file record.
+        runner: ShardRunner for CAS access.
+        chunk_threshold: AST size above which a chunk manifest is written.
+        emit_ast: Whether to store the AST in the CAS.
+        shallow: Whether Python files get a shallow (summary) AST.
+
+    Returns:
+        Dict with "ast" ({"object", "format"} or None) and "diagnostics".
+        Binary content (an early NUL, or not UTF-8) yields neither.
+    """
+    # Get file content from CAS
+    data = runner.object_store.get_bytes(object_ref)
+
+    # A NUL in the leading bytes means binary; skip without decoding it all
+    if looks_binary(data):
+        return {"ast": None, "diagnostics": []}
+
+    # Try to decode as text (catches binaries without an early NUL)
+    try:
+        content = data.decode("utf-8")
+    except UnicodeDecodeError:
+        # Binary file - skip
+        return {"ast": None, "diagnostics": []}
+
+    # Parse based on language
+    if lang_hint == "python":
+        ast_dict, diagnostics = parse_python(content, path, shallow)
+    elif lang_hint in ("javascript", "typescript"):
+        # data is exactly content in UTF-8, so tree-sitter can take it as is
+        ast_dict, diagnostics = parse_javascript(content, path, data)
+    elif lang_hint in ("markdown", "json", "yaml", "xml", "html", "css"):
+        # Text-based formats
+        ast_dict, diagnostics = parse_text(content, path)
+    else:
+        # Default text tokenization for unknown types
+        ast_dict, diagnostics = parse_text(content, path)
+
+    ast_entry = None
+    if emit_ast and ast_dict is not None:
+        # Encode in threshold-sized chunks; a second chunk means it is too big
+        ast_chunks = _iter_json_chunks(ast_dict, chunk_threshold)
+        first_chunk = next(ast_chunks)
+        second_chunk = next(ast_chunks, None)
+
+        if second_chunk is not None:
+            # Create chunk manifest - kind stays "ast", format becomes "json+chunks"
+            manifest_ref, _ = create_chunk_manifest(
+                chain((first_chunk, second_chunk), ast_chunks),
+                "ast",
+                "json",
+                runner,
+                chunk_threshold,
+            )
+            ast_entry = {"object": manifest_ref, "format": "json+chunks"}
+        else:
+            # Store directly
+            ast_entry = {
+                "object": runner.object_store.put_bytes(first_chunk),
+                "format": "json",
+            }
+
+    return {"ast": ast_entry, "diagnostics": diagnostics}
+
+
+def _parse_worker(job: tuple) -> dict:
+    """Parse one source object in a worker process.
+
+    Args:
+        job: Tuple of (store_root, object_ref, path, lang_hint,
+            chunk_threshold, emit_ast, shallow).
+
+    Returns:
+        Result as from _parse_object, or {"error": message} on failure.
+    """
+    store_root, object_ref, path, lang_hint, chunk_threshold, emit_ast, shallow = job
+    try:
+        runner = ShardRunner(store_root)
+        return _parse_object(
+            object_ref, path, lang_hint, runner, chunk_threshold, emit_ast, shallow
+        )
+    except Exception as e:
+        return {"error": str(e)}
+
+
+def _iter_parse_results(
+    files: Iterable[dict],
+    runner: ShardRunner,
+    cache: DerivedCache,
+    chunk_threshold: int,
+    emit_ast: bool,
+    workers: int,
+    shallow: bool = False,
+) -> Iterator[tuple[dict, dict]]:
+    """Resolve the parse result of each file, from the cache or by parsing.
+
+    Files with the same content and parser are resolved once per window of
+    PARSE_WINDOW_SIZE files; repeats further apart are served by the derived
+    cache. With more than one worker, each window's cache misses are parsed
+    on a process pool; results are still yielded in input order.
+
+    Args:
+        files: File records for the shard.
+        runner: ShardRunner for CAS access.
+        cache: Derived cache for parse results.
+        chunk_threshold: AST size above which a chunk manifest is written.
+        emit_ast: Whether to store ASTs in the CAS.
+        workers: Number of worker processes (1 parses in this process).
+        shallow: Whether Python files get a shallow (summary) AST.
+
+    Yields:
+        Tuples of (file record, result), where result is as from
+        _parse_object or {"error": message} on failure.
+    """
+    if workers <= 1:
+        # (object ref, cache variant) -> result, for nearby duplicates; cleared
+        # after PARSE_WINDOW_SIZE entries so memory stays bounded
+        resolved: dict[tuple[str, str], dict] = {}
+        for file_record in files:
+            path = file_record["path"]
+            object_ref = file_record["object"]
+            lang_hint = file_record.get("lang_hint")
+            variant = _cache_variant(
+                _parser_name(lang_hint, path, shallow), chunk_threshold
+            )
+
+            result = resolved.get((object_ref, variant))
+            if result is None:
+                try:
+                    result = _load_cached_parse(cache, object_ref, variant, runner)
+                    if result is None:
+                        result = _parse_object(
+                            object_ref,
+                            path,
+                            lang_hint,
+                            runner,
+                            chunk_threshold,
+                            emit_ast,
+                            shallow,
+                        )
+                        # Without emit_ast no AST ref exists to cache
+                        if emit_ast:
+                            cache.put(object_ref, result, variant)
+                    if len(resolved) >= PARSE_WINDOW_SIZE:
+                        resolved.clear()
+                    resolved[(object_ref, variant)] = result
+                except Exception as e:
+                    result = {"error": str(e)}
+            yield file_record, result
+        return
+
+    # Work through the shard in windows, holding one window's results at a
+    # time; the pool is started on the first cache miss and reused across
+    # windows
+    iterator = iter(files)
+    pool = None
+    try:
+        while True:
+            records = list(islice(iterator, PARSE_WINDOW_SIZE))
+            if not records:
+                return
+
+            # Look up each distinct file so only cache misses go to the pool
+            resolved = {}
+            keys = []
+            jobs: dict[tuple[str, str], tuple] = {}
+            for file_record in records:
+                path = file_record["path"]
+                object_ref = file_record["object"]
+                lang_hint = file_record.get("lang_hint")
+                parser = _parser_name(lang_hint, path, shallow)
+                key = (object_ref, _cache_variant(parser, chunk_threshold))
+                keys.append(key)
+                if key in resolved or key in jobs:
+                    continue
+
+                try:
+                    result = _load_cached_parse(cache, object_ref, key[1], runner)
+                except Exception as e:
+                    result = {"error": str(e)}
+                if result is None:
+                    jobs[key] = (
+                        runner.store_root,
+                        object_ref,
+                        path,
+                        lang_hint,
+                        chunk_threshold,
+                        emit_ast,
+                        shallow,
+                    )
+                else:
+                    resolved[key] = result
+
+            if jobs:
+                if pool is None:
+                    pool = runner.process_pool(workers)
+                parsed = pool.map(
+                    _parse_worker, jobs.values(), chunksize=PARSE_WORKER_CHUNKSIZE
+                )
+                for job_key, result in zip(jobs, parsed):
+                    if emit_ast and "error" not in result:
+                        cache.put(job_key[0], result, job_key[1])
+                    resolved[job_key] = result
+
+            for file_record, key in zip(records, keys):
+                yield file_record, resolved[key]
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+
 def parse_executor(
     config: dict, files: Iterable[dict], runner: ShardRunner
-) -> list[dict]:
+) -> Iterator[dict]:
     """Execute the parse task.
 
+    Records are yielded as each file is parsed, so the runner streams them
+    to the shard's output index without holding the whole shard in memory.
+
     Args:
         config: Task configuration.
         files: Iterable of file records for this shard (may be iterator).
         runner: ShardRunner for CAS access.
 
-    Returns:
-        List of output records.
+    Yields:
+        Output records.
     """
-    outputs = []
     chunk_threshold = config.get("chunk_threshold", DEFAULT_CHUNK_SIZE)
     emit_ast = config.get("emit_ast", True)
     emit_diagnostics = config.get("emit_diagnostics", True)
-
-    for file_record in files:
+    # Processes parsing this shard; "auto" uses the shard's share of the CPUs
+    workers = runner.resolve_workers(config.get("workers", 1))
+    # "shallow" keeps only top-level Python defs and imports; "full" everything
+    shallow = config.get("ast_depth", "full") == "shallow"
+
+    # Parse results are a pure function of (object, parser, chunk threshold)
+    # for a given parser environment, so the AST ref and diagnostics are
+    # cached per object ref
+    cache = DerivedCache(runner.store_root, "parse", PARSE_CACHE_VERSION)
+
+    for file_record, result in _iter_parse_results(
+        files, runner, cache, chunk_threshold, emit_ast, workers, shallow
+    ):
         path = file_record["path"]
-        object_ref = file_record["object"]
-        lang_hint = file_record.get("lang_hint")
-
-        try:
-            # Get file content from CAS
-            data = runner.object_store.get_bytes(object_ref)
-
-            # Try to decode as text
-            try:
-                content = data.decode("utf-8")
-            except UnicodeDecodeError:
-                # Binary file - skip
-                continue
-
-            # Parse based on language
-            ast_dict = None
-            diagnostics = []
-
-            if lang_hint == "python":
-                ast_dict, diagnostics = parse_python(content, path)
-            elif lang_hint in ("javascript", "typescript"):
-                ast_dict, diagnostics = parse_javascript(content, path)
-            elif lang_hint in ("markdown", "json", "yaml", "xml", "html", "css"):
-                # Text-based formats
-                ast_dict, diagnostics = parse_text(content, path)
-            else:
-                # Default text tokenization for unknown types
-                ast_dict, diagnostics = parse_text(content, path)
-
-            # Emit AST output
-            if emit_ast and ast_dict is not None:
-                ast_bytes = json.dumps(ast_dict, separators=(",", ":")).encode("utf-8")
 
-                if len(ast_bytes) > chunk_threshold:
-                    # Create chunk manifest - kind stays "ast", format becomes "json+chunks"
-                    manifest_ref, _ = create_chunk_manifest(
-                        ast_bytes, "ast", "json", runner, chunk_threshold
-                    )
-                    outputs.append(
-                        {
-                            "path": path,
-                            "kind": "ast",  # Semantic kind stays ast
-                            "object": manifest_ref,
-                            "format": "json+chunks",  # Format indicates chunking
-                        }
-                    )
-                else:
-                    # Store directly
-                    ast_ref = runner.object_store.put_bytes(ast_bytes)
-                    outputs.append(
-                        {
-                            "path": path,
-                            "kind": "ast",
-                            "object": ast_ref,
-                            "format": "json",
-                        }
-                    )
-
-            # Emit diagnostics
-            if emit_diagnostics:
-                for diag in diagnostics:
-                    outputs.append(
-                        {
-                            "path": path,
-                            "kind": "diagnostic",
-                            "severity": diag["severity"],
-                            "code": diag["code"],
-                            "message": diag["message"],
-                            "line": diag.get("line"),
-                            "column": diag.get("column"),
-                        }
-                    )
-
-        except Exception as e:
+        if "error" in result:
             # Emit error diagnostic
             if emit_diagnostics:
-                outputs.append(
-                    {
-                        "path": path,
-                        "kind": "diagnostic",
-                        "severity": "error",
-                        "code": "E9999",
-                        "message": f"Parse error: {str(e)}",
-                        "line": 1,
-                        "column": 1,
-                    }
-                )
-
-    return outputs
+                yield {
+                    "path": path,
+                    "kind": "diagnostic",
+                    "severity": "error",
+                    "code": "E9999",
+                    "message": f"Parse error: {result['error']}",
+                    "line": 1,
+                    "column": 1,
+                }
+            continue
+
+        # Emit AST output
+        if emit_ast and result["ast"] is not None:
+            yield {"path": path, "kind": "ast", **result["ast"]}
+
+        # Emit diagnostics
+        if emit_diagnostics:
+            for diag in result["diagnostics"]:
+                yield {
+                    "path": path,
+                    "kind": "diagnostic",
+                    "severity": diag["severity"],
+                    "code": diag["code"],
+                    "message": diag["message"],
+                    "line": diag.get("line"),
+                    "column": diag.get("column"),
+                }
@@ -13,12 +13,31 @@ Files without AST are skipped (no symbols emitted).
 Phase 8: Full symbol extraction with real names from full-fidelity AST.
 """
 
-import json
-from typing import Iterable, Optional
+from itertools import islice
+from typing import Iterable, Iterator, Optional
 
+from ..astio import loads_ast
+from ..cas import ObjectStore
+from ..derived import DerivedCache
 from ..runner import ShardRunner
 
 
+# Bump when symbol or edge extraction changes (invalidates cached records)
+SYMBOLS_CACHE_VERSION = 2
+
+# ASTs handed to each worker process at a time when extracting in parallel
+SYMBOLS_WORKER_CHUNKSIZE = 16
+
+# Files looked up and dispatched together when extracting in parallel
+SYMBOLS_WINDOW_SIZE = 1024
+
+# Shared default for absent child lists; iterating it allocates nothing
+_EMPTY: tuple = ()
+
+# Implicit first parameters not reported as parameter symbols
+_SKIP_ARGS = frozenset({"self", "cls"})
+
+
 def _extract_name_from_target(target: dict) -> Optional[str]:
     """Extract variable name from an assignment target.
 
@@ -42,231 +61,253 @@ def _extract_name_from_target(target: dict) -> Optional[str]:
     return None
 
 
-def _extract_symbols_from_node(
-    node: dict,
-    path: str,
-    scope: str,
-    symbols: list[dict],
-    edges: list[dict],
+def _py_function(
+    node: dict, path: str, scope: str, symbols: list[dict], edges: list[dict]
 ) -> None:
-    """Recursively extract symbols from an AST node.
-
-    Args:
-        node: AST node dict.
-        path: Source file path.
-        scope: Current scope name (e.g., "module", "ClassName", "function_name").
-        symbols: List to append symbol records to.
-        edges: List to append edge records to.
-    """
-    node_type = node.get("type", "")
+    """Handle FunctionDef/AsyncFunctionDef: the function and its parameters."""
+    name = node.get("name")
+    if not name:
+        return
     lineno = node.get("lineno")
     col = node.get("col_offset", 0)
 
-    # Function definitions
-    if node_type in ("FunctionDef", "AsyncFunctionDef"):
-        name = node.get("name")
-        if name:
+    symbols.append(
+        {
+            "kind": "symbol",
+            "path": path,
+            "name": name,
+            "symbol_type": "function",
+            "line": lineno,
+            "col": col,
+            "scope": scope,
+        }
+    )
+
+    # Extract parameters as symbols
+    args = node.get("args", {})
+    for arg_info in args.get("args", _EMPTY):
+        arg_name = arg_info.get("arg")
+        if arg_name and arg_name not in _SKIP_ARGS:
             symbols.append(
                 {
                     "kind": "symbol",
                     "path": path,
-                    "name": name,
-                    "symbol_type": "function",
+                    "name": arg_name,
+                    "symbol_type": "parameter",
                     "line": lineno,
                     "col": col,
-                    "scope": scope,
+                    "scope": name,
                 }
             )
 
-            # Extract parameters as symbols
-            args = node.get("args", {})
-            for arg_info in args.get("args", []):
-                arg_name = arg_info.get("arg")
-                if arg_name and arg_name != "self" and arg_name != "cls":
-                    symbols.append(
-                        {
-                            "kind": "symbol",
-                            "path": path,
-                            "name": arg_name,
-                            "symbol_type": "parameter",
-                            "line": lineno,
-                            "col": col,
-                            "scope": name,
-                        }
-                    )
-
-            # Recurse into function body with new scope
-            for child in node.get("body", []):
-                _extract_symbols_from_node(child, path, name, symbols, edges)
-
-    # Class definitions
-    elif node_type == "ClassDef":
-        name = node.get("name")
-        if name:
-            symbols.append(
+    # Recurse into function body with new scope
+    for child in node.get("body", _EMPTY):
+        _extract_symbols_from_node(child, path, name, symbols, edges)
+
+
+def _py_class(
+    node: dict, path: str, scope: str, symbols: list[dict], edges: list[dict]
+) -> None:
+    """Handle ClassDef: the class and its base classes."""
+    name = node.get("name")
+    if not name:
+        return
+    lineno = node.get("lineno")
+
+    symbols.append(
+        {
+            "kind": "symbol",
+            "path": path,
+            "name": name,
+            "symbol_type": "class",
+            "line": lineno,
+            "col": node.get("col_offset", 0),
+            "scope": scope,
+        }
+    )
+
+    # Extract base classes as edges
+    for base in node.get("bases", _EMPTY):
+        base_name = None
+        if base.get("type") == "Name":
+            base_name = base.get("id")
+        elif base.get("type") == "Attribute":
+            base_name = base.get("attr")
+
+        if base_name:
+            edges.append(
                 {
-                    "kind": "symbol",
+                    "kind": "edge",
                     "path": path,
-                    "name": name,
-                    "symbol_type": "class",
+                    "edge_type": "inherits",
+                    "target": base_name,
                     "line": lineno,
-                    "col": col,
-                    "scope": scope,
                 }
             )
 
-            # Extract base classes as edges
-            for base in node.get("bases", []):
-                base_name = None
-                if base.get("type") == "Name":
-                    base_name = base.get("id")
-                elif base.get("type") == "Attribute":
-                    base_name = base.get("attr")
-
-                if base_name:
-                    edges.append(
-                        {
-                            "kind": "edge",
-                            "path": path,
-                            "edge_type": "inherits",
-                            "target": base_name,
-                            "line": lineno,
-                        }
-                    )
-
-            # Recurse into class body with class as scope
-            for child in node.get("body", []):
-                _extract_symbols_from_node(child, path, name, symbols, edges)
-
-    # Import statements
-    elif node_type == "Import":
-        for name_info in node.get("names", []):
-            module_name = name_info.get("name")
-            alias = name_info.get("asname")
-            if module_name:
-                edges.append(
-                    {
-                        "kind": "edge",
-                        "path": path,
-                        "edge_type": "imports",
-                        "target": module_name,
-                        "line": lineno,
-                    }
-                )
-                # If aliased, also create a symbol for the alias
-                if alias:
-                    symbols.append(
-                        {
-                            "kind": "symbol",
-                            "path": path,
-                            "name": alias,
-                            "symbol_type": "import_alias",
-                            "line": lineno,
-                            "col": col,
-                            "scope": scope,
-                        }
-                    )
-
-    elif node_type == "ImportFrom":
+    # Recurse into class body with class as scope
+    for child in node.get("body", _EMPTY):
+        _extract_symbols_from_node(child, path, name, symbols, edges)
+
+
+def _py_import(
+    node: dict, path: str, scope: str, symbols: list[dict], edges: list[dict]
+) -> None:
+    """Handle Import and ImportFrom: import edges and alias symbols."""
+    lineno = node.get("lineno")
+    # ImportFrom targets are qualified with the module they come from
+    module = ""
+    if node.get("type") == "ImportFrom":
         module = node.get("module") or ""
-        for name_info in node.get("names", []):
-            import_name = name_info.get("name")
-            alias = name_info.get("asname")
-            if import_name:
-                full_target = f"{module}.{import_name}" if module else import_name
-                edges.append(
-                    {
-                        "kind": "edge",
-                        "path": path,
-                        "edge_type": "imports",
-                        "target": full_target,
-                        "line": lineno,
-                    }
-                )
-                # If aliased, create symbol for alias
-                if alias:
-                    symbols.append(
-                        {
-                            "kind": "symbol",
-                            "path": path,
-                            "name": alias,
-                            "symbol_type": "import_alias",
-                            "line": lineno,
-                            "col": col,
-                            "scope": scope,
-                        }
-                    )
-
-    # Assignments
-    elif node_type == "Assign":
-        for target in node.get("targets", []):
-            var_name = _extract_name_from_target(target)
-            if var_name:
-                symbols.append(
-                    {
-                        "kind": "symbol",
-                        "path": path,
-                        "name": var_name,
-                        "symbol_type": "variable",
-                        "line": lineno,
-                        "col": col,
-                        "scope": scope,
-                    }
-                )
 
-    elif node_type == "AnnAssign":
-        target = node.get("target")
-        if target:
-            var_name = _extract_name_from_target(target)
-            if var_name:
+    for name_info in node.get("names", _EMPTY):
+        import_name = name_info.get("name")
+        alias = name_info.get("asname")
+        if import_name:
+            edges.append(
+                {
+                    "kind": "edge",
+                    "path": path,
+                    "edge_type": "imports",
+                    "target": f"{module}.{import_name}" if module else import_name,
+                    "line": lineno,
+                }
+            )
+            # If aliased, also create a symbol for the alias
+            if alias:
                 symbols.append(
                     {
                         "kind": "symbol",
                         "path": path,
-                        "name": var_name,
-                        "symbol_type": "variable",
+                        "name": alias,
+                        "symbol_type": "import_alias",
                         "line": lineno,
-                        "col": col,
+                        "col": node.get("col_offset", 0),
                         "scope": scope,
                     }
                 )
 
-    # For/While/If/With - recurse into body and orelse
-    elif node_type in ("For", "While", "If", "With", "AsyncFor", "AsyncWith"):
-        for child in node.get("body", []):
-            _extract_symbols_from_node(child, path, scope, symbols, edges)
-        for child in node.get("orelse", []):
-            _extract_symbols_from_node(child, path, scope, symbols, edges)
 
-    # Try/Except
-    elif node_type == "Try":
-        for child in node.get("body", []):
-            _extract_symbols_from_node(child, path, scope, symbols, edges)
-        for handler in node.get("handlers", []):
-            _extract_symbols_from_node(handler, path, scope, symbols, edges)
-        for child in node.get("orelse", []):
-            _extract_symbols_from_node(child, path, scope, symbols, edges)
+def _py_assign(
+    node: dict, path: str, scope: str, symbols: list[dict], edges: list[dict]
+) -> None:
+    """Handle Assign and AnnAssign: simple variable targets."""
+    if node.get("type") == "Assign":
+        targets = node.get("targets", _EMPTY)
+    else:
+        target = node.get("target")
+        targets = [target] if target else []
 
-    # ExceptHandler
-    elif node_type == "ExceptHandler":
-        # Exception variable (e.g., `except ValueError as e:`)
-        exc_name = node.get("name")
-        if exc_name:
+    for target in targets:
+        var_name = _extract_name_from_target(target)
+        if var_name:
             symbols.append(
                 {
                     "kind": "symbol",
                     "path": path,
-                    "name": exc_name,
+                    "name": var_name,
                     "symbol_type": "variable",
-                    "line": lineno,
-                    "col": col,
+                    "line": node.get("lineno"),
+                    "col": node.get("col_offset", 0),
                     "scope": scope,
                 }
             )
-        for child in node.get("body", []):
+
+
+def _py_block(
+    node: dict, path: str, scope: str, symbols: list[dict], edges: list[dict]
+) -> None:
+    """Handle For/While/If/With/Try: recurse into nested statements."""
+    for key in ("body", "handlers", "orelse"):
+        for child in node.get(key, _EMPTY):
             _extract_symbols_from_node(child, path, scope, symbols, edges)
 
 
+def _py_except_handler(
+    node: dict, path: str, scope: str, symbols: list[dict], edges: list[dict]
+) -> None:
+    """Handle ExceptHandler: the exception variable and the handler body."""
+    # Exception variable (e.g., `except ValueError as e:`)
+    exc_name = node.get("name")
+    if exc_name:
+        symbols.append(
+            {
+                "kind": "symbol",
+                "path": path,
+                "name": exc_name,
+                "symbol_type": "variable",
+                "line": node.get("lineno"),
+                "col": node.get("col_offset", 0),
+                "scope": scope,
+            }
+        )
+    for child in node.get("body", _EMPTY):
+        _extract_symbols_from_node(child, path, scope, symbols, edges)
+
+
+# Python AST node type -> handler; nodes of other types yield nothing
+_PY_HANDLERS = {
+    "FunctionDef": _py_function,
+    "AsyncFunctionDef": _py_function,
+    "ClassDef": _py_class,
+    "Import": _py_import,
+    "ImportFrom": _py_import,
+    "Assign": _py_assign,
+    "AnnAssign": _py_assign,
+    "For": _py_block,
+    "While": _py_block,
+    "If": _py_block,
+    "With": _py_block,
+    "AsyncFor": _py_block,
+    "AsyncWith": _py_block,
+    "Try": _py_block,
+    "ExceptHandler": _py_except_handler,
+}
+
+
+def _extract_symbols_from_node(
+    node: dict,
+    path: str,
+    scope: str,
+    symbols: list[dict],
+    edges: list[dict],
+) -> None:
+    """Recursively extract symbols from an AST node.
+
+    Args:
+        node: AST node dict.
+        path: Source file path.
+        scope: Current scope name (e.g., "module", "ClassName", "function_name").
+        symbols: List to append symbol records to.
+        edges: List to append edge records to.
+    """
+    handler = _PY_HANDLERS.get(node.get("type", ""))
+    if handler is not None:
+        handler(node, path, scope, symbols, edges)
+
+
+def _unique_edges(edges: list[dict]) -> list[dict]:
+    """Drop repeated edges of a file, keeping the first (earliest) of each.
+
+    A file that imports or inherits the same target more than once (e.g. in
+    both branches of a try/except ImportError) gets a single edge for it.
+
+    Args:
+        edges: Edge records of one file, in source order.
+
+    Returns:
+        Edge records with distinct (edge_type, target).
+    """
+    seen: set[tuple[str, str]] = set()
+    unique = []
+    for edge in edges:
+        key = (edge["edge_type"], edge["target"])
+        if key not in seen:
+            seen.add(key)
+            unique.append(edge)
+    return unique
+
+
 def extract_python_symbols(ast_data: dict, path: str) -> tuple[list[dict], list[dict]]:
     """Extract symbols and edges from Python AST data.
 
@@ -283,13 +324,180 @@ def extract_python_symbols(ast_data: dict, path: str) -> tuple[list[dict], list[
     edges: list[dict] = []
 
     # Get body nodes from AST
-    body = ast_data.get("body", [])
+    body = ast_data.get("body", _EMPTY)
 
     # Process each top-level node
     for node in body:
         _extract_symbols_from_node(node, path, "module", symbols, edges)
 
-    return symbols, edges
+    return symbols, _unique_edges(edges)
+
+
+def _js_position(node: dict) -> tuple[int, int]:
+    """Get the 1-based line and 0-based column of a tree-sitter node."""
+    start_point = node.get("start_point", {})
+    # tree-sitter rows are 0-indexed
+    return start_point.get("row", 0) + 1, start_point.get("column", 0)
+
+
+def _js_function(
+    node: dict, path: str, scope: str, symbols: list[dict], edges: list[dict]
+) -> bool:
+    """Handle function_declaration/method_definition: a function scope."""
+    name = node.get("name")
+    if not name:
+        return False
+    lineno, col = _js_position(node)
+
+    symbols.append(
+        {
+            "kind": "symbol",
+            "path": path,
+            "name": name,
+            "symbol_type": "function",
+            "line": lineno,
+            "col": col,
+            "scope": scope,
+        }
+    )
+    # Recurse into function body with new scope
+    for child in node.get("children", _EMPTY):
+        _extract_js_symbols_from_node(child, path, name, symbols, edges)
+    return True
+
+
+def _js_class(
+    node: dict, path: str, scope: str, symbols: list[dict], edges: list[dict]
+) -> bool:
+    """Handle class_declaration: the class, its base class and its members."""
+    name = node.get("name")
+    # For TypeScript, class name may be in type_identifier child
+    if not name:
+        for child in node.get("children", _EMPTY):
+            if child.get("type") in ("identifier", "type_identifier"):
+                name = child.get("name")
+                break
+    if not name:
+        return False
+    lineno, col = _js_position(node)
+
+    symbols.append(
+        {
+            "kind": "symbol",
+            "path": path,
+            "name": name,
+            "symbol_type": "class",
+            "line": lineno,
+            "col": col,
+            "scope": scope,
+        }
+    )
+    # Look for extends clause
+    for child in node.get("children", _EMPTY):
+        if child.get("type") == "class_heritage":
+            # Find the extended class name
+            for heritage_child in child.get("children", _EMPTY):
+                if heritage_child.get("type") in ("identifier", "type_identifier"):
+                    base_name = heritage_child.get("name")
+                    if base_name:
+                        edges.append(
+                            {
+                                "kind": "edge",
+                                "path": path,
+                                "edge_type": "inherits",
+                                "target": base_name,
+                                "line": lineno,
+                            }
+                        )
+    # Recurse with class as scope
+    for child in node.get("children", _EMPTY):
+        _extract_js_symbols_from_node(child, path, name, symbols, edges)
+    return True
+
+
+def _js_variable(
+    node: dict, path: str, scope: str, symbols: list[dict], edges: list[dict]
+) -> bool:
+    """Handle variable_declarator (const, let, var)."""
+    name = node.get("name")
+    if name:
+        lineno, col = _js_position(node)
+        symbols.append(
+            {
+                "kind": "symbol",
+                "path": path,
+                "name": name,
+                "symbol_type": "variable",
+                "line": lineno,
+                "col": col,
+                "scope": scope,
+            }
+        )
+    return False
+
+
+def _js_import(
+    node: dict, path: str, scope: str, symbols: list[dict], edges: list[dict]
+) -> bool:
+    """Handle import_statement: the import edge and imported identifiers."""
+    lineno, col = _js_position(node)
+    source = node.get("source")
+    if source:
+        edges.append(
+            {
+                "kind": "edge",
+                "path": path,
+                "edge_type": "imports",
+                "target": source,
+                "line": lineno,
+            }
+        )
+    # Extract imported identifiers
+    for child in node.get("children", _EMPTY):
+        if child.get("type") in ("import_clause", "named_imports"):
+            _extract_import_identifiers(child, path, scope, symbols, lineno, col)
+    return False
+
+
+def _js_export(
+    node: dict, path: str, scope: str, symbols: list[dict], edges: list[dict]
+) -> bool:
+    """Handle export_statement: exported declarations and named exports."""
+    lineno, _ = _js_position(node)
+    # Look for default export or named exports
+    for child in node.get("children", _EMPTY):
+        child_type = child.get("type")
+        if child_type in ("function_declaration", "class_declaration"):
+            _extract_js_symbols_from_node(child, path, scope, symbols, edges)
+        elif child_type == "export_clause":
+            # Named exports
+            for export_child in child.get("children", _EMPTY):
+                if export_child.get("type") == "export_specifier":
+                    export_name = export_child.get("name")
+                    if export_name:
+                        edges.append(
+                            {
+                                "kind": "edge",
+                                "path": path,
+                                "edge_type": "exports",
+                                "target": export_name,
+                                "line": lineno,
+                            }
+                        )
+    return True
+
+
+# Tree-sitter node type -> handler. A handler returns True when it has dealt
+# with the node's children itself; otherwise they are visited as usual.
+# Arrow functions are covered by the variable_declarator they are assigned to.
+_JS_HANDLERS = {
+    "function_declaration": _js_function,
+    "method_definition": _js_function,
+    "class_declaration": _js_class,
+    "variable_declarator": _js_variable,
+    "import_statement": _js_import,
+    "export_statement": _js_export,
+}
 
 
 def _extract_js_symbols_from_node(
@@ -308,161 +516,12 @@ def _extract_js_symbols_from_node(
         symbols: List to append symbol records to.
         edges: List to append edge records to.
     """
-    node_type = node.get("type", "")
-    start_point = node.get("start_point", {})
-    lineno = start_point.get("row", 0) + 1  # tree-sitter is 0-indexed
-    col = start_point.get("column", 0)
-
-    # Function declarations
-    if node_type == "function_declaration":
-        name = node.get("name")
-        if name:
-            symbols.append(
-                {
-                    "kind": "symbol",
-                    "path": path,
-                    "name": name,
-                    "symbol_type": "function",
-                    "line": lineno,
-                    "col": col,
-                    "scope": scope,
-                }
-            )
-            # Recurse into function body with new scope
-            for child in node.get("children", []):
-                _extract_js_symbols_from_node(child, path, name, symbols, edges)
-            return  # Don't recurse again
-
-    # Arrow functions (when assigned to const/let/var)
-    # These are handled via variable_declarator
-
-    # Method definitions (inside classes)
-    if node_type == "method_definition":
-        name = node.get("name")
-        if name:
-            symbols.append(
-                {
-                    "kind": "symbol",
-                    "path": path,
-                    "name": name,
-                    "symbol_type": "function",
-                    "line": lineno,
-                    "col": col,
-                    "scope": scope,
-                }
-            )
-            for child in node.get("children", []):
-                _extract_js_symbols_from_node(child, path, name, symbols, edges)
-            return
-
-    # Class declarations
-    if node_type == "class_declaration":
-        name = node.get("name")
-        # For TypeScript, class name may be in type_identifier child
-        if not name:
-            for child in node.get("children", []):
-                if child.get("type") in ("identifier", "type_identifier"):
-                    name = child.get("name")
-                    break
-        if name:
-            symbols.append(
-                {
-                    "kind": "symbol",
-                    "path": path,
-                    "name": name,
-                    "symbol_type": "class",
-                    "line": lineno,
-                    "col": col,
-                    "scope": scope,
-                }
-            )
-            # Look for extends clause
-            for child in node.get("children", []):
-                if child.get("type") == "class_heritage":
-                    # Find the extended class name
-                    for heritage_child in child.get("children", []):
-                        if heritage_child.get("type") in (
-                            "identifier",
-                            "type_identifier",
-                        ):
-                            base_name = heritage_child.get("name")
-                            if base_name:
-                                edges.append(
-                                    {
-                                        "kind": "edge",
-                                        "path": path,
-                                        "edge_type": "inherits",
-                                        "target": base_name,
-                                        "line": lineno,
-                                    }
-                                )
-            # Recurse with class as scope
-            for child in node.get("children", []):
-                _extract_js_symbols_from_node(child, path, name, symbols, edges)
-            return
-
-    # Variable declarations (const, let, var)
-    if node_type == "variable_declarator":
-        name = node.get("name")
-        if name:
-            symbols.append(
-                {
-                    "kind": "symbol",
-                    "path": path,
-                    "name": name,
-                    "symbol_type": "variable",
-                    "line": lineno,
-                    "col": col,
-                    "scope": scope,
-                }
-            )
-
-    # Import statements
-    if node_type == "import_statement":
-        source = node.get("source")
-        if source:
-            edges.append(
-                {
-                    "kind": "edge",
-                    "path": path,
-                    "edge_type": "imports",
-                    "target": source,
-                    "line": lineno,
-                }
-            )
-        # Extract imported identifiers
-        for child in node.get("children", []):
-            if child.get("type") == "import_clause":
-                _extract_import_identifiers(child, path, scope, symbols, lineno, col)
-            elif child.get("type") == "named_imports":
-                _extract_import_identifiers(child, path, scope, symbols, lineno, col)
-
-    # Export statements
-    if node_type == "export_statement":
-        # Look for default export or named exports
-        for child in node.get("children", []):
-            child_type = child.get("type")
-            if child_type in ("function_declaration", "class_declaration"):
-                _extract_js_symbols_from_node(child, path, scope, symbols, edges)
-            elif child_type == "export_clause":
-                # Named exports
-                for export_child in child.get("children", []):
-                    if export_child.get("type") == "export_specifier":
-                        export_name = export_child.get("name")
-                        if export_name:
-                            edges.append(
-                                {
-                                    "kind": "edge",
-                                    "path": path,
-                                    "edge_type": "exports",
-                                    "target": export_name,
-                                    "line": lineno,
-                                }
-                            )
-        return  # Handled above
+    handler = _JS_HANDLERS.get(node.get("type", ""))
+    if handler is not None and handler(node, path, scope, symbols, edges):
+        return
 
     # Recurse into children by default
-    for child in node.get("children", []):
+    for child in node.get("children", _EMPTY):
         _extract_js_symbols_from_node(child, path, scope, symbols, edges)
 
 
@@ -484,7 +543,7 @@ def _extract_import_identifiers(
         lineno: Line number.
         col: Column offset.
     """
-    for child in node.get("children", []):
+    for child in node.get("children", _EMPTY):
         child_type = child.get("type")
         if child_type == "identifier":
             name = child.get("name")
@@ -535,10 +594,10 @@ def extract_js_symbols_treesitter(
     edges: list[dict] = []
 
     # Process top-level children
-    for child in ast_data.get("children", []):
+    for child in ast_data.get("children", _EMPTY):
         _extract_js_symbols_from_node(child, path, "module", symbols, edges)
 
-    return symbols, edges
+    return symbols, _unique_edges(edges)
 
 
 def extract_js_symbols_fallback(
@@ -613,23 +672,199 @@ def extract_text_symbols(ast_data: dict, path: str) -> tuple[list[dict], list[di
     return [], []
 
 
+def _with_path(entries: list, path: str) -> list[dict]:
+    """Attach a file path to path-free symbol and edge entries.
+
+    Args:
+        entries: Entries as stored in the cache.
+        path: Path to report the records under.
+
+    Returns:
+        Symbol and edge records.
+    """
+    return [
+        {"kind": entry["kind"], "path": path, **entry}
+        for entry in entries
+        if isinstance(entry, dict) and "kind" in entry
+    ]
+
+
+def _without_path(records: list[dict]) -> list[dict]:
+    """Strip the file path from symbol and edge records.
+
+    Entries are cached without the path, since the same content can appear
+    under several paths.
+
+    Args:
+        records: Symbol and edge records.
+
+    Returns:
+        Path-free entries.
+    """
+    return [
+        {key: value for key, value in record.items() if key != "path"}
+        for record in records
+    ]
+
+
+def _extract_records(ast_bytes: bytes, path: str) -> list[dict]:
+    """Extract symbol and edge records from a serialized AST.
+
+    Args:
+        ast_bytes: Serialized AST (UTF-8 JSON).
+        path: Source file path.
+
+    Returns:
+        Symbol records followed by edge records.
+    """
+    ast_data = loads_ast(ast_bytes)
+
+    # Extract based on AST type
+    ast_type = ast_data.get("type", "")
+    ast_mode = ast_data.get("ast_mode", "")
+    parser = ast_data.get("parser", "")
+
+    symbols = []
+    edges = []
+
+    if ast_type == "Module" and ast_mode in ("full", "summary"):
+        # Python AST (full or legacy summary mode)
+        symbols, edges = extract_python_symbols(ast_data, path)
+    elif ast_type == "program" and parser == "tree-sitter":
+        # Tree-sitter JavaScript/TypeScript AST
+        symbols, edges = extract_js_symbols(ast_data, path)
+    elif ast_type == "TokenInfo":
+        # JavaScript/TypeScript fallback tokens
+        symbols, edges = extract_js_symbols(ast_data, path)
+    elif ast_type == "TextInfo":
+        # Text file stats
+        symbols, edges = extract_text_symbols(ast_data, path)
+
+    return symbols + edges
+
+
+def _extract_error(path: str, message: str) -> dict:
+    """Build the diagnostic for a file whose symbols could not be extracted.
+
+    Args:
+        path: Source file path.
+        message: Error message.
+
+    Returns:
+        Diagnostic output record.
+    """
+    return {
+        "kind": "diagnostic",
+        "path": path,
+        "severity": "warning",
+        "code": "SYMBOLS_EXTRACT_ERROR",
+        "message": f"Failed to extract symbols: {message}",
+        "line": 1,
+    }
+
+
+def _symbols_worker(job: tuple) -> dict:
+    """Extract the records of one AST object in a worker process.
+
+    Args:
+        job: Tuple of (store_root, object_ref, path).
+
+    Returns:
+        {"records": [...]} as from _extract_records, or {"error": message}.
+    """
+    store_root, object_ref, path = job
+    try:
+        ast_bytes = ObjectStore(store_root).get_bytes(object_ref)
+        return {"records": _extract_records(ast_bytes, path)}
+    except Exception as e:
+        return {"error": str(e)}
+
+
+def _extract_on_pool(
+    ast_files: Iterable[tuple[str, str]],
+    runner: ShardRunner,
+    cache: DerivedCache,
+    workers: int,
+) -> Iterator[dict]:
+    """Extract records for a shard's ASTs, sending cache misses to a pool.
+
+    Files are handled SYMBOLS_WINDOW_SIZE at a time. Each distinct AST object
+    in a window is extracted once; records come back in the same order as
+    extracting the files one by one.
+
+    Args:
+        ast_files: (path, AST object ref) of each file, in output order.
+        runner: ShardRunner for the store root.
+        cache: Derived cache for symbol records.
+        workers: Number of worker processes.
+
+    Yields:
+        Symbol, edge and diagnostic output records.
+    """
+    # Only one window's records are held at a time (repeats in later windows
+    # are served by the derived cache); the pool is started on the first
+    # cache miss and reused across windows
+    iterator = iter(ast_files)
+    pool = None
+    try:
+        while True:
+            window = list(islice(iterator, SYMBOLS_WINDOW_SIZE))
+            if not window:
+                return
+
+            # AST object ref -> path-free entries, or the extraction error
+            resolved: dict[str, list] = {}
+            errors: dict[str, str] = {}
+            jobs: dict[str, tuple] = {}
+            for path, object_ref in window:
+                if object_ref in resolved or object_ref in jobs:
+                    continue
+                cached = cache.get(object_ref)
+                if isinstance(cached, list):
+                    resolved[object_ref] = cached
+                else:
+                    jobs[object_ref] = (runner.store_root, object_ref, path)
+
+            if jobs:
+                if pool is None:
+                    pool = runner.process_pool(workers)
+                results = pool.map(
+                    _symbols_worker, jobs.values(), chunksize=SYMBOLS_WORKER_CHUNKSIZE
+                )
+                for object_ref, result in zip(jobs, results):
+                    if "error" in result:
+                        errors[object_ref] = result["error"]
+                    else:
+                        resolved[object_ref] = _without_path(result["records"])
+                        cache.put(object_ref, resolved[object_ref])
+
+            for path, object_ref in window:
+                if object_ref in errors:
+                    yield _extract_error(path, errors[object_ref])
+                else:
+                    yield from _with_path(resolved[object_ref], path)
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+
 def symbols_executor(
     config: dict, files: Iterable[dict], runner: ShardRunner
-) -> list[dict]:
+) -> Iterator[dict]:
     """Execute the symbols task.
 
     Consumes AST outputs from 01_parse and produces symbol tables and edges.
+    Records are yielded file by file, so the runner streams them to the
+    shard's output index without holding the whole shard in memory.
 
     Args:
         config: Task configuration.
         files: Iterable of file records (used to get batch/task context).
         runner: ShardRunner for CAS and prior output access.
 
-    Returns:
-        List of symbol and edge output records.
+    Yields:
+        Symbol and edge output records.
     """
-    outputs = []
-
     # Get context from config (set by runner during execution)
     batch_id = config.get("_batch_id")
     shard_id = config.get("_shard_id")
@@ -638,66 +873,48 @@ def symbols_executor(
         # Fallback: consume files to establish context
         file_list = list(files)
         if not file_list:
-            return []
+            return
         # Can't get prior outputs without batch context
         # Return empty - this shouldn't happen in normal execution
-        return []
+        return
 
-    # Iterate over parse AST outputs for this shard
-    for ast_output in runner.iter_prior_outputs(
-        batch_id, "01_parse", shard_id, kind="ast"
-    ):
-        path = ast_output.get("path")
-        object_ref = ast_output.get("object")
-        fmt = ast_output.get("format", "json")
+    # Processes extracting this shard; "auto" uses the shard's share of the CPUs
+    workers = runner.resolve_workers(config.get("workers", 1))
 
-        if not path or not object_ref:
-            continue
+    # Records are a pure function of the AST object (plus the path they are
+    # reported under), so they are cached per AST object ref
+    cache = DerivedCache(runner.store_root, "symbols", SYMBOLS_CACHE_VERSION)
 
+    # (path, AST object ref) of each parse AST output for this shard
+    ast_files = (
+        (ast_output["path"], ast_output["object"])
+        for ast_output in runner.iter_prior_outputs(
+            batch_id, "01_parse", shard_id, kind="ast"
+        )
         # Skip chunked ASTs for simplicity (Phase 2)
-        if fmt == "json+chunks":
+        if ast_output.get("path")
+        and ast_output.get("object")
+        and ast_output.get("format", "json") != "json+chunks"
+    )
+
+    if workers > 1:
+        yield from _extract_on_pool(ast_files, runner, cache, workers)
+        return
+
+    for path, object_ref in ast_files:
+        cached = cache.get(object_ref)
+        if isinstance(cached, list):
+            yield from _with_path(cached, path)
             continue
 
         try:
             # Load AST from CAS
             ast_bytes = runner.object_store.get_bytes(object_ref)
-            ast_data = json.loads(ast_bytes.decode("utf-8"))
-
-            # Extract based on AST type
-            ast_type = ast_data.get("type", "")
-            ast_mode = ast_data.get("ast_mode", "")
-            parser = ast_data.get("parser", "")
-
-            symbols = []
-            edges = []
-
-            if ast_type == "Module" and ast_mode in ("full", "summary"):
-                # Python AST (full or legacy summary mode)
-                symbols, edges = extract_python_symbols(ast_data, path)
-            elif ast_type == "program" and parser == "tree-sitter":
-                # Tree-sitter JavaScript/TypeScript AST
-                symbols, edges = extract_js_symbols(ast_data, path)
-            elif ast_type == "TokenInfo":
-                # JavaScript/TypeScript fallback tokens
-                symbols, edges = extract_js_symbols(ast_data, path)
-            elif ast_type == "TextInfo":
-                # Text file stats
-                symbols, edges = extract_text_symbols(ast_data, path)
-
-            outputs.extend(symbols)
-            outputs.extend(edges)
-
+            records = _extract_records(ast_bytes, path)
         except Exception as e:
             # Emit diagnostic for failures
-            outputs.append(
-                {
-                    "kind": "diagnostic",
-                    "path": path,
-                    "severity": "warning",
-                    "code": "SYMBOLS_EXTRACT_ERROR",
-                    "message": f"Failed to extract symbols: {e}",
-                    "line": 1,
-                }
-            )
+            yield _extract_error(path, str(e))
+            continue
 
-    return outputs
+        cache.put(object_ref, _without_path(records))
+        yield from records
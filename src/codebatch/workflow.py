@@ -349,7 +349,10 @@ class WorkflowRunner:
 
         def run_one_shard(shard_id: str) -> tuple[str, dict]:
             # Each thread gets its own ShardRunner for isolation
-            runner = ShardRunner(self.store_root)
+            runner = ShardRunner(
+                self.store_root,
+                concurrent_shards=min(max_workers, len(shard_ids)),
+            )
             if on_shard_start:
                 on_shard_start(batch_id, task_id, shard_id)
             try:
@@ -1,9 +1,39 @@
-"""Pytest configuration - ensure src is in path."""
+"""Pytest configuration - ensure src is in path, plus shared fixtures."""
 
 import sys
 from pathlib import Path
 
+import pytest
+
 # Add src directory to path for imports
 src_path = Path(__file__).parent.parent / "src"
 if str(src_path) not in sys.path:
     sys.path.insert(0, str(src_path))
+
+
+@pytest.fixture
+def parsed_python_shard(clean_store: Path, corpus_dir: Path):
+    """Parse the corpus shard holding a Python file.
+
+    The batch uses the full pipeline, so any task can run on the shard.
+
+    Returns:
+        Tuple of (runner, batch_id, shard_id).
+    """
+    from codebatch.batch import BatchManager
+    from codebatch.common import object_shard_prefix
+    from codebatch.runner import ShardRunner
+    from codebatch.snapshot import SnapshotBuilder
+    from codebatch.tasks.parse import parse_executor
+
+    snapshot_builder = SnapshotBuilder(clean_store)
+    snapshot_id = snapshot_builder.build(corpus_dir)
+    batch_id = BatchManager(clean_store).init_batch(snapshot_id, "full")
+    runner = ShardRunner(clean_store)
+
+    records = snapshot_builder.load_file_index(snapshot_id)
+    shard_id = object_shard_prefix(
+        next(r for r in records if r.get("lang_hint") == "python")["object"]
+    )
+    runner.run_shard(batch_id, "01_parse", shard_id, parse_executor)
+    return runner, batch_id, shard_id
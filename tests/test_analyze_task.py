@@ -14,7 +14,7 @@ from codebatch.common import object_shard_prefix
 from codebatch.query import QueryEngine
 from codebatch.runner import ShardRunner
 from codebatch.snapshot import SnapshotBuilder
-from codebatch.tasks.analyze import analyze_executor, count_lines
+from codebatch.tasks.analyze import analyze_executor, count_lines, count_lines_bytes
 from codebatch.tasks.parse import parse_executor
 
 
@@ -51,6 +51,21 @@ class TestCountLines:
         assert count_lines("a\n   \nb\n\t\nc") == 3
 
 
+class TestCountLinesBytes:
+    """Unit tests for count_lines_bytes helper."""
+
+    def test_matches_count_lines_for_ascii(self):
+        for text in ("", "hello", "a\n\nb\n", "a\n   \nb\n\t\r\nc", "x\n\x1c\n"):
+            assert count_lines_bytes(text.encode("ascii")) == count_lines(text)
+
+    def test_non_ascii_text(self):
+        text = "caf\u00e9\n\u3000\nend"
+        assert count_lines_bytes(text.encode("utf-8")) == count_lines(text)
+
+    def test_invalid_utf8_is_binary(self):
+        assert count_lines_bytes(b"\xff\xfe\x00binary") is None
+
+
 class TestAnalyzeExecutor:
     """Tests for the analyze_executor function."""
 
@@ -195,6 +210,38 @@ class TestAnalyzeExecutor:
 
         assert normalize(outputs_1) == normalize(outputs_2)
 
+    def test_complexity_cached_by_ast_ref(self, parsed_python_shard):
+        """Complexity values are reused from the derived cache on re-runs."""
+        from codebatch.derived import DerivedCache
+        from codebatch.tasks.analyze import COMPLEXITY_METRICS, COMPLEXITY_VERSION
+
+        runner, batch_id, shard_id = parsed_python_shard
+        runner.run_shard(batch_id, "02_analyze", shard_id, analyze_executor)
+
+        ast_output = next(
+            o
+            for o in runner.get_shard_outputs(batch_id, "01_parse", shard_id)
+            if o["kind"] == "ast" and o["path"].endswith(".py")
+        )
+        cache = DerivedCache(runner.store_root, "complexity", COMPLEXITY_VERSION)
+        assert cache.get(ast_output["object"]) is not None
+
+        # Values no real AST yields, so a rerun can only report them if it
+        # reads the cache instead of recomputing
+        cache.put(ast_output["object"], {m: 99 for m in COMPLEXITY_METRICS})
+
+        snapshot_id = runner.batch_manager.load_batch(batch_id)["snapshot_id"]
+        files = runner._get_shard_files(snapshot_id, shard_id)
+        config = {"_batch_id": batch_id, "_shard_id": shard_id}
+        outputs = analyze_executor(config, files, runner)
+
+        complexity = [
+            o
+            for o in outputs
+            if o["path"] == ast_output["path"] and o["metric"] == "complexity"
+        ]
+        assert [o["value"] for o in complexity] == [99]
+
 
 class TestAnalyzeIntegration:
     """Integration tests for analyze in the full pipeline."""
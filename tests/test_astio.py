@@ -0,0 +1,43 @@
+"""Tests for loading serialized ASTs."""
+
+import json
+import sys
+
+from codebatch import astio
+from codebatch.astio import loads_ast
+
+
+AST = {
+    "type": "Module",
+    "body": [
+        {
+            "type": "Assign",
+            "targets": [{"type": "Name", "id": "x"}],
+            "value": {"type": "Constant", "value": 1},
+        }
+    ],
+}
+
+
+class TestLoadsAst:
+    """Tests for loads_ast."""
+
+    def test_loads_json_bytes(self):
+        """Serialized ASTs load back to the same dict."""
+        assert loads_ast(json.dumps(AST).encode("utf-8")) == AST
+
+    def test_accepts_non_finite_constants(self):
+        """AST bytes with NaN/Infinity constants still load (stdlib fallback)."""
+        ast_data = loads_ast(b'{"type":"Constant","value":Infinity}')
+
+        assert ast_data["value"] == float("inf")
+
+    def test_intern_types_without_orjson(self, monkeypatch):
+        """The stdlib path can intern node types."""
+        monkeypatch.setattr(astio, "_ORJSON_AVAILABLE", False)
+        data = json.dumps(AST).encode("utf-8")
+
+        interned = loads_ast(data, intern_types=True)
+        assert interned == AST
+        assert interned["body"][0]["targets"][0]["type"] is sys.intern("Name")
+        assert loads_ast(data) == AST
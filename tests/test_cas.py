@@ -114,3 +114,45 @@ class TestObjectStore:
         """Test get_path returns None for missing objects."""
         fake_ref = "sha256:" + "c" * 64
         assert store.get_path(fake_ref) is None
+
+    def test_get_bytes_many_roundtrip(self, store: ObjectStore):
+        """Test get_bytes_many returns every stored object."""
+        blobs = [f"blob {i}".encode() for i in range(20)]
+        refs = [store.put_bytes(b) for b in blobs]
+
+        result = store.get_bytes_many(refs + refs[:3])
+        assert len(result) == 20
+        for ref, data in zip(refs, blobs):
+            assert result[ref] == data
+
+    def test_get_bytes_many_omits_missing(self, store: ObjectStore):
+        """Test get_bytes_many skips missing objects instead of raising."""
+        ref = store.put_bytes(b"present")
+        missing = "sha256:" + "d" * 64
+
+        result = store.get_bytes_many([ref, missing])
+        assert result == {ref: b"present"}
+
+    def test_put_bytes_many_preserves_order(self, store: ObjectStore):
+        """Test put_bytes_many returns refs in input order, duplicates included."""
+        blobs = [f"chunk {i}".encode() for i in range(10)] + [b"chunk 0"] * 4
+
+        refs = store.put_bytes_many(blobs)
+        assert refs == [store.put_bytes(b) for b in blobs]
+        for ref, data in zip(refs, blobs):
+            assert store.get_bytes(ref) == data
+
+    def test_put_bytes_many_consumes_iterator_lazily(self, store: ObjectStore):
+        """Test put_bytes_many keeps at most max_workers writes pending."""
+        produced = []
+
+        def blobs():
+            for i in range(10):
+                # Everything but the newest max_workers blobs must be stored
+                for data in produced[:-3]:
+                    assert store.has("sha256:" + hashlib.sha256(data).hexdigest())
+                produced.append(f"lazy {i}".encode())
+                yield produced[-1]
+
+        refs = store.put_bytes_many(blobs(), max_workers=3)
+        assert refs == [store.put_bytes(b) for b in produced]
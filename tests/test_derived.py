@@ -0,0 +1,102 @@
+"""Tests for the derived-data cache."""
+
+from pathlib import Path
+
+import pytest
+
+from codebatch.common import VERSION
+from codebatch.derived import DerivedCache
+
+
+REF = "sha256:" + "ab" * 32
+
+
+@pytest.fixture
+def cache(tmp_path: Path) -> DerivedCache:
+    """Create a derived cache in a temporary store."""
+    return DerivedCache(tmp_path, "test", version=1)
+
+
+class TestDerivedCache:
+    """Tests for DerivedCache."""
+
+    def test_miss_returns_none(self, cache: DerivedCache):
+        """A key that was never stored is a miss."""
+        assert cache.get(REF) is None
+
+    def test_put_get_roundtrip(self, cache: DerivedCache):
+        """Stored values round-trip through get()."""
+        cache.put(REF, {"a": 1, "b": [1, 2]})
+        assert cache.get(REF) == {"a": 1, "b": [1, 2]}
+
+    def test_variants_are_independent(self, cache: DerivedCache):
+        """Each variant of an object is stored separately."""
+        cache.put(REF, 1, variant="x")
+        cache.put(REF, 2, variant="y")
+        assert cache.get(REF, variant="x") == 1
+        assert cache.get(REF, variant="y") == 2
+        assert cache.get(REF) is None
+
+    def test_layout_under_indexes(self, tmp_path: Path, cache: DerivedCache):
+        """Entries live under indexes/derived/<namespace>/<versions>."""
+        cache.put(REF, 1)
+        version_dir = tmp_path / "indexes" / "derived" / "test" / f"v1-{VERSION}"
+        assert (version_dir / "ab" / ("ab" * 32 + ".json")).exists()
+
+    def test_version_invalidates(self, tmp_path: Path, cache: DerivedCache):
+        """Bumping the namespace version hides older entries."""
+        cache.put(REF, 1)
+        assert DerivedCache(tmp_path, "test", version=2).get(REF) is None
+
+    def test_codebatch_version_invalidates(
+        self, tmp_path: Path, cache: DerivedCache, monkeypatch
+    ):
+        """Entries written by another CodeBatch version are not reused."""
+        import codebatch.derived as derived_module
+
+        cache.put(REF, 1)
+        monkeypatch.setattr(derived_module, "VERSION", "99.0.0")
+        assert DerivedCache(tmp_path, "test", version=1).get(REF) is None
+
+    def test_unserializable_value_ignored(self, cache: DerivedCache):
+        """Values that cannot be encoded are not stored and do not raise."""
+        cache.put(REF, {"a": object()})
+        assert cache.get(REF) is None
+
+    def test_corrupt_entry_is_miss(self, cache: DerivedCache):
+        """An unreadable entry is treated as a miss."""
+        cache.put(REF, 1)
+        cache._entry_path(REF).write_bytes(b"{not json")
+        assert cache.get(REF) is None
+
+    def test_invalid_ref_ignored(self, cache: DerivedCache):
+        """Invalid object refs are neither stored nor found."""
+        cache.put("not-a-ref", 1)
+        assert cache.get("not-a-ref") is None
+
+    def test_concurrent_puts_same_entry(self, cache: DerivedCache, monkeypatch):
+        """Threads writing one entry at once each use their own temp file."""
+        import threading
+
+        barrier = threading.Barrier(2, timeout=5)
+        temp_paths = []
+        write_bytes = Path.write_bytes
+
+        def synchronized_write(path, data):
+            temp_paths.append(path)
+            # Both writers are mid-write before either publishes the entry
+            barrier.wait()
+            return write_bytes(path, data)
+
+        monkeypatch.setattr(Path, "write_bytes", synchronized_write)
+        threads = [
+            threading.Thread(target=cache.put, args=(REF, {"n": n})) for n in range(2)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(set(temp_paths)) == 2
+        assert cache.get(REF) in ({"n": 0}, {"n": 1})
+        assert list(cache._entry_path(REF).parent.glob("*.tmp.*")) == []
@@ -21,6 +21,8 @@ from codebatch.tasks.lint import (
     lint_tab_indentation,
     lint_missing_final_newline,
     lint_content,
+    lint_unused_imports,
+    LintConfig,
 )
 
 
@@ -101,6 +103,18 @@ class TestLintTodoFixme:
         diags = lint_todo_fixme(lines, "test.py")
         assert len(diags) == 1
 
+    def test_column_and_single_report(self):
+        # Markers are ranked in TODO_PATTERNS order, not by position
+        lines = ["x = 1  # hack then TODO", "# xxx todo todo"]
+        diags = lint_todo_fixme(lines, "test.py")
+        assert [(d["line"], d["col"]) for d in diags] == [(1, 20), (2, 7)]
+        assert all("TODO" in d["message"] for d in diags)
+
+    def test_line_numbers_with_newline_terminated_lines(self):
+        lines = ["x = 1\n", "# TODO\n", "# FIXME\n"]
+        diags = lint_todo_fixme(lines, "test.py")
+        assert [(d["line"], d["col"]) for d in diags] == [(2, 3), (3, 3)]
+
     def test_no_todo(self):
         lines = ["# This is fine\n"]
         diags = lint_todo_fixme(lines, "test.py")
@@ -146,6 +160,13 @@ class TestLintMissingFinalNewline:
         diags = lint_missing_final_newline(content, "test.py")
         assert len(diags) == 0
 
+    def test_precomputed_lines(self):
+        lines = "a\nbc".split("\n")
+        diags = lint_missing_final_newline("a\nbc", "test.py", lines)
+        assert diags == lint_missing_final_newline("a\nbc", "test.py")
+        assert diags[0]["line"] == 2
+        assert diags[0]["col"] == 3
+
 
 class TestLintContent:
     """Integration tests for lint_content function."""
@@ -161,11 +182,49 @@ class TestLintContent:
         assert "L004" in codes  # tab
         assert "L005" in codes  # missing final newline
 
+    def test_streamed_lines_match_split(self):
+        content = "x \n" * 30000 + "\ty" * 10 + "\n\nz"
+        diags = lint_content(content, "test.py", {})
+        lines = content.split("\n")
+        expected = (
+            lint_trailing_whitespace(lines, "test.py")
+            + lint_tab_indentation(lines, "test.py")
+            + lint_missing_final_newline(content, "test.py", lines)
+        )
+        assert diags == expected
+
     def test_config_disables_rules(self):
         content = "hello  \n"  # trailing whitespace
         diags = lint_content(content, "test.py", {"check_trailing_whitespace": False})
         assert len(diags) == 0
 
+    def test_resolved_config_matches_dict(self):
+        content = "\tx = 1  \n" + "a" * 90 + "\n# todo"
+        config = {"max_line_length": 80, "check_todo": False}
+        options = LintConfig.from_dict(config)
+        assert LintConfig.from_dict(options) is options
+        assert lint_content(content, "test.py", options) == lint_content(
+            content, "test.py", config
+        )
+
+
+class TestLintUnusedImports:
+    """Tests for L101 name collection."""
+
+    def test_deep_attribute_chain(self):
+        # os.a.a.a...: each Attribute reaches its value via two keys
+        expr = {"type": "Name", "id": "os"}
+        for _ in range(60):
+            expr = {"type": "Attribute", "value": expr, "attr": "a"}
+        ast_data = {
+            "type": "Module",
+            "body": [
+                {"type": "Import", "lineno": 1, "names": [{"name": "os"}]},
+                {"type": "Expr", "lineno": 2, "value": expr},
+            ],
+        }
+        assert lint_unused_imports(ast_data, "test.py") == []
+
 
 class TestLintExecutor:
     """Tests for the lint_executor function."""
@@ -305,6 +364,54 @@ class TestLintExecutor:
 
         assert normalize(outputs_1) == normalize(outputs_2)
 
+    def test_text_diagnostics_not_cached(self, clean_store: Path):
+        """The text rules run every time; they cost less than a cache write."""
+        runner = ShardRunner(clean_store)
+        content = b"x = 1  \n" + b"# padding\n" * 2000
+        ref = runner.object_store.put_bytes(content)
+
+        first = lint_executor({}, [{"path": "a.py", "object": ref}], runner)
+        assert [d["code"] for d in first] == ["L001"]
+        assert not (clean_store / "indexes" / "derived" / "lint").exists()
+
+    def test_ast_cache_hits_skip_ast_reads(self, parsed_python_shard, monkeypatch):
+        """With a warm cache, the AST pass reads no AST objects."""
+        runner, batch_id, shard_id = parsed_python_shard
+        ast_outputs = runner.iter_prior_outputs(
+            batch_id, "01_parse", shard_id, kind="ast"
+        )
+        ast_refs = {o["object"] for o in ast_outputs}
+        assert ast_refs
+
+        config = {"_batch_id": batch_id, "_shard_id": shard_id}
+        first = lint_executor(config, [], runner)
+
+        read_refs = []
+        get_bytes_many = runner.object_store.get_bytes_many
+
+        def recording_get_bytes_many(object_refs, *args, **kwargs):
+            object_refs = list(object_refs)
+            read_refs.extend(object_refs)
+            return get_bytes_many(object_refs, *args, **kwargs)
+
+        monkeypatch.setattr(
+            runner.object_store, "get_bytes_many", recording_get_bytes_many
+        )
+        monkeypatch.setattr(
+            runner.object_store,
+            "get_bytes",
+            lambda ref: pytest.fail(f"unexpected read of {ref}"),
+        )
+        assert lint_executor(config, [], runner) == first
+        assert not ast_refs & set(read_refs)
+
+    def test_skips_binary_content(self, clean_store: Path):
+        """Content with a NUL byte is treated as binary, even if valid UTF-8."""
+        runner = ShardRunner(clean_store)
+        ref = runner.object_store.put_bytes(b"x = 1  \x00\n")
+
+        assert lint_executor({}, [{"path": "a.bin", "object": ref}], runner) == []
+
 
 class TestLintIntegration:
     """Integration tests for lint in the pipeline."""
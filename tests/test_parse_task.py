@@ -8,7 +8,13 @@ from codebatch.batch import BatchManager
 from codebatch.common import object_shard_prefix
 from codebatch.runner import ShardRunner
 from codebatch.snapshot import SnapshotBuilder
-from codebatch.tasks.parse import parse_executor, parse_python, parse_javascript
+from codebatch.tasks.parse import (
+    is_treesitter_available,
+    parse_executor,
+    parse_javascript,
+    parse_javascript_fallback,
+    parse_python,
+)
 
 
 @pytest.fixture
@@ -64,6 +70,44 @@ def hello():
         assert diagnostics[0]["severity"] == "error"
         assert diagnostics[0]["code"] == "E0001"
 
+    def test_shallow_keeps_top_level_names(self):
+        """Shallow mode keeps top-level defs and imports, as in the full AST."""
+        from codebatch.tasks.symbols import extract_python_symbols
+
+        code = """
+import os.path as osp
+from . import sibling
+x = 1
+
+class Greeter(Base):
+    def greet(self):
+        return "hi"
+
+async def main():
+    pass
+"""
+        full, _ = parse_python(code, "test.py")
+        shallow, diagnostics = parse_python(code, "test.py", shallow=True)
+
+        assert diagnostics == []
+        assert shallow["ast_mode"] == "summary"
+        assert [n["type"] for n in shallow["body"]] == [
+            "Import",
+            "ImportFrom",
+            "ClassDef",
+            "AsyncFunctionDef",
+        ]
+        for summary, node in zip(shallow["body"], full["body"][:2] + full["body"][3:]):
+            assert summary == {k: v for k, v in node.items() if k in summary}
+            assert summary.get("name") == node.get("name")
+            assert summary.get("names") == node.get("names")
+
+        symbols, _ = extract_python_symbols(shallow, "test.py")
+        assert {s["name"] for s in symbols if s["kind"] == "symbol"} >= {
+            "Greeter",
+            "main",
+        }
+
 
 class TestParseJavaScript:
     """Tests for JavaScript parsing.
@@ -113,6 +157,92 @@ function hello() {
             assert diagnostics[0]["code"] == "W0001"
             assert "Unbalanced" in diagnostics[0]["message"]
 
+    def test_source_bytes_match_content(self):
+        """Passing the already-encoded source gives the same result."""
+        code = "// caf\u00e9\nconst s = '\u00fc\u00f1\u00ee';\nfunction f() { return s; }"
+        assert parse_javascript(code, "a.js", code.encode("utf-8")) == (
+            parse_javascript(code, "a.js")
+        )
+
+    def test_fallback_counts_each_token_once(self):
+        """Fallback tokens are counted once, outside strings and comments."""
+        code = """// function in a comment
+const s = "return it's"; /* class */ let x = 42 + y1;
+"""
+        ast_dict, _ = parse_javascript_fallback(code, "test.js")
+
+        assert ast_dict["tokens"] == {
+            "keyword": 2,  # const, let
+            "string": 1,
+            "number": 1,
+            "comment": 2,
+            "identifier": 3,  # s, x, y1
+        }
+
+    @pytest.mark.skipif(
+        not is_treesitter_available(), reason="tree-sitter not installed"
+    )
+    def test_treesitter_parser_reused_per_thread(self):
+        """Tree-sitter parsers are reused within a thread, not across threads."""
+        import threading
+
+        from codebatch.tasks.parse import _get_ts_parser
+
+        code = "function f() { return 1; }"
+        first, _ = parse_javascript(code, "a.js")
+        second, _ = parse_javascript(code, "b.js")
+        assert first == second
+
+        parser = _get_ts_parser("javascript")
+        assert _get_ts_parser("javascript") is parser
+        assert _get_ts_parser("tsx") is not parser
+
+        other = []
+        thread = threading.Thread(
+            target=lambda: other.append(_get_ts_parser("javascript"))
+        )
+        thread.start()
+        thread.join()
+        assert other[0] is not parser
+
+    @pytest.mark.skipif(
+        not is_treesitter_available(), reason="tree-sitter not installed"
+    )
+    def test_treesitter_node_count(self):
+        """Node count covers every node, comments and anonymous nodes included."""
+        from codebatch.tasks.parse import _count_ts_nodes, _get_ts_parser
+
+        def count(node):
+            return 1 + sum(count(child) for child in node.children)
+
+        code = "// c\nclass A { m(x) { return `t${x}` + 'a'; } }\nlet [a, b] = f();"
+        tree = _get_ts_parser("javascript").parse(code.encode("utf-8"))
+        assert _count_ts_nodes(tree.root_node) == count(tree.root_node)
+
+        ast_dict, _ = parse_javascript(code, "a.js")
+        assert ast_dict["stats"]["total_nodes"] == count(tree.root_node)
+
+    @pytest.mark.skipif(
+        not is_treesitter_available(), reason="tree-sitter not installed"
+    )
+    def test_treesitter_errors_found_in_order(self):
+        """Error search visits only broken subtrees but misses no error."""
+        from codebatch.tasks.parse import _find_ts_errors, _get_ts_parser
+
+        def all_errors(node):
+            found = []
+            if node.type == "ERROR" or node.is_missing:
+                found.append((node.start_point[0] + 1, node.start_point[1] + 1))
+            for child in node.children:
+                found.extend(all_errors(child))
+            return found
+
+        code = "function ok() { return 1; }\nlet x = (1 + ;\nif (a { b( }\nclass C {}"
+        tree = _get_ts_parser("javascript").parse(code.encode("utf-8"))
+        errors = _find_ts_errors(tree.root_node)
+        assert errors
+        assert [(e["line"], e["column"]) for e in errors] == all_errors(tree.root_node)
+
 
 class TestParseExecutor:
     """Tests for the full parse executor."""
@@ -187,6 +317,168 @@ class TestParseExecutor:
         final_state = runner.run_shard(batch_id, "01_parse", shard_id, parse_executor)
         assert final_state["status"] == "done"
 
+    def test_executor_reuses_cached_parse(self, store: Path, monkeypatch):
+        """A parsed object is not re-parsed, even under another path."""
+        import codebatch.tasks.parse as parse_module
+
+        store.mkdir(parents=True, exist_ok=True)
+        runner = ShardRunner(store)
+        ref = runner.object_store.put_bytes(b"def f(:\n    pass\n")
+
+        first = list(
+            parse_executor(
+                {}, [{"path": "a.py", "object": ref, "lang_hint": "python"}], runner
+            )
+        )
+        assert [o["code"] for o in first] == ["E0001"]
+
+        def fail(content, path, shallow=False):
+            raise AssertionError("parsed again")
+
+        monkeypatch.setattr(parse_module, "parse_python", fail)
+        second = list(
+            parse_executor(
+                {}, [{"path": "b.py", "object": ref, "lang_hint": "python"}], runner
+            )
+        )
+        assert second == [dict(first[0], path="b.py")]
+
+        # Another parser does not share the entry
+        third = list(
+            parse_executor(
+                {}, [{"path": "b.txt", "object": ref, "lang_hint": "text"}], runner
+            )
+        )
+        assert [o["kind"] for o in third] == ["ast"]
+
+    def test_cache_kept_per_parser_environment(self, store: Path, monkeypatch):
+        """Cached parses are kept per Python, tree-sitter and CodeBatch version."""
+        import codebatch.derived as derived_module
+        import codebatch.tasks.parse as parse_module
+
+        calls = []
+        real_parse_python = parse_module.parse_python
+
+        def counting_parse_python(content, path, shallow=False):
+            calls.append(path)
+            return real_parse_python(content, path, shallow)
+
+        monkeypatch.setattr(parse_module, "parse_python", counting_parse_python)
+
+        store.mkdir(parents=True, exist_ok=True)
+        runner = ShardRunner(store)
+        ref = runner.object_store.put_bytes(b"def f():\n    pass\n")
+        files = [{"path": "a.py", "object": ref, "lang_hint": "python"}]
+
+        def run():
+            return list(parse_executor({}, files, runner))
+
+        first = run()
+        assert run() == first
+        assert len(calls) == 1
+
+        monkeypatch.setattr(parse_module, "_PYTHON_ENV", "py9.99")
+        assert run() == first
+        assert len(calls) == 2
+
+        monkeypatch.setattr(derived_module, "VERSION", "99.0.0")
+        assert run() == first
+        assert len(calls) == 3
+
+        # Tree-sitter versions only key tree-sitter parses
+        python_variant = parse_module._cache_variant("python", 1)
+        ts_variant = parse_module._cache_variant("tree-sitter-js", 1)
+        monkeypatch.setattr(parse_module, "_TREE_SITTER_ENV", "ts9.99")
+        assert parse_module._cache_variant("python", 1) == python_variant
+        assert parse_module._cache_variant("tree-sitter-js", 1) != ts_variant
+
+    def test_executor_skips_nul_content(self, store: Path):
+        """Content with a NUL byte is treated as binary, even if valid UTF-8."""
+        store.mkdir(parents=True, exist_ok=True)
+        runner = ShardRunner(store)
+        ref = runner.object_store.put_bytes(b"x = 1\x00\n")
+
+        record = {"path": "a.py", "object": ref, "lang_hint": "python"}
+        assert list(parse_executor({}, [record], runner)) == []
+
+    def test_executor_workers_match_serial(self, tmp_path: Path, monkeypatch):
+        """Parsing on a process pool yields the same records in the same order."""
+        import os
+
+        import codebatch.tasks.parse as parse_module
+
+        sources = {
+            "a.py": (b"def f():\n    return 1\n", "python"),
+            "b.py": (b"def f(:\n", "python"),
+            "c.md": (b"# Title\n\nSome text.\n", "markdown"),
+            "d.bin": (b"\x00\x01\x02", None),
+            "e.py": (b"def f():\n    return 1\n", "python"),
+        }
+
+        def run(store: Path, config: dict) -> list[dict]:
+            store.mkdir(parents=True)
+            runner = ShardRunner(store)
+            files = [
+                {
+                    "path": path,
+                    "object": runner.object_store.put_bytes(data),
+                    "lang_hint": lang,
+                }
+                for path, (data, lang) in sources.items()
+            ]
+            return list(parse_executor(config, files, runner))
+
+        serial = run(tmp_path / "serial", {})
+        parallel = run(tmp_path / "parallel", {"workers": 2})
+
+        assert parallel == serial
+
+        # Windows smaller than the shard give the same result
+        monkeypatch.setattr(parse_module, "PARSE_WINDOW_SIZE", 2)
+        assert run(tmp_path / "windowed", {"workers": 2}) == serial
+
+        # "auto" sizes the pool to the machine
+        monkeypatch.setattr(os, "cpu_count", lambda: 2)
+        assert run(tmp_path / "auto", {"workers": "auto"}) == serial
+        assert [o["path"] for o in serial] == ["a.py", "b.py", "c.md", "e.py"]
+
+    def test_executor_parses_duplicate_content_once(self, store: Path, monkeypatch):
+        """Records sharing an object ref are parsed once per window."""
+        import codebatch.tasks.parse as parse_module
+
+        calls = []
+        real_parse_python = parse_module.parse_python
+
+        def counting_parse_python(content, path, shallow=False):
+            calls.append(path)
+            return real_parse_python(content, path, shallow)
+
+        monkeypatch.setattr(parse_module, "parse_python", counting_parse_python)
+
+        store.mkdir(parents=True, exist_ok=True)
+        runner = ShardRunner(store)
+        ref = runner.object_store.put_bytes(b"def f(:\n")
+        files = [
+            {"path": path, "object": ref, "lang_hint": "python"}
+            for path in ("a.py", "vendor/a.py", "copy/a.py")
+        ]
+
+        # emit_ast off: nothing is cached on disk, so only the in-memory dedupe applies
+        outputs = list(parse_executor({"emit_ast": False}, files, runner))
+
+        assert calls == ["a.py"]
+        assert [o["path"] for o in outputs] == ["a.py", "vendor/a.py", "copy/a.py"]
+        assert {o["code"] for o in outputs} == {"E0001"}
+
+        # The in-memory results are bounded; older repeats are parsed again
+        calls.clear()
+        other = runner.object_store.put_bytes(b"x = 1\n")
+        files.insert(1, {"path": "b.py", "object": other, "lang_hint": "python"})
+        monkeypatch.setattr(parse_module, "PARSE_WINDOW_SIZE", 1)
+        list(parse_executor({"emit_ast": False}, files, runner))
+
+        assert calls == ["a.py", "b.py", "vendor/a.py"]
+
 
 class TestChunking:
     """Tests for large output chunking."""
@@ -226,3 +518,31 @@ class TestChunking:
             manifest = json.loads(manifest_data)
             assert manifest["schema_name"] == "codebatch.chunk_manifest"
             assert len(manifest["chunks"]) >= 1
+
+    def test_chunked_ast_matches_unchunked(self, store: Path, batch_id: str):
+        """Chunks of a streamed AST reassemble to the directly stored AST."""
+        runner = ShardRunner(store)
+
+        batch = runner.batch_manager.load_batch(batch_id)
+        records = runner.snapshot_builder.load_file_index(batch["snapshot_id"])
+        python_files = [r for r in records if r.get("lang_hint") == "python"]
+
+        direct = parse_executor({}, python_files, runner)
+        chunked = parse_executor({"chunk_threshold": 100}, python_files, runner)
+        direct_asts = {o["path"]: o for o in direct if o["kind"] == "ast"}
+        chunked_asts = {o["path"]: o for o in chunked if o["kind"] == "ast"}
+        assert direct_asts.keys() == chunked_asts.keys()
+
+        for path, output in chunked_asts.items():
+            assert output["format"] == "json+chunks"
+            manifest = json.loads(runner.object_store.get_bytes(output["object"]))
+            chunks = [
+                runner.object_store.get_bytes(chunk["object"])
+                for chunk in manifest["chunks"]
+            ]
+            assert all(len(chunk) == 100 for chunk in chunks[:-1])
+            assert 0 < len(chunks[-1]) <= 100
+            assert sum(map(len, chunks)) == manifest["total_bytes"]
+            assert b"".join(chunks) == runner.object_store.get_bytes(
+                direct_asts[path]["object"]
+            )
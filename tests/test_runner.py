@@ -5,6 +5,7 @@ import pytest
 from pathlib import Path
 
 from codebatch.batch import BatchManager
+from codebatch.cas import ObjectNotFoundError
 from codebatch.common import object_shard_prefix
 from codebatch.runner import ShardRunner
 from codebatch.snapshot import SnapshotBuilder
@@ -250,3 +251,67 @@ class TestAtomicOutputCommit:
         # (atomic write means no partial outputs)
         temp_path = outputs_path.with_suffix(".tmp")
         assert not temp_path.exists()
+
+
+class TestIterFileBytes:
+    """Tests for batched content streaming."""
+
+    def test_order_and_missing_across_batches(self, store: Path):
+        """Records come back in input order with None for missing objects."""
+        store.mkdir(parents=True, exist_ok=True)
+        runner = ShardRunner(store)
+        records = []
+        for i in range(10):
+            ref = runner.object_store.put_bytes(f"content {i}".encode())
+            records.append({"path": f"f{i}.txt", "object": ref})
+        records.insert(4, {"path": "gone.txt", "object": "sha256:" + "e" * 64})
+
+        results = list(runner.iter_file_bytes(records, batch_size=3))
+
+        assert [r for r, _ in results] == records
+        assert results[4][1] is None
+        assert results[0][1] == b"content 0"
+        assert results[-1][1] == b"content 9"
+
+    def test_early_stop(self, store: Path):
+        """Stopping iteration early does not hang on the read-ahead."""
+        store.mkdir(parents=True, exist_ok=True)
+        runner = ShardRunner(store)
+        ref = runner.object_store.put_bytes(b"x")
+        records = [{"path": f"f{i}", "object": ref} for i in range(10)]
+
+        for record, data in runner.iter_file_bytes(records, batch_size=2):
+            assert data == b"x"
+            break
+
+    def test_read_or_error(self, store: Path):
+        """Unreadable objects report the read error instead of raising it."""
+        store.mkdir(parents=True, exist_ok=True)
+        runner = ShardRunner(store)
+        ref = runner.object_store.put_bytes(b"x")
+
+        assert runner.read_or_error(ref) == (b"x", None)
+
+        data, error = runner.read_or_error("sha256:" + "e" * 64)
+        assert data is None
+        assert isinstance(error, ObjectNotFoundError)
+
+
+class TestWorkerProcesses:
+    """Tests for task worker process settings."""
+
+    def test_auto_shares_cpus_between_shards(self, store: Path, monkeypatch):
+        """The "auto" setting splits the CPUs between concurrent shards."""
+        import os
+
+        monkeypatch.setattr(os, "cpu_count", lambda: 8)
+        assert ShardRunner(store).resolve_workers("auto") == 8
+        assert ShardRunner(store, concurrent_shards=4).resolve_workers("auto") == 2
+        assert ShardRunner(store, concurrent_shards=16).resolve_workers("auto") == 1
+        assert ShardRunner(store, concurrent_shards=4).resolve_workers(3) == 3
+
+    def test_process_pool_does_not_fork(self, store: Path):
+        """Worker processes are not forked from the multi-threaded runner."""
+        with ShardRunner(store).process_pool(1) as pool:
+            assert pool._mp_context.get_start_method() != "fork"
+            assert pool.submit(abs, -1).result() == 1
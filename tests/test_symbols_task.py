@@ -116,6 +116,35 @@ class TestExtractPythonSymbols:
         assert edges[1]["edge_type"] == "imports"
         assert edges[1]["target"] == "pathlib.Path"
 
+    def test_repeated_import_edges_emitted_once(self):
+        """A target imported twice in one file gets one edge, at its first line."""
+        import_json = {
+            "type": "Import",
+            "col_offset": 4,
+            "names": [{"name": "json", "asname": None}],
+        }
+        ast_data = {
+            "type": "Module",
+            "ast_mode": "full",
+            "body": [
+                {
+                    "type": "Try",
+                    "lineno": 1,
+                    "body": [{**import_json, "lineno": 2}],
+                    "handlers": [
+                        {
+                            "type": "ExceptHandler",
+                            "lineno": 3,
+                            "body": [{**import_json, "lineno": 4}],
+                        }
+                    ],
+                },
+            ],
+        }
+        _, edges = extract_python_symbols(ast_data, "test.py")
+
+        assert [(e["target"], e["line"]) for e in edges] == [("json", 2)]
+
     def test_extracts_variable(self):
         """Extracts variable assignments with real names."""
         ast_data = {
@@ -228,6 +257,89 @@ class TestExtractJsSymbols:
 
         assert len(symbols) == 0
 
+    def test_extracts_treesitter_symbols(self):
+        """Extracts scoped symbols and edges from a tree-sitter AST."""
+
+        def node(node_type, row=0, children=(), **fields):
+            return {
+                "type": node_type,
+                "start_point": {"row": row, "column": 2},
+                "children": list(children),
+                **fields,
+            }
+
+        ast_data = node(
+            "program",
+            ast_mode="full",
+            parser="tree-sitter",
+            children=[
+                node(
+                    "import_statement",
+                    source="./util",
+                    children=[
+                        node(
+                            "import_clause",
+                            children=[
+                                node("identifier", name="util"),
+                                node(
+                                    "named_imports",
+                                    children=[node("import_specifier", name="pick")],
+                                ),
+                            ],
+                        )
+                    ],
+                ),
+                node(
+                    "class_declaration",
+                    row=2,
+                    children=[
+                        node("type_identifier", row=2, name="Box"),
+                        node(
+                            "class_heritage",
+                            children=[node("identifier", name="Base")],
+                        ),
+                        node(
+                            "class_body",
+                            children=[
+                                node(
+                                    "method_definition",
+                                    row=3,
+                                    name="open",
+                                    children=[
+                                        node("variable_declarator", row=4, name="x")
+                                    ],
+                                )
+                            ],
+                        ),
+                    ],
+                ),
+                node(
+                    "export_statement",
+                    row=7,
+                    children=[
+                        node("function_declaration", row=7, name="make"),
+                        node("lexical_declaration", name="ignored"),
+                    ],
+                ),
+            ],
+        )
+        symbols, edges = extract_js_symbols(ast_data, "test.js")
+
+        assert [
+            (s["name"], s["symbol_type"], s["scope"], s["line"]) for s in symbols
+        ] == [
+            ("util", "import_alias", "module", 1),
+            ("pick", "import_alias", "module", 1),
+            ("Box", "class", "module", 3),
+            ("open", "function", "Box", 4),
+            ("x", "variable", "open", 5),
+            ("make", "function", "module", 8),
+        ]
+        assert [(e["edge_type"], e["target"], e["line"]) for e in edges] == [
+            ("imports", "./util", 1),
+            ("inherits", "Base", 3),
+        ]
+
 
 class TestSymbolsExecutor:
     """Tests for the symbols_executor function."""
@@ -290,6 +402,45 @@ class TestSymbolsExecutor:
             "No symbols or edges produced from Python file"
         )
 
+    def test_reuses_cached_records(self, parsed_python_shard, monkeypatch):
+        """A rerun over the same ASTs reuses cached records, paths included."""
+        import codebatch.tasks.symbols as symbols_module
+
+        runner, batch_id, shard_id = parsed_python_shard
+
+        config = {"_batch_id": batch_id, "_shard_id": shard_id}
+        first = list(symbols_executor(config, [], runner))
+        assert any(o["kind"] == "symbol" for o in first)
+
+        def fail(ast_data, path):
+            raise AssertionError("extracted again")
+
+        monkeypatch.setattr(symbols_module, "extract_python_symbols", fail)
+        monkeypatch.setattr(symbols_module, "extract_js_symbols", fail)
+        assert list(symbols_executor(config, [], runner)) == first
+
+    def test_worker_pool_matches_serial(self, parsed_python_shard, monkeypatch):
+        """Extracting on a worker pool yields the same records, in order."""
+        import shutil
+
+        import codebatch.tasks.symbols as symbols_module
+
+        runner, batch_id, shard_id = parsed_python_shard
+
+        config = {"_batch_id": batch_id, "_shard_id": shard_id}
+        serial = list(symbols_executor(config, [], runner))
+        assert any(o["kind"] == "symbol" for o in serial)
+
+        shutil.rmtree(runner.store_root / "indexes" / "derived" / "symbols")
+        pooled = list(symbols_executor({**config, "workers": 2}, [], runner))
+        assert pooled == serial
+
+        # Windows smaller than the shard give the same result
+        shutil.rmtree(runner.store_root / "indexes" / "derived" / "symbols")
+        monkeypatch.setattr(symbols_module, "SYMBOLS_WINDOW_SIZE", 2)
+        windowed = list(symbols_executor({**config, "workers": 2}, [], runner))
+        assert windowed == serial
+
     def test_symbols_have_required_fields(self, clean_store: Path, corpus_dir: Path):
         """Symbol records have all required fields."""
         from codebatch.batch import PIPELINES